@@ -1,8 +1,7 @@
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
-from config import config
-import logging
+from config import config as config_by_name
 import os
 
 # Initialize extensions
@@ -15,31 +14,67 @@ def create_app(config_name=None):
         config_name = os.environ.get('FLASK_ENV') or 'default'
     
     app = Flask(__name__)
-    app.config.from_object(config[config_name])
+    if isinstance(config_name, str):
+        app.config.from_object(config_by_name[config_name])
+    else:
+        app.config.from_object(config_name)
+    
+    # Engine options for the database in use (pool sizing, pre-ping, SQLite WAL); see app/database.py
+    from app.database import configure_engine, install_engine_hooks
+    configure_engine(app)
     
     # Initialize extensions with app
     db.init_app(app)
     migrate.init_app(app, db)
+    with app.app_context():
+        install_engine_hooks(app, db.engine)
     
-    # Configure logging
+    # Configure logging: JSON records written by a background thread, payload logs sampled
     if not app.debug and not app.testing:
-        logging.basicConfig(level=logging.INFO)
+        from app.utils.structured_logging import configure_logging
+        configure_logging(app)
     
     # Register blueprints
     from app.routes.sms import sms_bp
     from app.routes.dashboard import dashboard_bp
+    from app.routes.admin_api import admin_api_bp
     app.register_blueprint(sms_bp, url_prefix='/sms')
     app.register_blueprint(dashboard_bp)
+    app.register_blueprint(admin_api_bp, url_prefix='/api/admin')
     
     # Add health check endpoint
     @app.route('/health')
     def health_check():
         return {'status': 'healthy', 'message': 'Gatherly is running'}, 200
     
+    @app.route('/ready')
+    def readiness_check():
+        """200 once app.startup.warm_up() has run, so deploys only route to warm processes"""
+        from app.startup import is_ready
+        if not is_ready(app):
+            return {'status': 'starting'}, 503
+        return {'status': 'ready'}, 200
+    
+    @app.route('/metrics')
+    def metrics():
+        """Request latency histograms in the Prometheus text format"""
+        import hmac
+        from flask import request
+        from app.services.metrics_service import render_metrics
+        token = app.config.get('METRICS_TOKEN')
+        if token and not hmac.compare_digest(request.headers.get('Authorization', '').encode(), f'Bearer {token}'.encode()):
+            return {'error': 'unauthorized'}, 401
+        return render_metrics(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+    
     @app.route('/api')
     def api_info():
         return {'message': 'Gatherly API', 'version': '2.0', 'status': 'active'}, 200
     
+    # Run the maintenance job scheduler in this process when enabled
+    if app.config.get('JOB_SCHEDULER_ENABLED') and not app.testing:
+        from app.services.job_scheduler_service import start_scheduler
+        start_scheduler(app)
+    
     # Import models to ensure they're registered with SQLAlchemy
     with app.app_context():
         from app.models import planner, event, guest, guest_state, contact, availability
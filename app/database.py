@@ -0,0 +1,146 @@
+"""
+Database engine profiles
+
+create_app used Flask-SQLAlchemy's engine defaults for every database:
+Postgres connections were never pre-pinged or recycled, so the first query
+after an idle period or a failover hit a dead connection, and the pool was
+not sized to the threads of a gthread worker. SQLite ran in rollback-journal
+mode, so readers and the writer blocked each other and concurrent test
+threads serialized on the database lock, and an in-memory test database was
+a single connection shared by every thread, so concurrent sessions
+interleaved inside one transaction.
+
+DATABASE_ENGINE_PROFILE picks one of the profiles below (auto chooses from
+the database URL, none keeps the defaults). Options in
+SQLALCHEMY_ENGINE_OPTIONS override the profile's.
+
+- postgres: pool of DB_POOL_SIZE (one per worker thread) + DB_MAX_OVERFLOW,
+  pre-ping, recycle, LIFO checkout and a server-side statement_timeout.
+  Every worker process has its own pool, so the database sees up to
+  workers x (pool + overflow) connections
+- sqlite: WAL journal, synchronous=NORMAL, a busy timeout and mmap reads
+- sqlite_memory: one in-memory database per app, with a connection per
+  thread (shared cache) instead of one for all of them. Shared-cache writers fail with "table is locked"
+  instead of waiting, so tests with concurrent writers use a file database
+"""
+
+import logging
+import uuid
+
+from sqlalchemy import event as sa_event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+
+logger = logging.getLogger(__name__)
+
+PROFILES = ('postgres', 'sqlite', 'sqlite_memory')
+
+
+def resolve_profile(config) -> str:
+    """Profile name for an app config; auto follows the database URL"""
+    profile = (config.get('DATABASE_ENGINE_PROFILE') or 'auto').lower()
+    if profile != 'auto':
+        if profile not in PROFILES + ('none',):
+            raise ValueError(f"Unknown DATABASE_ENGINE_PROFILE {profile!r}, expected auto, none or one of {PROFILES}")
+        return profile
+
+    url = make_url(config['SQLALCHEMY_DATABASE_URI'])
+    if url.get_backend_name() == 'postgresql':
+        return 'postgres'
+    if url.get_backend_name() == 'sqlite':
+        memory = url.database in (None, '', ':memory:') or url.query.get('mode') == 'memory'
+        return 'sqlite_memory' if memory else 'sqlite'
+    return 'none'
+
+
+def _postgres_options(config) -> dict:
+    connect_args = {'connect_timeout': 10}
+    statement_timeout = int(config.get('DB_STATEMENT_TIMEOUT_MS', 30000))
+    if statement_timeout > 0:
+        connect_args['options'] = f'-c statement_timeout={statement_timeout}'
+    return {
+        'pool_size': int(config.get('DB_POOL_SIZE', 8)),
+        'max_overflow': int(config.get('DB_MAX_OVERFLOW', 4)),
+        'pool_timeout': int(config.get('DB_POOL_TIMEOUT', 10)),
+        'pool_recycle': int(config.get('DB_POOL_RECYCLE', 1800)),
+        'pool_pre_ping': True,
+        # Reuse the most recent connection so surplus ones go idle and get recycled
+        'pool_use_lifo': True,
+        'connect_args': connect_args,
+    }
+
+
+def _sqlite_options(config) -> dict:
+    return {
+        # The sqlite3 driver's own wait for the write lock, in seconds
+        'connect_args': {'timeout': int(config.get('DB_BUSY_TIMEOUT_MS', 10000)) / 1000},
+    }
+
+
+def _sqlite_memory_options(config) -> dict:
+    return {
+        # Keep pooled connections open so the shared database outlives each checkout
+        'poolclass': QueuePool,
+        'connect_args': {'check_same_thread': False, 'uri': True},
+    }
+
+
+PROFILE_OPTIONS = {
+    'postgres': _postgres_options,
+    'sqlite': _sqlite_options,
+    'sqlite_memory': _sqlite_memory_options,
+}
+
+
+def _sqlite_pragmas(profile: str, config) -> list:
+    if profile == 'sqlite':
+        return [
+            'PRAGMA journal_mode=WAL',
+            'PRAGMA synchronous=NORMAL',
+            f"PRAGMA busy_timeout={int(config.get('DB_BUSY_TIMEOUT_MS', 10000))}",
+            f"PRAGMA mmap_size={int(config.get('DB_SQLITE_MMAP_SIZE', 268435456))}",
+        ]
+    if profile == 'sqlite_memory':
+        # Readers skip shared-cache table read locks
+        return ['PRAGMA read_uncommitted=1']
+    return []
+
+
+def shared_memory_uri() -> str:
+    """A fresh named in-memory database that every connection of one engine shares"""
+    return f'sqlite:///file:gatherly-{uuid.uuid4().hex}?mode=memory&cache=shared&uri=true'
+
+
+def configure_engine(app) -> str:
+    """Apply the configured profile to app.config before db.init_app; returns the profile name"""
+    config = app.config
+    profile = resolve_profile(config)
+    builder = PROFILE_OPTIONS.get(profile)
+    options = builder(config) if builder else {}
+
+    if profile == 'sqlite_memory' and make_url(config['SQLALCHEMY_DATABASE_URI']).database in (None, '', ':memory:'):
+        config['SQLALCHEMY_DATABASE_URI'] = shared_memory_uri()
+
+    explicit = dict(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    if 'connect_args' in explicit and 'connect_args' in options:
+        explicit['connect_args'] = {**options['connect_args'], **explicit['connect_args']}
+    config['SQLALCHEMY_ENGINE_OPTIONS'] = {**options, **explicit}
+    app.extensions['engine_profile'] = profile
+    logger.debug(f"Database engine profile: {profile}")
+    return profile
+
+
+def install_engine_hooks(app, engine) -> None:
+    """Run the profile's per-connection setup (SQLite pragmas) on every new connection"""
+    pragmas = _sqlite_pragmas(app.extensions.get('engine_profile'), app.config)
+    if not pragmas:
+        return
+
+    @sa_event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
@@ -8,6 +8,7 @@ from app.services import (
     MessageFormattingService,
     AIProcessingService
 )
+from app.services.contact_search_service import get_contact_search_service
 
 @dataclass
 class HandlerResult:
@@ -51,3 +52,27 @@ class BaseWorkflowHandler(ABC):
     def validate_input(self, message: str, context: Dict) -> bool:
         """Validate input for this stage"""
         return len(message.strip()) > 0
+    
+    def _handle_contact_names(self, event: Event, message: str) -> Optional[HandlerResult]:
+        """Add saved contacts typed by (partial) name; None when no saved contact matches
+
+        For guest-adding handlers: the matches go through the handler's own
+        _handle_contact_selection, as if their menu numbers had been typed.
+        """
+        contact_search = get_contact_search_service()
+        resolution = contact_search.resolve_names(event.planner, message)
+        if not resolution or not (resolution.numbers or resolution.ambiguous):
+            return None
+        
+        if resolution.numbers:
+            result = self._handle_contact_selection(event, ','.join(str(number) for number in resolution.numbers))
+        else:
+            result = HandlerResult.success_response("")
+        
+        if resolution.unmatched:
+            missing = ', '.join(f"'{term}'" for term in resolution.unmatched)
+            result.message = f"Couldn't find {missing} in your contacts.\n\n" + result.message
+        if resolution.ambiguous:
+            clarification = contact_search.format_clarification(event.planner, resolution)
+            result.message = (result.message + "\n\n" + clarification).strip()
+        return result
@@ -1,6 +1,7 @@
 import logging
 from app.handlers import BaseWorkflowHandler, HandlerResult
 from app.models.event import Event
+from app.utils.structured_logging import log_category
 
 logger = logging.getLogger(__name__)
 
@@ -62,13 +63,13 @@ Examples:
 If the activity or location is unclear, return null for that field.
 Return JSON only: {{"activity": "...", "location": "..."}}'''
 
-            logger.info(f"[AI DEBUG] Processing message: '{message}'")
+            logger.info("[AI DEBUG] Processing message: '%s'", message, extra=log_category('sms_payload'))
             response = self.ai_service.make_completion(prompt, max_tokens=150)
-            logger.info(f"[AI DEBUG] Raw AI response: '{response}'")
+            logger.info("[AI DEBUG] Raw AI response: '%s'", response, extra=log_category('ai_payload'))
             
             if response:
                 parsed = json.loads(response)
-                logger.info(f"[AI DEBUG] Parsed JSON successfully: {parsed}")
+                logger.info("[AI DEBUG] Parsed JSON successfully: %s", parsed, extra=log_category('ai_payload'))
                 
                 # Validate AI response - reject if contains "Unknown" or empty values
                 activity = parsed.get('activity', '').strip()
@@ -1,10 +1,15 @@
 import logging
 import re
+from typing import Optional
 from app.handlers import BaseWorkflowHandler, HandlerResult
 from app.models.event import Event
 from app.models.guest import Guest
 from app.models.guest_state import GuestState
 from app.models.contact import Contact
+from app.services.guest_management_service import is_contact_selection, parse_contact_selection
+from app.services.contact_menu_service import get_contact_menu_service
+from app.services.contact_search_service import is_contact_name_command
+from app.utils.phone import extract_guests_from_text, to_e164
 
 logger = logging.getLogger(__name__)
 
@@ -53,76 +58,62 @@ class AddGuestHandler(BaseWorkflowHandler):
                     confirmation_msg = self.message_service.format_planner_confirmation_menu(event)
                     return HandlerResult.success_response(confirmation_msg, previous_stage)
             
-            # Handle contact selection (numeric input like "1,2,3")
-            if re.match(r'^\s*\d+(\s*,\s*\d+)*\s*$', message.strip()):
+            # Page through the contact menu
+            if message_text == 'more':
+                contact_menu = get_contact_menu_service().render_next_page(event.planner)
+                if contact_menu:
+                    return HandlerResult.success_response(
+                        contact_menu + "\nSelect contacts (e.g. '1,3', '1-5' or 'all') or add new guests."
+                    )
+            
+            # Handle contact selection (numeric input like "1,2,3", "1-12" or "all")
+            if is_contact_selection(message):
                 return self._handle_contact_selection(event, message)
             
+            # Handle contacts typed by name ("add jess, mike r")
+            if is_contact_name_command(message):
+                name_result = self._handle_contact_names(event, message)
+                if name_result:
+                    return name_result
+            
             # Parse name and phone number from message
             message = ' '.join(message.split())
+            guests = extract_guests_from_text(message)
             
-            # Extract phone number pattern
-            phone_pattern = r'[\d\s\-\(\)\.]+$'
-            phone_match = re.search(phone_pattern, message)
-            
-            if not phone_match:
-                return HandlerResult.error_response(
-                    "Please include both name and phone number.\n"
-                    "Example: 'John Smith 555-123-4567'"
-                )
-            
-            phone = phone_match.group().strip()
-            name = message[:phone_match.start()].strip()
-            
-            if not name:
-                return HandlerResult.error_response(
-                    "Please include the guest's name.\n"
-                    "Example: 'John Smith 555-123-4567'"
-                )
-            
-            # Normalize phone number (remove non-digits)
-            phone_digits = re.sub(r'\D', '', phone)
-            if len(phone_digits) < 10:
+            if not guests:
+                # Not a new guest - maybe saved contacts named without "add"
+                name_result = self._handle_contact_names(event, message)
+                if name_result:
+                    return name_result
+                if not re.search(r'\d', message):
+                    return HandlerResult.error_response(
+                        "Please include both name and phone number.\n"
+                        "Example: 'John Smith 555-123-4567'"
+                    )
+                if not re.search(r'[A-Za-z]', message):
+                    return HandlerResult.error_response(
+                        "Please include the guest's name.\n"
+                        "Example: 'John Smith 555-123-4567'"
+                    )
                 return HandlerResult.error_response(
                     "Please provide a valid 10-digit phone number."
                 )
             
-            # Add +1 if not present and format
-            if not phone_digits.startswith('1'):
-                phone_digits = '1' + phone_digits
-            formatted_phone = '+' + phone_digits
-            
-            # Check if guest already exists
-            existing_guest = Guest.query.filter_by(
-                event_id=event.id,
-                phone_number=formatted_phone
-            ).first()
+            # Add every guest in the message, skipping ones already on the event
+            added_guests = []
+            existing_names = []
+            for guest_info in guests:
+                guest = self._add_guest(event, guest_info['name'], guest_info['phone'])
+                if guest:
+                    added_guests.append(guest)
+                else:
+                    existing_names.append(guest_info['name'])
             
-            if existing_guest:
+            if not added_guests:
                 return HandlerResult.error_response(
-                    f"{name} is already added to this event."
+                    f"{' and '.join(existing_names)} {'is' if len(existing_names) == 1 else 'are'} already added to this event."
                 )
-            
-            # Clean up any old guest states for this phone number from other events
-            # to prevent conflicts when they respond to availability requests
-            normalized_phone = self._normalize_phone(formatted_phone)
-            old_guest_states = GuestState.query.filter(
-                GuestState.phone_number.in_([formatted_phone, normalized_phone]),
-                GuestState.event_id != event.id
-            ).all()
-            
-            for old_state in old_guest_states:
-                old_state.delete()
-                logger.info(f"Cleaned up old guest state for {old_state.phone_number} from event {old_state.event_id}")
-            
-            # Create the guest
-            guest = Guest(
-                event_id=event.id,
-                name=name,
-                phone_number=formatted_phone,
-                rsvp_status='pending',
-                availability_provided=False
-            )
-            guest.save()
+            name = ', '.join(guest.name for guest in added_guests)
 
             # Determine return stage based on whether overlaps have been calculated
             previous_stage = getattr(event, 'previous_workflow_stage', None)
@@ -180,26 +171,28 @@ class AddGuestHandler(BaseWorkflowHandler):
 
             # Send availability request only if appropriate
             if should_send_availability:
-                self.guest_service.send_availability_request(guest)
+                for guest in added_guests:
+                    self.guest_service.send_availability_request(guest)
 
             # Build confirmation message
             if return_stage == 'adding_guest' and not should_send_availability:
                 # Stay in adding guest mode from confirmation - don't mention availability request
                 confirmation = f"✅ Added {name}!\n\n"
+                if existing_names:
+                    confirmation += f"Already on the event: {', '.join(existing_names)}\n\n"
                 
                 # Show existing contacts for easy selection
-                from app.models.contact import Contact
-                contacts = Contact.query.filter_by(planner_id=event.planner_id).order_by(Contact.name).all()
-                if contacts:
-                    confirmation += "Contacts:\n"
-                    for i, contact in enumerate(contacts, 1):
-                        confirmation += f"{i}. {contact.name} ({contact.phone_number})\n"
-                    confirmation += "\nSelect contacts (e.g. '1,3') or add new guests:\n\n"
+                contact_menu = get_contact_menu_service().render_page(event.planner)
+                if contact_menu:
+                    confirmation += contact_menu
+                    confirmation += "\nSelect contacts (e.g. '1,3', '1-5' or 'all') or add new guests:\n\n"
                 
                 confirmation += "Add another guest or reply 'done' to continue."
             else:
                 # Return to availability tracking or other workflow
                 confirmation = f"✅ Added {name} to your event!\n\n"
+                if existing_names:
+                    confirmation += f"Already on the event: {', '.join(existing_names)}\n\n"
                 if should_send_availability:
                     confirmation += f"I've sent them an availability request.\n\n"
                 
@@ -224,19 +217,16 @@ class AddGuestHandler(BaseWorkflowHandler):
                         else:
                             confirmation += "Waiting for all guests to respond...\n\n"
                             # Still show status if there are any responses
-                            responded_guests = [g for g in event.guests if g.availability_provided]
-                            if responded_guests:
+                            responded_count = event.get_response_counts()['availability_responded']
+                            if responded_count:
                                 confirmation += availability_status
-                                logger.info(f"ADD GUEST DEBUG: Added status because {len(responded_guests)} guests responded")
+                                logger.info(f"ADD GUEST DEBUG: Added status because {responded_count} guests responded")
                 elif return_stage == 'adding_guest':
                     # Show existing contacts for easy selection
-                    from app.models.contact import Contact
-                    contacts = Contact.query.filter_by(planner_id=event.planner_id).order_by(Contact.name).all()
-                    if contacts:
-                        confirmation += "Contacts:\n"
-                        for i, contact in enumerate(contacts, 1):
-                            confirmation += f"{i}. {contact.name} ({contact.phone_number})\n"
-                        confirmation += "\nSelect contacts (e.g. '1,3') or add new guests:\n\n"
+                    contact_menu = get_contact_menu_service().render_page(event.planner)
+                    if contact_menu:
+                        confirmation += contact_menu
+                        confirmation += "\nSelect contacts (e.g. '1,3', '1-5' or 'all') or add new guests:\n\n"
                     confirmation += "Add another guest or reply 'done' to continue."
             
             return HandlerResult.success_response(confirmation, return_stage)
@@ -245,6 +235,41 @@ class AddGuestHandler(BaseWorkflowHandler):
             logger.error(f"Error adding guest: {e}")
             return HandlerResult.error_response("Sorry, I couldn't add that guest. Please try again.")
     
+    def _add_guest(self, event: Event, name: str, phone: str) -> Optional[Guest]:
+        """Create one guest with an E.164 phone; None when the phone is already on the event"""
+        formatted_phone = to_e164(phone)
+        
+        # Check if guest already exists
+        existing_guest = Guest.query.filter_by(
+            event_id=event.id,
+            phone_number=formatted_phone
+        ).first()
+        
+        if existing_guest:
+            return None
+        
+        # Clean up any old guest states for this phone number from other events
+        # to prevent conflicts when they respond to availability requests
+        normalized_phone = self._normalize_phone(formatted_phone)
+        old_guest_states = GuestState.query.filter(
+            GuestState.phone_number.in_([formatted_phone, normalized_phone]),
+            GuestState.event_id != event.id
+        ).all()
+        
+        for old_state in old_guest_states:
+            old_state.delete()
+            logger.info(f"Cleaned up old guest state for {old_state.phone_number} from event {old_state.event_id}")
+        
+        guest = Guest(
+            event_id=event.id,
+            name=name,
+            phone_number=formatted_phone,
+            rsvp_status='pending',
+            availability_provided=False
+        )
+        guest.save()
+        return guest
+
     def _normalize_phone(self, phone: str) -> str:
         """Normalize phone number to standard format (same as SMS router)"""
         # Remove all non-digits
@@ -261,52 +286,27 @@ class AddGuestHandler(BaseWorkflowHandler):
     def _handle_contact_selection(self, event: Event, message: str) -> HandlerResult:
         """Handle selection from previous contacts (reused from guest collection handler)"""
         try:
-            # Parse contact numbers
-            if ',' in message.strip():
-                selected_numbers = [int(num.strip()) for num in message.split(',')]
-            else:
-                selected_numbers = [int(message.strip())]
+            # Get planner's numbered contact menu
+            contact_menu = get_contact_menu_service()
+            entries = contact_menu.get_entries(event.planner)
             
-            # Get planner's contacts
-            from app.models.contact import Contact
-            contacts = Contact.query.filter_by(planner_id=event.planner_id).order_by(Contact.name).all()
-            
-            if not contacts:
+            if not entries:
                 return HandlerResult.error_response(
                     "You don't have any saved contacts yet. Please add guests with their phone numbers."
                 )
             
-            # Add selected contacts as guests
-            added_guests = []
-            for num in selected_numbers:
-                if 1 <= num <= len(contacts):
-                    contact = contacts[num - 1]
-                    
-                    # Check if already added
-                    existing = Guest.query.filter_by(
-                        event_id=event.id,
-                        phone_number=contact.phone_number
-                    ).first()
-                    
-                    if not existing:
-                        guest = Guest(
-                            event_id=event.id,
-                            contact_id=contact.id,
-                            name=contact.name,
-                            phone_number=contact.phone_number,
-                            rsvp_status='pending',
-                            availability_provided=False
-                        )
-                        guest.save()
-                        added_guests.append(guest)
-                        
-                        # Send availability request if appropriate
-                        previous_stage = getattr(event, 'previous_workflow_stage', None)
-                        stages_with_calculated_overlaps = ['selecting_time', 'selecting_venue', 'venue_selection', 'collecting_activity', 'final_confirmation', 'finalized']
-                        should_send_availability = previous_stage not in ['final_confirmation', 'awaiting_confirmation']
-                        
-                        if should_send_availability:
-                            self.guest_service.send_availability_request(guest)
+            # Add selected contacts as guests in one batch
+            selected_numbers = parse_contact_selection(message, len(entries))
+            selected_contacts = contact_menu.get_selected_contacts(event.planner, selected_numbers)
+            added_guests = self.guest_service.add_contacts_as_guests(event, selected_contacts)
+            
+            # Send availability requests if appropriate
+            previous_stage = getattr(event, 'previous_workflow_stage', None)
+            should_send_availability = previous_stage not in ['final_confirmation', 'awaiting_confirmation']
+            
+            if should_send_availability:
+                for guest in added_guests:
+                    self.guest_service.send_availability_request(guest)
             
             if added_guests:
                 guest_names = [guest.name for guest in added_guests]
@@ -316,12 +316,9 @@ class AddGuestHandler(BaseWorkflowHandler):
                 response_msg += self._generate_guest_list_display(event)
                 
                 # Show updated contact list so users can continue adding
-                if contacts:
-                    response_msg += "Select contacts (e.g. '1,3') or add new guests:\n\n"
-                    response_msg += "Contacts:\n"
-                    for i, contact in enumerate(contacts, 1):
-                        response_msg += f"{i}. {contact.name} ({contact.phone_number})\n"
-                    response_msg += "\n"
+                response_msg += "Select contacts (e.g. '1,3', '1-5' or 'all') or add new guests:\n\n"
+                response_msg += contact_menu.render_page(event.planner)
+                response_msg += "\n"
                 
                 response_msg += "Add another guest or reply 'done' to continue."
                 return HandlerResult.success_response(response_msg)
@@ -332,5 +329,5 @@ class AddGuestHandler(BaseWorkflowHandler):
                 
         except ValueError:
             return HandlerResult.error_response(
-                "Please use contact numbers (e.g. '1,3') or add new guests with names and phone numbers."
+                "Please use contact numbers (e.g. '1,3', '1-5' or 'all') or add new guests with names and phone numbers."
             )
@@ -1,7 +1,9 @@
 import logging
 from app.handlers import BaseWorkflowHandler, HandlerResult
 from app.models.event import Event
+from app.models.guest import Guest
 from app.services.availability_service import AvailabilityService
+from app.services.contact_menu_service import get_contact_menu_service
 
 logger = logging.getLogger(__name__)
 
@@ -27,16 +29,15 @@ class AvailabilityTrackingHandler(BaseWorkflowHandler):
             
             elif message_lower == '1':
                 # Check if we have pending responses (partial overlap mode) or everyone responded (final mode)
-                pending_guests = [guest for guest in event.guests if not guest.availability_provided]
+                counts = event.get_response_counts()
                 
-                if pending_guests:
+                if counts['availability_responded'] < counts['total']:
                     # Partial overlap mode - show current overlaps with subset of guests
                     return self._handle_partial_overlap_request(event)
                 else:
                     # Everyone responded - show final overlaps
                     # For single guest case, use show_individual_availability=True
-                    responded_guests = [guest for guest in event.guests if guest.availability_provided]
-                    show_individual = len(responded_guests) == 1
+                    show_individual = counts['availability_responded'] == 1
                     
                     overlaps = self.availability_service.calculate_availability_overlaps(event.id, show_individual_availability=show_individual)
                     if overlaps:
@@ -51,13 +52,10 @@ class AvailabilityTrackingHandler(BaseWorkflowHandler):
                 guest_prompt = "Add more guests:\n\n"
                 
                 # Show existing contacts for easy selection
-                from app.models.contact import Contact
-                contacts = Contact.query.filter_by(planner_id=event.planner_id).order_by(Contact.name).all()
-                if contacts:
-                    guest_prompt += "Contacts:\n"
-                    for i, contact in enumerate(contacts, 1):
-                        guest_prompt += f"{i}. {contact.name} ({contact.phone_number})\n"
-                    guest_prompt += "\nSelect contacts (e.g. '1,3') or add new guests:\n\n"
+                contact_menu = get_contact_menu_service().render_page(event.planner)
+                if contact_menu:
+                    guest_prompt += contact_menu
+                    guest_prompt += "\nSelect contacts (e.g. '1,3', '1-5' or 'all') or add new guests:\n\n"
                 
                 guest_prompt += "Examples:\n"
                 guest_prompt += "- 'John Doe, 111-555-1234'\n"
@@ -82,11 +80,12 @@ class AvailabilityTrackingHandler(BaseWorkflowHandler):
     def _send_reminder_messages(self, event: Event) -> HandlerResult:
         """Send reminder messages to pending guests"""
         try:
-            pending_guests = [guest for guest in event.guests if not guest.availability_provided]
-            
-            if not pending_guests:
+            counts = event.get_response_counts()
+            if counts['availability_responded'] >= counts['total']:
                 return HandlerResult.error_response("All guests have already responded!")
             
+            pending_guests = Guest.query.filter_by(event_id=event.id, availability_provided=False).all()
+            
             sent_count = 0
             for guest in pending_guests:
                 if self.guest_service.send_availability_request(guest):
@@ -115,9 +114,10 @@ class AvailabilityTrackingHandler(BaseWorkflowHandler):
                 )
             
             # Count how many guests have responded
-            responded_count = sum(1 for guest in event.guests if guest.availability_provided)
-            total_count = len(event.guests)
-            pending_guests = [guest for guest in event.guests if not guest.availability_provided]
+            counts = event.get_response_counts()
+            responded_count = counts['availability_responded']
+            total_count = counts['total']
+            pending_guests = Guest.query.filter_by(event_id=event.id, availability_provided=False).all()
             
             # Format partial overlap message
             overlap_msg = f"⏰ Current Overlaps (based on {responded_count}/{total_count} responses):\n\n"
@@ -1,6 +1,7 @@
 import logging
 from app.handlers import BaseWorkflowHandler, HandlerResult
 from app.models.event import Event
+from app.services.contact_menu_service import get_contact_menu_service
 
 logger = logging.getLogger(__name__)
 
@@ -37,13 +38,10 @@ class ConfirmationMenuHandler(BaseWorkflowHandler):
                 guest_prompt = "Add more guests:\n\n"
                 
                 # Show existing contacts for easy selection
-                from app.models.contact import Contact
-                contacts = Contact.query.filter_by(planner_id=event.planner_id).order_by(Contact.name).all()
-                if contacts:
-                    guest_prompt += "Contacts:\n"
-                    for i, contact in enumerate(contacts, 1):
-                        guest_prompt += f"{i}. {contact.name} ({contact.phone_number})\n"
-                    guest_prompt += "\nSelect contacts (e.g. '1,3') or add new guests:\n\n"
+                contact_menu = get_contact_menu_service().render_page(event.planner)
+                if contact_menu:
+                    guest_prompt += contact_menu
+                    guest_prompt += "\nSelect contacts (e.g. '1,3', '1-5' or 'all') or add new guests:\n\n"
                 
                 guest_prompt += "Examples:\n"
                 guest_prompt += "- 'John Doe, 111-555-1234'\n"
@@ -2,6 +2,7 @@ import logging
 from app.handlers import HandlerResult
 from app.models.event import Event
 from app.models.contact import Contact
+from app.services.contact_menu_service import get_contact_menu_service
 
 logger = logging.getLogger(__name__)
 
@@ -102,16 +103,14 @@ class ContactRemovalHandler:
         
         if original_stage == 'collecting_guests':
             # Show contact selection like the original guest collection flow
-            contacts = Contact.query.filter_by(planner_id=event.planner.id).all()
+            contact_menu = get_contact_menu_service().render_page(event.planner)
             
-            if contacts:
+            if contact_menu:
                 # Build contact selection message
                 contact_message = f"{prefix_message}\n\nWho's coming?\n\n"
-                contact_message += "Contacts:\n"
-                for i, contact in enumerate(contacts, 1):
-                    contact_message += f"{i}. {contact.name} ({contact.phone_number})\n"
+                contact_message += contact_menu
                 
-                contact_message += "\nSelect contacts (e.g. '1,3') or add new guests (e.g. 'John Doe, 123-456-7890').\n\n"
+                contact_message += "\nSelect contacts (e.g. '1,3', '1-5' or 'all') or add new guests (e.g. 'John Doe, 123-456-7890').\n\n"
                 contact_message += "Add one guest at a time.\n\n"
                 contact_message += "💡 Commands:\n"
                 contact_message += "- 'Remove contact'\n"
@@ -5,6 +5,7 @@ from datetime import datetime, timedelta
 from app.handlers import BaseWorkflowHandler, HandlerResult
 from app.models.event import Event
 from app.services.ai_processing_service import AIProcessingService
+from app.utils.structured_logging import log_category
 
 logger = logging.getLogger(__name__)
 
@@ -33,10 +34,9 @@ class DateCollectionHandler(BaseWorkflowHandler):
             date_data = self._parse_date_input(message_text)
             
             if date_data['success']:
-                # Save dates to event - store both individual dates and text summary
-                import json
-                dates_json = json.dumps(date_data['dates'])
-                event.notes = f"Proposed dates: {date_data['dates_text']}\nDates JSON: {dates_json}"
+                # Save dates to event - individual dates in event_dates, text summary in notes
+                event.set_proposed_dates(date_data['dates'])
+                event.notes = f"Proposed dates: {date_data['dates_text']}"
                 event.save()
                 
                 # Generate confirmation menu
@@ -119,7 +119,7 @@ RESPOND WITH ONLY THE JSON OBJECT - NO OTHER TEXT."""
                     if json_match:
                         json_str = json_match.group()
                         result = json.loads(json_str)
-                        logger.info(f"Date collection AI parsing successful: {result}")
+                        logger.info("Date collection AI parsing successful: %s", result, extra=log_category('ai_payload'))
                         return result
                     else:
                         logger.error(f"No JSON found in AI response: '{response}'")
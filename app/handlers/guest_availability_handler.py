@@ -7,6 +7,8 @@ from app.models.event import Event
 from app.models.guest import Guest
 from app.models.availability import Availability
 from app.models.guest_state import GuestState
+from app.services.notification_digest_service import get_notification_digest_service, get_response_counts
+from app.utils.structured_logging import log_category
 
 logger = logging.getLogger(__name__)
 
@@ -44,9 +46,9 @@ class GuestAvailabilityHandler(BaseWorkflowHandler):
             
             # Parse availability using distributed AI parsing
             context = guest_state.get_state_data()
-            logger.info(f"Guest availability parsing - context: {context}")
+            logger.info("Guest availability parsing - context: %s", context, extra=log_category('parse_result'))
             parsed_availability = self._parse_availability_input(message, context)
-            logger.info(f"Guest availability parsing - result: {parsed_availability}")
+            logger.info("Guest availability parsing - result: %s", parsed_availability, extra=log_category('parse_result'))
             
             if parsed_availability.get('success') and parsed_availability.get('available_dates'):
                 # Validate availability entries before saving
@@ -163,11 +165,9 @@ class GuestAvailabilityHandler(BaseWorkflowHandler):
             guest_name = self._extract_first_name(guest.name)
             
             # Count remaining guests who haven't responded
-            total_guests = Guest.query.filter_by(event_id=guest_state.event_id).count()
-            responded_guests = Guest.query.filter_by(
-                event_id=guest_state.event_id, 
-                availability_provided=True
-            ).count()
+            counts = guest_state.event.get_response_counts()
+            total_guests = counts['total']
+            responded_guests = counts['availability_responded']
             remaining_guests = total_guests - responded_guests
             
             # Create planner notification message
@@ -226,13 +226,13 @@ class GuestAvailabilityHandler(BaseWorkflowHandler):
         # Try AI parsing first
         ai_result = self._ai_parse_availability(message, context)
         if ai_result and ai_result.get('success'):
-            logger.info(f"Guest availability - AI parsing successful: {ai_result}")
+            logger.info("Guest availability - AI parsing successful: %s", ai_result, extra=log_category('ai_payload'))
             return ai_result
         
         # Fall back to simple parsing
         logger.info("Guest availability - AI failed, using simple parsing")
         simple_result = self._simple_parse_availability(message, context)
-        logger.info(f"Guest availability - simple parsing result: {simple_result}")
+        logger.info("Guest availability - simple parsing result: %s", simple_result, extra=log_category('parse_result'))
         return simple_result
     
     def _ai_parse_availability(self, message: str, context: dict) -> dict:
@@ -351,11 +351,11 @@ Examples (using actual event dates from context above):
 "Saturday 11-5" -> {{"success": true, "available_dates": [{{"date": "[SATURDAY_DATE]", "start_time": "11:00", "end_time": "17:00", "all_day": false}}]}}
 "Friday 7-11p, Saturday 11-5" -> {{"success": true, "available_dates": [{{"date": "[FRIDAY_DATE]", "start_time": "19:00", "end_time": "23:00", "all_day": false}}, {{"date": "[SATURDAY_DATE]", "start_time": "11:00", "end_time": "17:00", "all_day": false}}]}}"""
 
-            logger.info(f"Guest availability - attempting AI parsing for: '{message}'")
-            logger.info(f"Guest availability - sending prompt: {prompt}")
+            logger.info("Guest availability - attempting AI parsing for: '%s'", message, extra=log_category('sms_payload'))
+            logger.info("Guest availability - sending prompt: %s", prompt, extra=log_category('ai_payload'))
             response = self.ai_service.make_completion(prompt, 300)
-            logger.info(f"Guest availability - AI response: '{response}'")
-            logger.info(f"Guest availability - AI response type: {type(response)}")
+            logger.info("Guest availability - AI response: '%s'", response, extra=log_category('ai_payload'))
+            logger.debug("Guest availability - AI response type: %s", type(response))
             
             if response and response.strip():
                 try:
@@ -364,7 +364,7 @@ Examples (using actual event dates from context above):
                     if json_match:
                         json_str = json_match.group()
                         result = json.loads(json_str)
-                        logger.info(f"Guest availability - AI parsing result: {result}")
+                        logger.info("Guest availability - AI parsing result: %s", result, extra=log_category('ai_payload'))
                         return result
                     else:
                         logger.error(f"Guest availability - No JSON found in AI response: '{response}'")
@@ -743,13 +743,7 @@ Examples (using actual event dates from context above):
                 event = guest_state.event
                 is_late_arrival = event.workflow_stage not in ['collecting_availability', 'tracking_availability']
                 
-                # Count remaining guests who haven't responded
-                total_guests = Guest.query.filter_by(event_id=guest_state.event_id).count()
-                responded_guests = Guest.query.filter_by(
-                    event_id=guest_state.event_id, 
-                    availability_provided=True
-                ).count()
-                remaining_guests = total_guests - responded_guests
+                planner_phone = event.planner.phone_number
                 
                 if is_late_arrival:
                     # Late arrival - force planner back to overlap calculation
@@ -763,27 +757,23 @@ Examples (using actual event dates from context above):
                     event.workflow_stage = 'collecting_availability'
                     event.save()
                     
-                elif remaining_guests > 0:
-                    # Normal flow - still waiting for others
-                    planner_message = f"✅ {guest_name} has provided their availability!\n\n"
-                    planner_message += f"📊 {responded_guests}/{total_guests} guests have responded\n"
-                    planner_message += f"⏳ Waiting for {remaining_guests} more guest" + ("s" if remaining_guests != 1 else "") + "\n\n"
-                    planner_message += f"Press 1 to view current overlaps"
+                    self.sms_service.send_sms(planner_phone, planner_message)
                 else:
-                    # Normal flow - everyone responded
-                    planner_message = f"✅ {guest_name} has provided their availability!\n\n"
-                    planner_message += f"🎉 Everyone has responded!\n\n"
-                    planner_message += "Would you like to:\n"
-                    planner_message += "1. Pick a time\n"
-                    planner_message += "2. Add more guests"
+                    # Count remaining guests who haven't responded (O(1) counter read)
+                    counts = get_response_counts(guest_state.event_id)
+                    remaining_guests = counts['total'] - counts['availability_responded']
                     
-                    # Update event workflow stage to handle planner's next choice
-                    event.workflow_stage = 'collecting_availability'
-                    event.save()
-                
-                # Send SMS to planner
-                planner_phone = guest_state.event.planner.phone_number
-                self.sms_service.send_sms(planner_phone, planner_message)
+                    if remaining_guests == 0:
+                        # Everyone responded - update event workflow stage to handle planner's next choice
+                        event.workflow_stage = 'collecting_availability'
+                        event.save()
+                    
+                    # Planner gets one digest per window instead of one SMS per guest;
+                    # the last response flushes immediately so the planner can pick a time
+                    get_notification_digest_service().add_availability_response(
+                        event.id, planner_phone, guest_name,
+                        counts=counts, final=remaining_guests == 0
+                    )
             
             return f"✅ Thanks! I've recorded your availability for {planner_name}. They'll use this to find the best time for everyone."
                    
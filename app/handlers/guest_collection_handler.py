@@ -6,6 +6,11 @@ from app.models.event import Event
 from app.models.guest import Guest
 from app.models.contact import Contact
 from app.services.ai_processing_service import AIProcessingService
+from app.services.guest_management_service import is_contact_selection, parse_contact_selection
+from app.services.contact_menu_service import get_contact_menu_service
+from app.services.contact_search_service import is_contact_name_command
+from app.utils.phone import extract_guests_from_text
+from app.utils.structured_logging import log_category
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +27,7 @@ class GuestCollectionHandler(BaseWorkflowHandler):
             
             # Handle special commands
             if message_lower in ['done', 'finished', 'next']:
-                if len(event.guests) == 0:
+                if event.get_response_counts()['total'] == 0:
                     return HandlerResult.error_response(
                         "You haven't added any guests yet. Please add at least one guest before proceeding."
                     )
@@ -37,10 +42,24 @@ class GuestCollectionHandler(BaseWorkflowHandler):
                 
                 return HandlerResult.success_response(date_prompt, 'collecting_dates')
             
-            # Handle contact selection (numeric input like "1,2,3")
-            if re.match(r'^\s*\d+(\s*,\s*\d+)*\s*$', message.strip()):
+            # Page through the contact menu
+            if message_lower == 'more':
+                contact_menu = get_contact_menu_service().render_next_page(event.planner)
+                if contact_menu:
+                    return HandlerResult.success_response(
+                        contact_menu + "\nSelect contacts (e.g. '1,3', '1-5' or 'all') or add new guests."
+                    )
+            
+            # Handle contact selection (numeric input like "1,2,3", "1-12" or "all")
+            if is_contact_selection(message):
                 return self._handle_contact_selection(event, message)
             
+            # Handle contacts typed by name ("add jess, mike r")
+            if is_contact_name_command(message):
+                name_result = self._handle_contact_names(event, message)
+                if name_result:
+                    return name_result
+            
             # Parse guest input using AI for this step
             guest_data = self._parse_guest_input(message)
             
@@ -74,6 +93,12 @@ class GuestCollectionHandler(BaseWorkflowHandler):
                     response += "Add more guests, or reply 'done' when finished."
                     return HandlerResult.success_response(response)
             
+            else:
+                # Not a new guest - maybe saved contacts named without "add"
+                name_result = self._handle_contact_names(event, message)
+                if name_result:
+                    return name_result
+            
             # If parsing failed, provide helpful error
             return HandlerResult.error_response(
                 "❌ Could not parse guest information. Please use format like:\n"
@@ -88,43 +113,19 @@ class GuestCollectionHandler(BaseWorkflowHandler):
     def _handle_contact_selection(self, event: Event, message: str) -> HandlerResult:
         """Handle selection from previous contacts"""
         try:
-            # Parse contact numbers
-            if ',' in message.strip():
-                selected_numbers = [int(num.strip()) for num in message.split(',')]
-            else:
-                selected_numbers = [int(message.strip())]
-            
-            # Get planner's contacts
-            contacts = Contact.query.filter_by(planner_id=event.planner_id).order_by(Contact.name).all()
+            # Get planner's numbered contact menu
+            contact_menu = get_contact_menu_service()
+            entries = contact_menu.get_entries(event.planner)
             
-            if not contacts:
+            if not entries:
                 return HandlerResult.error_response(
                     "You don't have any saved contacts yet. Please add guests with their phone numbers."
                 )
             
-            # Add selected contacts as guests
-            added_guests = []
-            for num in selected_numbers:
-                if 1 <= num <= len(contacts):
-                    contact = contacts[num - 1]
-                    
-                    # Check if already added
-                    existing = Guest.query.filter_by(
-                        event_id=event.id,
-                        phone_number=contact.phone_number
-                    ).first()
-                    
-                    if not existing:
-                        guest = Guest(
-                            event_id=event.id,
-                            contact_id=contact.id,
-                            name=contact.name,
-                            phone_number=contact.phone_number,
-                            rsvp_status='pending',
-                            availability_provided=False
-                        )
-                        guest.save()
-                        added_guests.append(guest)
+            # Add selected contacts as guests in one batch
+            selected_numbers = parse_contact_selection(message, len(entries))
+            selected_contacts = contact_menu.get_selected_contacts(event.planner, selected_numbers)
+            added_guests = self.guest_service.add_contacts_as_guests(event, selected_contacts)
             
             if added_guests:
                 guest_names = [guest.name for guest in added_guests]
@@ -144,23 +145,29 @@ class GuestCollectionHandler(BaseWorkflowHandler):
                 
         except ValueError:
             return HandlerResult.error_response(
-                "Please use contact numbers (e.g. '1,3') or add new guests with names and phone numbers."
+                "Please use contact numbers (e.g. '1,3', '1-5' or 'all') or add new guests with names and phone numbers."
             )
 
     def _parse_guest_input(self, text: str) -> dict:
         """Parse guest input specific to guest collection step"""
         logger.info(f"Guest collection - parsing input: '{text}'")
         
-        # Try AI parsing first
+        # Well-formed "Name, phone" input is handled deterministically
+        guests = extract_guests_from_text(text)
+        if guests:
+            logger.info(f"Guest collection - extracted {len(guests)} guest(s) without AI")
+            return {'success': True, 'guests': guests}
+        
+        # Residual cases go to AI
         ai_result = self._ai_parse_guest(text)
         if ai_result and ai_result.get('success'):
-            logger.info(f"Guest collection - AI parsing succeeded: {ai_result}")
+            logger.info("Guest collection - AI parsing succeeded: %s", ai_result, extra=log_category('ai_payload'))
             return ai_result
         
         # Fallback to regex for this step
         logger.info("Guest collection - falling back to regex parsing")
         regex_result = self._regex_parse_guest(text)
-        logger.info(f"Guest collection - regex parsing result: {regex_result}")
+        logger.info("Guest collection - regex parsing result: %s", regex_result, extra=log_category('parse_result'))
         return regex_result
     
     def _ai_parse_guest(self, text: str) -> dict:
@@ -196,9 +203,9 @@ Examples:
 "Sarah and Mike" -> {{"success": false, "error": "Phone numbers required for all guests"}}
 "hello" -> {{"success": false, "error": "No guest info found"}}"""
 
-            logger.info(f"Guest collection - attempting AI parsing for: '{text}'")
+            logger.info("Guest collection - attempting AI parsing for: '%s'", text, extra=log_category('sms_payload'))
             response = self.ai_service.make_completion(prompt, 200)
-            logger.info(f"Guest collection - AI response: {response}")
+            logger.info("Guest collection - AI response: %s", response, extra=log_category('ai_payload'))
             
             if response and response.strip():
                 try:
@@ -208,7 +215,7 @@ Examples:
                     if json_match:
                         json_str = json_match.group()
                         result = json.loads(json_str)
-                        logger.info(f"Guest collection - AI parsing result: {result}")
+                        logger.info("Guest collection - AI parsing result: %s", result, extra=log_category('ai_payload'))
                         return result
                     else:
                         logger.error(f"Guest collection - No JSON found in AI response: '{response}'")
@@ -310,12 +317,10 @@ Examples:
     
     def _generate_contact_list_display(self, event: Event) -> str:
         """Generate contact list display for reuse"""
-        contacts = Contact.query.filter_by(planner_id=event.planner_id).order_by(Contact.name).all()
-        if contacts:
-            display = "Select contacts (e.g. '1,3') or add new guests (e.g. 'John Doe, 123-456-7890').\n\n"
-            display += "Contacts:\n"
-            for i, contact in enumerate(contacts, 1):
-                display += f"{i}. {contact.name} ({contact.phone_number})\n"
+        contact_menu = get_contact_menu_service().render_page(event.planner)
+        if contact_menu:
+            display = "Select contacts (e.g. '1,3', '1-5' or 'all') or add new guests (e.g. 'John Doe, 123-456-7890').\n\n"
+            display += contact_menu
             display += "\n"
             return display
         return ""
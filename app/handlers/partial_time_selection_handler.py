@@ -92,8 +92,9 @@ class PartialTimeSelectionHandler(BaseWorkflowHandler):
                 )
             
             # Count responses
-            responded_count = sum(1 for guest in event.guests if guest.availability_provided)
-            total_count = len(event.guests)
+            counts = event.get_response_counts()
+            responded_count = counts['availability_responded']
+            total_count = counts['total']
             pending_guests = [guest for guest in event.guests if not guest.availability_provided]
             
             # Format message
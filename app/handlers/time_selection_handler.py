@@ -23,8 +23,7 @@ class TimeSelectionHandler(BaseWorkflowHandler):
                 
                 # Get the actual availability overlaps for this event
                 # Use same logic as availability tracking handler for consistency
-                responded_guests = [guest for guest in event.guests if guest.availability_provided]
-                show_individual = len(responded_guests) == 1
+                show_individual = event.get_response_counts()['availability_responded'] == 1
                 overlaps = self.availability_service.calculate_availability_overlaps(event.id, show_individual_availability=show_individual)
                 
                 if overlaps and 1 <= slot_number <= len(overlaps):
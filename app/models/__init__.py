@@ -25,3 +25,17 @@ class BaseModel(db.Model):
     def to_dict(self):
         """Convert instance to dictionary"""
         return {column.name: getattr(self, column.name) for column in self.__table__.columns}
+
+
+# Re-export models so callers can import them from app.models directly
+from app.models.planner import Planner
+from app.models.event import Event
+from app.models.guest import Guest
+from app.models.guest_state import GuestState
+from app.models.contact import Contact
+from app.models.availability import Availability
+from app.models.event_date import EventDate
+from app.models.maintenance_checkpoint import MaintenanceCheckpoint
+from app.models.archived_event import ArchivedEvent
+from app.models.job_lease import JobLease
+from app.models.job_run import JobRun
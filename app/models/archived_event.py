@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON
+from app.models import BaseModel
+
+class ArchivedEvent(BaseModel):
+    """Events moved out of the hot tables by the retention job, with their guests,
+    availability, proposed dates and guest states as one JSON payload"""
+    __tablename__ = 'archived_events'
+    
+    # Original ids; the live event is gone once archived, so no foreign keys
+    # (CascadeDeleteService deletes a planner's archives explicitly)
+    event_id = Column(Integer, unique=True, nullable=False, index=True)
+    planner_id = Column(Integer, nullable=False, index=True)
+    
+    status = Column(String(20), nullable=False)
+    event_updated_at = Column(DateTime, nullable=True)
+    payload = Column(JSON, nullable=False)
+    
+    def __repr__(self):
+        return f'<ArchivedEvent {self.event_id} - {self.status}>'
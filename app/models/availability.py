@@ -1,14 +1,19 @@
-from sqlalchemy import Column, Integer, String, Date, Time, Boolean, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, Time, Boolean, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.models import BaseModel
 
 class Availability(BaseModel):
     """Guest availability data"""
     __tablename__ = 'availability'
+    __table_args__ = (
+        Index('ix_availability_event_id_guest_id', 'event_id', 'guest_id'),
+        Index('ix_availability_guest_id_event_id_date', 'guest_id', 'event_id', 'date'),
+        Index('ix_availability_updated_at', 'updated_at'),
+    )
     
     # Foreign keys
-    event_id = Column(Integer, ForeignKey('events.id'), nullable=False)
-    guest_id = Column(Integer, ForeignKey('guests.id'), nullable=False)
+    event_id = Column(Integer, ForeignKey('events.id', ondelete='CASCADE'), nullable=False)
+    guest_id = Column(Integer, ForeignKey('guests.id', ondelete='CASCADE'), nullable=False)
     
     # Availability details
     date = Column(Date, nullable=True)
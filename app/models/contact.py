@@ -1,13 +1,18 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, event as sa_event, inspect
+from sqlalchemy.orm import relationship, Session
 from app.models import BaseModel
 
 class Contact(BaseModel):
     """Planner's saved contacts"""
     __tablename__ = 'contacts'
+    __table_args__ = (
+        Index('ix_contacts_planner_id_phone_number', 'planner_id', 'phone_number'),
+        Index('ix_contacts_planner_id_name', 'planner_id', 'name'),
+        Index('ix_contacts_created_at', 'created_at'),
+    )
     
     # Foreign keys
-    planner_id = Column(Integer, ForeignKey('planners.id'), nullable=False)
+    planner_id = Column(Integer, ForeignKey('planners.id', ondelete='CASCADE'), nullable=False)
     
     # Contact details
     name = Column(String(100), nullable=False)
@@ -20,3 +25,47 @@ class Contact(BaseModel):
     
     def __repr__(self):
         return f'<Contact {self.name} - {self.phone_number}>'
+
+
+# Changes to these columns alter the rendered contact menu
+MENU_COLUMNS = ('planner_id', 'name', 'phone_number')
+
+
+@sa_event.listens_for(Session, 'after_flush')
+def _bump_contacts_version(session, flush_context):
+    """Bump Planner.contacts_version for every planner whose contact list changed"""
+    planner_ids = set()
+    for obj in list(session.new) + list(session.deleted):
+        if isinstance(obj, Contact):
+            planner_ids.add(obj.planner_id)
+    for obj in session.dirty:
+        if isinstance(obj, Contact):
+            state = inspect(obj)
+            if any(state.attrs[column].history.has_changes() for column in MENU_COLUMNS):
+                planner_ids.add(obj.planner_id)
+                planner_ids.update(state.attrs.planner_id.history.deleted)
+    planner_ids.discard(None)
+    if not planner_ids:
+        return
+    
+    from app.models.planner import Planner
+    planners_table = Planner.__table__
+    session.connection().execute(
+        planners_table.update()
+        .where(planners_table.c.id.in_(planner_ids))
+        .values(contacts_version=planners_table.c.contacts_version + 1)
+    )
+    session.info.setdefault('stale_contact_versions', set()).update(planner_ids)
+
+
+@sa_event.listens_for(Session, 'after_flush_postexec')
+def _expire_stale_contact_versions(session, flush_context):
+    """Make in-memory Planner objects re-read a bumped contacts_version"""
+    from app.models.planner import Planner
+    stale_ids = session.info.pop('stale_contact_versions', None)
+    if not stale_ids:
+        return
+    for planner_id in stale_ids:
+        planner = session.identity_map.get(inspect(Planner).identity_key_from_primary_key((planner_id,)))
+        if planner is not None and planner not in session.deleted:
+            session.expire(planner, ['contacts_version'])
@@ -1,13 +1,19 @@
-from sqlalchemy import Column, Integer, String, Date, Time, Text, JSON, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Date, Time, Text, JSON, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from app.models import BaseModel
 
 class Event(BaseModel):
     """Events being planned"""
     __tablename__ = 'events'
+    __table_args__ = (
+        Index('ix_events_planner_id_status', 'planner_id', 'status'),
+        Index('ix_events_updated_at', 'updated_at'),
+        Index('ix_events_created_at', 'created_at'),
+        Index('ix_events_workflow_stage', 'workflow_stage'),
+    )
     
     # Foreign keys
-    planner_id = Column(Integer, ForeignKey('planners.id'), nullable=False)
+    planner_id = Column(Integer, ForeignKey('planners.id', ondelete='CASCADE'), nullable=False)
     
     # Event details
     title = Column(String(200), nullable=True)
@@ -37,10 +43,50 @@ class Event(BaseModel):
     # Notes and workflow data
     notes = Column(Text, nullable=True)
     
+    # Denormalized response counters - kept in sync by the Guest flush listener
+    # in app/models/guest.py and reconciled by the background integrity job
+    guests_total = Column(Integer, nullable=False, default=0, server_default='0')
+    availability_responded = Column(Integer, nullable=False, default=0, server_default='0')
+    rsvp_yes = Column(Integer, nullable=False, default=0, server_default='0')
+    rsvp_no = Column(Integer, nullable=False, default=0, server_default='0')
+    rsvp_maybe = Column(Integer, nullable=False, default=0, server_default='0')
+    
     # Relationships
     planner = relationship("Planner", back_populates="events")
     guests = relationship("Guest", back_populates="event", cascade="all, delete-orphan")
     guest_states = relationship("GuestState", back_populates="event", cascade="all, delete-orphan")
+    proposed_dates = relationship("EventDate", back_populates="event", cascade="all, delete-orphan",
+                                  order_by="EventDate.date")
+    
+    def get_response_counts(self) -> dict:
+        """Responded/total guest counts read from the denormalized counters"""
+        return {
+            'total': self.guests_total or 0,
+            'availability_responded': self.availability_responded or 0,
+            'rsvp_responded': (self.rsvp_yes or 0) + (self.rsvp_no or 0) + (self.rsvp_maybe or 0)
+        }
+    
+    def get_proposed_dates(self) -> list:
+        """Proposed dates in order, read from the indexed event_dates table"""
+        return [event_date.date for event_date in self.proposed_dates]
+    
+    def set_proposed_dates(self, dates) -> None:
+        """Replace the proposed dates; accepts date objects or 'YYYY-MM-DD' strings"""
+        from datetime import datetime
+        from app.models.event_date import EventDate
+        
+        parsed = []
+        for value in dates:
+            if isinstance(value, str):
+                try:
+                    value = datetime.strptime(value, '%Y-%m-%d').date()
+                except ValueError:
+                    continue
+            if value not in parsed:
+                parsed.append(value)
+        
+        existing = {event_date.date: event_date for event_date in self.proposed_dates}
+        self.proposed_dates = [existing.get(value) or EventDate(date=value) for value in sorted(parsed)]
     
     def __repr__(self):
         return f'<Event {self.title or self.id} - {self.workflow_stage}>'
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, Date, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from app.models import BaseModel
+
+class EventDate(BaseModel):
+    """Proposed dates for an event (previously stored as "Dates JSON:" in Event.notes)"""
+    __tablename__ = 'event_dates'
+    __table_args__ = (
+        Index('ix_event_dates_event_id_date', 'event_id', 'date', unique=True),
+    )
+    
+    # Foreign keys
+    event_id = Column(Integer, ForeignKey('events.id', ondelete='CASCADE'), nullable=False)
+    
+    # Date details
+    date = Column(Date, nullable=False)
+    
+    # Relationships
+    event = relationship("Event", back_populates="proposed_dates")
+    
+    def __repr__(self):
+        return f'<EventDate {self.event_id} - {self.date}>'
@@ -1,22 +1,40 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey
-from sqlalchemy.orm import relationship
+from collections import defaultdict
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Index, event as sa_event, inspect
+from sqlalchemy.orm import relationship, column_property, Session
 from app.models import BaseModel
 
+# Event counter column -> rsvp_status value it tracks
+RSVP_COUNTER_COLUMNS = {
+    'rsvp_yes': 'yes',
+    'rsvp_no': 'no',
+    'rsvp_maybe': 'maybe'
+}
+
 class Guest(BaseModel):
     """Event attendees"""
     __tablename__ = 'guests'
+    __table_args__ = (
+        Index('ix_guests_event_id_phone_number', 'event_id', 'phone_number'),
+        Index('ix_guests_event_id_availability_provided', 'event_id', 'availability_provided'),
+        Index('ix_guests_updated_at', 'updated_at'),
+        Index('ix_guests_contact_id', 'contact_id'),
+        Index('ix_guests_created_at', 'created_at'),
+    )
     
     # Foreign keys
-    event_id = Column(Integer, ForeignKey('events.id'), nullable=False)
-    contact_id = Column(Integer, ForeignKey('contacts.id'), nullable=True)
+    # Counter-tracked columns load their old value on change (active_history)
+    # so the flush listener below can compute exact Event counter deltas
+    event_id = column_property(Column(Integer, ForeignKey('events.id', ondelete='CASCADE'), nullable=False),
+                               active_history=True)
+    contact_id = Column(Integer, ForeignKey('contacts.id', ondelete='SET NULL'), nullable=True)
     
     # Guest details
     name = Column(String(100), nullable=False)
     phone_number = Column(String(20), nullable=False)
     
     # RSVP tracking
-    rsvp_status = Column(String(20), nullable=False, default='pending')
-    availability_provided = Column(Boolean, nullable=False, default=False)
+    rsvp_status = column_property(Column(String(20), nullable=False, default='pending'), active_history=True)
+    availability_provided = column_property(Column(Boolean, nullable=False, default=False), active_history=True)
     
     # Relationships
     event = relationship("Event", back_populates="guests")
@@ -25,3 +43,100 @@ class Guest(BaseModel):
     
     def __repr__(self):
         return f'<Guest {self.name} - {self.rsvp_status}>'
+
+
+def guest_counter_contribution(availability_provided, rsvp_status) -> dict:
+    """How much a single guest adds to each Event counter column"""
+    contribution = {
+        'guests_total': 1,
+        'availability_responded': 1 if availability_provided else 0
+    }
+    for column, status in RSVP_COUNTER_COLUMNS.items():
+        contribution[column] = 1 if rsvp_status == status else 0
+    return contribution
+
+
+def _attribute_values(guest, attr, default):
+    """Return (old, new) values for an attribute from the flush history"""
+    history = inspect(guest).attrs[attr].history
+    if history.added:
+        new_value = history.added[0]
+    elif history.unchanged:
+        new_value = history.unchanged[0]
+    else:
+        new_value = default
+    if history.deleted:
+        old_value = history.deleted[0]
+    else:
+        old_value = new_value
+    return old_value, new_value
+
+
+@sa_event.listens_for(Session, 'after_flush')
+def _maintain_event_counters(session, flush_context):
+    """Apply Guest inserts/updates/deletes to the Event counters as atomic increments"""
+    deltas = defaultdict(lambda: defaultdict(int))
+
+    def apply(event_id, availability_provided, rsvp_status, sign):
+        if event_id is None:
+            return
+        for column, value in guest_counter_contribution(availability_provided, rsvp_status).items():
+            deltas[event_id][column] += sign * value
+
+    for obj in session.new:
+        if isinstance(obj, Guest):
+            apply(obj.event_id, obj.availability_provided, obj.rsvp_status or 'pending', 1)
+
+    for obj in session.deleted:
+        if isinstance(obj, Guest):
+            old_event_id, _ = _attribute_values(obj, 'event_id', None)
+            old_provided, _ = _attribute_values(obj, 'availability_provided', False)
+            old_status, _ = _attribute_values(obj, 'rsvp_status', 'pending')
+            apply(old_event_id, old_provided, old_status, -1)
+
+    for obj in session.dirty:
+        if not isinstance(obj, Guest) or not session.is_modified(obj, include_collections=False):
+            continue
+        old_event_id, new_event_id = _attribute_values(obj, 'event_id', None)
+        old_provided, new_provided = _attribute_values(obj, 'availability_provided', False)
+        old_status, new_status = _attribute_values(obj, 'rsvp_status', 'pending')
+        if (old_event_id, old_provided, old_status) == (new_event_id, new_provided, new_status):
+            continue
+        apply(old_event_id, old_provided, old_status, -1)
+        apply(new_event_id, new_provided, new_status, 1)
+
+    if not deltas:
+        return
+
+    apply_event_counter_deltas(session.connection(), deltas)
+    session.info.setdefault('stale_event_counters', set()).update(deltas.keys())
+
+
+def apply_event_counter_deltas(connection, deltas) -> None:
+    """Apply {event_id: {counter column: delta}} to the events table as atomic increments"""
+    from app.models.event import Event
+    events_table = Event.__table__
+    for event_id, columns in deltas.items():
+        values = {
+            column: events_table.c[column] + delta
+            for column, delta in columns.items() if delta
+        }
+        if values:
+            # col = col + delta keeps concurrent writers from losing updates
+            connection.execute(
+                events_table.update().where(events_table.c.id == event_id).values(**values)
+            )
+
+
+@sa_event.listens_for(Session, 'after_flush_postexec')
+def _expire_stale_event_counters(session, flush_context):
+    """Make in-memory Event objects re-read counters changed behind the ORM's back"""
+    from app.models.event import Event
+    stale_ids = session.info.pop('stale_event_counters', None)
+    if not stale_ids:
+        return
+    counter_columns = ['guests_total', 'availability_responded'] + list(RSVP_COUNTER_COLUMNS)
+    for event_id in stale_ids:
+        event = session.identity_map.get(inspect(Event).identity_key_from_primary_key((event_id,)))
+        if event is not None and event not in session.deleted:
+            session.expire(event, counter_columns)
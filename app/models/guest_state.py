@@ -1,20 +1,27 @@
-from sqlalchemy import Column, Integer, String, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, JSON, DateTime, ForeignKey, or_, event as sa_event
 from sqlalchemy.orm import relationship
+from datetime import datetime, timedelta
 from app.models import BaseModel
 import json
 
+# Default lifetime of a guest conversation when the app config does not set one
+DEFAULT_GUEST_STATE_TTL_HOURS = 7 * 24
+
 class GuestState(BaseModel):
     """Temporary conversation states for non-planners"""
     __tablename__ = 'guest_states'
     
     # Foreign keys
-    event_id = Column(Integer, ForeignKey('events.id'), nullable=False)
+    event_id = Column(Integer, ForeignKey('events.id', ondelete='CASCADE'), nullable=False)
     
     # State management
     phone_number = Column(String(20), nullable=False, unique=True, index=True)
     current_state = Column(String(50), nullable=False)
     state_data = Column(JSON, nullable=True)
     
+    # Pushed forward on every write; expired states are ignored by the router and swept
+    expires_at = Column(DateTime, nullable=True, index=True)
+    
     # Relationships
     event = relationship("Event", back_populates="guest_states")
     
@@ -26,5 +33,34 @@ class GuestState(BaseModel):
         """Helper to get state data"""
         return json.loads(self.state_data) if self.state_data else {}
     
+    def is_expired(self, now=None):
+        return self.expires_at is not None and self.expires_at <= (now or datetime.utcnow())
+    
+    @classmethod
+    def find_active(cls, phone_number, now=None):
+        """The unexpired state for a phone number, if any"""
+        return cls.query.filter(
+            cls.phone_number == phone_number,
+            or_(cls.expires_at.is_(None), cls.expires_at > (now or datetime.utcnow()))
+        ).first()
+    
     def __repr__(self):
         return f'<GuestState {self.phone_number} - {self.current_state}>'
+
+
+def guest_state_ttl() -> timedelta:
+    """Conversation lifetime from GUEST_STATE_TTL_HOURS"""
+    try:
+        from flask import current_app
+        hours = current_app.config.get('GUEST_STATE_TTL_HOURS', DEFAULT_GUEST_STATE_TTL_HOURS)
+    except RuntimeError:
+        # Outside an application context
+        hours = DEFAULT_GUEST_STATE_TTL_HOURS
+    return timedelta(hours=float(hours))
+
+
+@sa_event.listens_for(GuestState, 'before_insert')
+@sa_event.listens_for(GuestState, 'before_update')
+def _refresh_expiry(mapper, connection, target):
+    """Every request sent to or answered by the guest restarts the TTL"""
+    target.expires_at = datetime.utcnow() + guest_state_ttl()
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, String, DateTime
+from app.models import BaseModel
+
+class JobLease(BaseModel):
+    """Single-instance lock and shared next run time for a scheduled job"""
+    __tablename__ = 'job_leases'
+    
+    name = Column(String(100), unique=True, nullable=False, index=True)
+    
+    # Process holding the lease and when it lapses if that process dies mid-run
+    owner = Column(String(100), nullable=True)
+    locked_until = Column(DateTime, nullable=True)
+    
+    # Shared across processes so a job keeps its cadence whichever process runs it
+    next_run_at = Column(DateTime, nullable=True)
+    last_run_at = Column(DateTime, nullable=True)
+    
+    def __repr__(self):
+        return f'<JobLease {self.name} - {self.owner} until {self.locked_until}>'
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, String, DateTime, Float, Text, Index
+from app.models import BaseModel
+
+class JobRun(BaseModel):
+    """History of scheduled job runs with their durations"""
+    __tablename__ = 'job_runs'
+    __table_args__ = (
+        Index('ix_job_runs_name_started_at', 'name', 'started_at'),
+    )
+    
+    name = Column(String(100), nullable=False)
+    owner = Column(String(100), nullable=True)
+    
+    started_at = Column(DateTime, nullable=False, index=True)
+    finished_at = Column(DateTime, nullable=False)
+    duration_ms = Column(Float, nullable=False)
+    
+    status = Column(String(20), nullable=False)  # success, failed
+    result = Column(Text, nullable=True)
+    error = Column(Text, nullable=True)
+    
+    def __repr__(self):
+        return f'<JobRun {self.name} - {self.status} in {self.duration_ms:.0f}ms>'
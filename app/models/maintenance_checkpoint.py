@@ -0,0 +1,12 @@
+from sqlalchemy import Column, String, DateTime
+from app.models import BaseModel
+
+class MaintenanceCheckpoint(BaseModel):
+    """High-water marks for incremental background maintenance jobs"""
+    __tablename__ = 'maintenance_checkpoints'
+    
+    name = Column(String(100), unique=True, nullable=False, index=True)
+    high_water_mark = Column(DateTime, nullable=True)
+    
+    def __repr__(self):
+        return f'<MaintenanceCheckpoint {self.name} - {self.high_water_mark}>'
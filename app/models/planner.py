@@ -1,14 +1,24 @@
-from sqlalchemy import Column, String
+from sqlalchemy import Column, Integer, String, Index
 from sqlalchemy.orm import relationship
 from app.models import BaseModel
 
 class Planner(BaseModel):
     """Event planners who organize hangouts"""
     __tablename__ = 'planners'
+    __table_args__ = (
+        Index('ix_planners_created_at', 'created_at'),
+    )
     
     phone_number = Column(String(20), unique=True, nullable=False, index=True)
     name = Column(String(100), nullable=True)
     
+    # Bumped whenever the planner's contacts change; keys the cached contact menu
+    contacts_version = Column(Integer, nullable=False, default=0, server_default='0')
+    # Contact menu page last shown and the contacts_version it was numbered against, so
+    # "more" continues from it whichever worker serves the reply
+    contact_menu_page = Column(Integer, nullable=True)
+    contact_menu_page_version = Column(Integer, nullable=True)
+    
     # Relationships
     events = relationship("Event", back_populates="planner", cascade="all, delete-orphan")
     contacts = relationship("Contact", back_populates="planner", cascade="all, delete-orphan")
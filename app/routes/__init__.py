@@ -1,2 +1,2 @@
 # Routes package
-__all__ = ['sms', 'dashboard']
+__all__ = ['sms', 'dashboard', 'admin_api']
@@ -0,0 +1,168 @@
+"""
+Admin JSON API
+
+Read-only endpoints for scripts and polling dashboards:
+
+    GET /api/admin/<events|planners|contacts|guests>?limit=50&cursor=...&fields=id,name
+
+Rows come newest first with keyset pagination on (created_at, id), so every
+page is an index range scan no matter how deep the cursor goes. `fields`
+projects columns. Each page carries an ETag and Last-Modified derived from
+the count and latest updated_at of the rows matching its filters and cursor.
+That validator is one aggregate query, checked against If-None-Match /
+If-Modified-Since before the page itself is read, so an unchanged page costs
+no page query or serialization and answers with a 304 and no body. A change
+to any matching row (even one on a later page) invalidates the ETag.
+"""
+
+from flask import Blueprint, jsonify, request, current_app
+from sqlalchemy import and_, func, or_
+from werkzeug.http import is_resource_modified
+from datetime import date, datetime, time
+import base64
+import hashlib
+import hmac
+import json
+import logging
+
+from app import db
+from app.models.event import Event
+from app.models.planner import Planner
+from app.models.contact import Contact
+from app.models.guest import Guest
+
+logger = logging.getLogger(__name__)
+
+admin_api_bp = Blueprint('admin_api', __name__)
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+# resource name -> (model, columns accepted as equality filters)
+RESOURCES = {
+    'events': (Event, ['planner_id', 'workflow_stage', 'status']),
+    'planners': (Planner, ['phone_number']),
+    'contacts': (Contact, ['planner_id']),
+    'guests': (Guest, ['event_id', 'contact_id']),
+}
+
+
+class BadRequest(ValueError):
+    """Invalid query parameter; reported to the caller as a 400"""
+
+
+def _encode_cursor(created_at, row_id) -> str:
+    raw = json.dumps([created_at.isoformat(), row_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def _decode_cursor(cursor: str):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise BadRequest('Invalid cursor')
+
+
+def _serialize(value):
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return value
+
+
+def _selected_columns(table, fields_param):
+    """Requested columns plus the ones needed for the cursor"""
+    if fields_param:
+        fields = [field.strip() for field in fields_param.split(',') if field.strip()]
+        unknown = [field for field in fields if field not in table.c]
+        if unknown:
+            raise BadRequest(f"Unknown field(s): {', '.join(unknown)}")
+    else:
+        fields = [column.name for column in table.c]
+
+    query_fields = list(dict.fromkeys(fields + ['id', 'created_at']))
+    return fields, [table.c[field] for field in query_fields]
+
+
+def _filter_value(column, value: str):
+    try:
+        return column.type.python_type(value)
+    except (ValueError, NotImplementedError):
+        raise BadRequest(f"Invalid value for {column.name}")
+
+
+def _page_after_cursor(table, cursor):
+    """Keyset predicate for rows after (created_at, id) in newest-first order"""
+    created_at, row_id = _decode_cursor(cursor)
+    # The leading range term keeps this an index range scan on created_at
+    return and_(
+        table.c.created_at <= created_at,
+        or_(table.c.created_at < created_at, table.c.id < row_id),
+    )
+
+
+def _check_token():
+    """Require ADMIN_API_TOKEN as a bearer token when one is configured"""
+    token = current_app.config.get('ADMIN_API_TOKEN')
+    if not token:
+        return True
+    return hmac.compare_digest(request.headers.get('Authorization', '').encode(), f'Bearer {token}'.encode())
+
+
+def _page_validator(query, table):
+    """ETag and Last-Modified for the rows a filtered query can return"""
+    count, last_modified, max_id = query.with_entities(
+        func.count(), func.max(table.c.updated_at), func.max(table.c.id)
+    ).one()
+    fingerprint = hashlib.sha1(request.query_string)
+    fingerprint.update(f"{count}:{max_id}:{last_modified.isoformat() if last_modified else ''}".encode())
+    return fingerprint.hexdigest(), last_modified
+
+
+def _set_validators(response, etag, last_modified):
+    response.set_etag(etag, weak=True)
+    if last_modified:
+        response.last_modified = last_modified
+    response.cache_control.no_cache = True
+    return response
+
+
+@admin_api_bp.route('/<resource>')
+def list_resource(resource):
+    """One page of a resource, newest first"""
+    if resource not in RESOURCES:
+        return jsonify({'error': f"Unknown resource '{resource}'"}), 404
+    if not _check_token():
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    model, filter_fields = RESOURCES[resource]
+    table = model.__table__
+    try:
+        limit = request.args.get('limit', DEFAULT_LIMIT, type=int)
+        if limit < 1:
+            raise BadRequest('limit must be positive')
+        limit = min(limit, MAX_LIMIT)
+        fields, columns = _selected_columns(table, request.args.get('fields'))
+
+        query = db.session.query(*columns)
+        for field in filter_fields:
+            if field in request.args:
+                query = query.filter(table.c[field] == _filter_value(table.c[field], request.args[field]))
+        if request.args.get('cursor'):
+            query = query.filter(_page_after_cursor(table, request.args['cursor']))
+    except BadRequest as e:
+        return jsonify({'error': str(e)}), 400
+
+    etag, last_modified = _page_validator(query, table)
+    if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        return _set_validators(current_app.response_class(status=304), etag, last_modified)
+
+    rows = query.order_by(table.c.created_at.desc(), table.c.id.desc()).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    items = [{field: _serialize(getattr(row, field)) for field in fields} for row in rows]
+    next_cursor = _encode_cursor(rows[-1].created_at, rows[-1].id) if has_more else None
+
+    return _set_validators(jsonify({'items': items, 'next_cursor': next_cursor}), etag, last_modified)
@@ -1,35 +1,44 @@
-from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify
+from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify, current_app
+from sqlalchemy import func, distinct
+from sqlalchemy.orm import joinedload
 from app.models.event import Event
 from app.models.planner import Planner
 from app.models.contact import Contact
 from app.models.guest import Guest
-from app.models.guest_state import GuestState
+from app.services.cascade_delete_service import get_cascade_delete_service
 from app import db
-from datetime import datetime
+from datetime import datetime, timedelta
 import logging
 
 logger = logging.getLogger(__name__)
 
 dashboard_bp = Blueprint('dashboard', __name__, url_prefix='/dashboard')
 
+def _current_page():
+    """Requested page number and the configured page size"""
+    page = request.args.get('page', 1, type=int)
+    per_page = current_app.config.get('DASHBOARD_PAGE_SIZE', 50)
+    return max(page, 1), per_page
+
+def _events_by_stage():
+    """Event count per workflow stage in one GROUP BY"""
+    rows = db.session.query(Event.workflow_stage, func.count(Event.id)).group_by(Event.workflow_stage).all()
+    return {stage: count for stage, count in rows}
+
 @dashboard_bp.route('/')
 def index():
     """Dashboard homepage with overview stats"""
     try:
-        total_events = Event.query.count()
-        total_planners = Planner.query.count()
-        total_contacts = Contact.query.count()
+        total_events = db.session.query(func.count(Event.id)).scalar()
+        total_planners = db.session.query(func.count(Planner.id)).scalar()
+        total_contacts = db.session.query(func.count(Contact.id)).scalar()
         
-        recent_events = Event.query.order_by(Event.created_at.desc()).limit(5).all()
-        recent_events_count = len([e for e in Event.query.all() 
-                                 if (datetime.now() - e.created_at).days <= 7])
-        
-        # Events by stage
-        events = Event.query.all()
-        events_by_stage = {}
-        for event in events:
-            stage = event.workflow_stage
-            events_by_stage[stage] = events_by_stage.get(stage, 0) + 1
+        recent_events = Event.query.options(joinedload(Event.planner)).order_by(
+            Event.created_at.desc()
+        ).limit(5).all()
+        recent_events_count = db.session.query(func.count(Event.id)).filter(
+            Event.created_at >= datetime.utcnow() - timedelta(days=7)
+        ).scalar()
         
         return render_template('index.html',
                                  event_count=total_events,
@@ -37,7 +46,7 @@ def index():
                                  contact_count=total_contacts,
                                  recent_event_count=recent_events_count,
                                  recent_events=recent_events,
-                                 events_by_stage=events_by_stage)
+                                 events_by_stage=_events_by_stage())
     except Exception as e:
         logger.error(f"Dashboard index error: {e}")
         flash('Error loading dashboard', 'error')
@@ -53,37 +62,59 @@ def index():
 def events():
     """Events overview page"""
     try:
-        events = Event.query.order_by(Event.created_at.desc()).all()
-        
-        # Calculate events by stage
-        stage_counts = {}
-        for event in events:
-            stage = event.workflow_stage
-            stage_counts[stage] = stage_counts.get(stage, 0) + 1
+        page, per_page = _current_page()
+        pagination = Event.query.options(joinedload(Event.planner)).order_by(
+            Event.created_at.desc(), Event.id.desc()
+        ).paginate(page=page, per_page=per_page, error_out=False)
         
-        return render_template('events.html', events=events, events_by_stage=stage_counts)
+        return render_template('events.html', events=pagination.items, pagination=pagination,
+                               events_by_stage=_events_by_stage())
     except Exception as e:
         logger.error(f"Events page error: {e}")
         flash('Error loading events', 'error')
-        return render_template('events.html', events=[], events_by_stage={})
+        return render_template('events.html', events=[], pagination=None, events_by_stage={})
 
 @dashboard_bp.route('/planners')
 def planners():
     """Planner management page"""
     try:
-        planners = Planner.query.order_by(Planner.created_at.desc()).all()
-        
-        # Sort planners by event count for the activity section
-        planners_by_activity = sorted(planners, key=lambda p: len(p.events), reverse=True)[:5]
+        page, per_page = _current_page()
+        pagination = Planner.query.order_by(
+            Planner.created_at.desc(), Planner.id.desc()
+        ).paginate(page=page, per_page=per_page, error_out=False)
+        
+        # Top planners by event count for the activity section
+        event_count = func.count(Event.id)
+        planners_by_activity = [planner for planner, _ in db.session.query(Planner, event_count).join(
+            Event, Event.planner_id == Planner.id
+        ).group_by(Planner.id).order_by(event_count.desc(), Planner.id).limit(5)]
+        
+        # Per-planner counts for the rows shown, grouped in two queries
+        planner_ids = {planner.id for planner in pagination.items + planners_by_activity}
+        planner_stats = {planner_id: {'events': 0, 'contacts': 0, 'last_activity': None}
+                         for planner_id in planner_ids}
+        if planner_ids:
+            for planner_id, count, last_activity in db.session.query(
+                Event.planner_id, func.count(Event.id), func.max(Event.updated_at)
+            ).filter(Event.planner_id.in_(planner_ids)).group_by(Event.planner_id):
+                planner_stats[planner_id].update(events=count, last_activity=last_activity)
+            for planner_id, count in db.session.query(
+                Contact.planner_id, func.count(Contact.id)
+            ).filter(Contact.planner_id.in_(planner_ids)).group_by(Contact.planner_id):
+                planner_stats[planner_id]['contacts'] = count
         
         # Calculate statistics
-        total_events_by_planners = sum(len(p.events) for p in planners)
-        total_contacts_by_planners = sum(len(p.contacts) for p in planners)
-        active_planners_count = len([p for p in planners if len(p.events) > 0])
-        avg_events_per_planner = total_events_by_planners / len(planners) if planners else 0
+        total_planners = pagination.total
+        total_events_by_planners = db.session.query(func.count(Event.id)).scalar()
+        total_contacts_by_planners = db.session.query(func.count(Contact.id)).scalar()
+        active_planners_count = db.session.query(func.count(distinct(Event.planner_id))).scalar()
+        avg_events_per_planner = total_events_by_planners / total_planners if total_planners else 0
         
         return render_template('planners.html', 
-                             planners=planners, 
+                             planners=pagination.items, 
+                             pagination=pagination,
+                             planner_stats=planner_stats,
+                             total_planners=total_planners,
                              planners_by_activity=planners_by_activity,
                              total_events_by_planners=total_events_by_planners,
                              total_contacts_by_planners=total_contacts_by_planners,
@@ -94,6 +125,9 @@ def planners():
         flash('Error loading planners', 'error')
         return render_template('planners.html', 
                              planners=[], 
+                             pagination=None,
+                             planner_stats={},
+                             total_planners=0,
                              planners_by_activity=[],
                              total_events_by_planners=0,
                              total_contacts_by_planners=0,
@@ -104,19 +138,37 @@ def planners():
 def contacts():
     """Contact management page"""
     try:
-        contacts = Contact.query.order_by(Contact.created_at.desc()).all()
-        
-        # Sort contacts by guest count (number of events they've been invited to)
-        contacts_by_activity = sorted(contacts, key=lambda c: len(c.guests), reverse=True)[:5]
+        page, per_page = _current_page()
+        pagination = Contact.query.options(joinedload(Contact.planner)).order_by(
+            Contact.created_at.desc(), Contact.id.desc()
+        ).paginate(page=page, per_page=per_page, error_out=False)
+        
+        # Top contacts by guest count (number of events they've been invited to)
+        guest_count = func.count(Guest.id)
+        contacts_by_activity = [contact for contact, _ in db.session.query(Contact, guest_count).join(
+            Guest, Guest.contact_id == Contact.id
+        ).group_by(Contact.id).order_by(guest_count.desc(), Contact.id).limit(5)]
+        
+        # Invitation counts for the rows shown in one grouped query
+        contact_ids = {contact.id for contact in pagination.items + contacts_by_activity}
+        invitation_counts = dict.fromkeys(contact_ids, 0)
+        if contact_ids:
+            invitation_counts.update(db.session.query(Guest.contact_id, func.count(Guest.id)).filter(
+                Guest.contact_id.in_(contact_ids)
+            ).group_by(Guest.contact_id).all())
         
         # Calculate statistics
-        contacts_with_events = len([c for c in contacts if len(c.guests) > 0])
-        total_invitations = sum(len(c.guests) for c in contacts)
-        avg_events_per_contact = total_invitations / len(contacts) if contacts else 0
-        unique_planners_count = len(set(c.planner_id for c in contacts))
+        total_contacts = pagination.total
+        contacts_with_events = db.session.query(func.count(distinct(Guest.contact_id))).scalar()
+        total_invitations = db.session.query(func.count(Guest.contact_id)).scalar()
+        avg_events_per_contact = total_invitations / total_contacts if total_contacts else 0
+        unique_planners_count = db.session.query(func.count(distinct(Contact.planner_id))).scalar()
         
         return render_template('contacts.html', 
-                             contacts=contacts,
+                             contacts=pagination.items,
+                             pagination=pagination,
+                             invitation_counts=invitation_counts,
+                             total_contacts=total_contacts,
                              contacts_by_activity=contacts_by_activity,
                              contacts_with_events=contacts_with_events,
                              total_invitations=total_invitations,
@@ -127,6 +179,9 @@ def contacts():
         flash('Error loading contacts', 'error')
         return render_template('contacts.html', 
                              contacts=[], 
+                             pagination=None,
+                             invitation_counts={},
+                             total_contacts=0,
                              contacts_by_activity=[],
                              contacts_with_events=0,
                              total_invitations=0,
@@ -141,22 +196,8 @@ def delete_planner(planner_id):
         planner_name = planner.name
         planner_phone = planner.phone_number
         
-        # Delete all guests for this planner's events
-        for event in planner.events:
-            Guest.query.filter_by(event_id=event.id).delete()
-        
-        # Delete all guest states for this planner
-        GuestState.query.filter_by(phone_number=planner.phone_number).delete()
-        
-        # Delete all events created by this planner
-        Event.query.filter_by(planner_id=planner_id).delete()
-        
-        # Delete all contacts belonging to this planner
-        Contact.query.filter_by(planner_id=planner_id).delete()
-        
-        # Delete the planner
-        db.session.delete(planner)
-        db.session.commit()
+        # Delete the planner's events, guests, availability, dates, states and contacts in one transaction
+        get_cascade_delete_service().delete_planners([planner_id])
         
         flash(f'Planner {planner_name} ({planner_phone}) deleted successfully', 'success')
         
@@ -192,13 +233,7 @@ def reset_database():
     """Clear the entire database - DANGER ZONE"""
     try:
         # Delete all data in correct order (respect foreign keys)
-        Guest.query.delete()
-        GuestState.query.delete()
-        Contact.query.delete()
-        Event.query.delete()
-        Planner.query.delete()
-        
-        db.session.commit()
+        get_cascade_delete_service().delete_all()
         
         return jsonify({'success': True, 'message': '🗑️ Database completely reset! All data has been cleared.'})
         
@@ -1,6 +1,7 @@
 from flask import Blueprint, request
 from twilio.twiml.messaging_response import MessagingResponse
 import logging
+import threading
 from app.models.planner import Planner
 from app.models.event import Event
 from app.models.guest import Guest
@@ -14,6 +15,10 @@ from app.services import (
     VenueService,
     AvailabilityService
 )
+from app.services.contact_menu_service import get_contact_menu_service
+from app.services.metrics_service import span, tag_request, track_request
+from app.services.profiling_service import get_request_profiler
+from app.utils.structured_logging import log_category, log_context
 from app.handlers.guest_collection_handler import GuestCollectionHandler
 from app.handlers.date_collection_handler import DateCollectionHandler
 from app.handlers.confirmation_menu_handler import ConfirmationMenuHandler
@@ -21,14 +26,18 @@ from app.handlers.availability_tracking_handler import AvailabilityTrackingHandl
 
 logger = logging.getLogger(__name__)
 
-# Module-level router - initialized when Flask app creates application context
+# Module-level router - built once (by app.startup.warm_up or the first message) and
+# shared by every request thread; handlers keep no per-request state on self
 router = None
+_router_lock = threading.Lock()
 
 def init_router():
     """Initialize SMS router with Flask application context"""
     global router
     if router is None:
-        router = SMSRouter()
+        with _router_lock:
+            if router is None:
+                router = SMSRouter()
     return router
 sms_bp = Blueprint("sms", __name__)
 
@@ -138,14 +147,15 @@ class SMSRouter:
             normalized_phone = self._normalize_phone(phone_number)
             
             # Check if they're temporarily responding to an invitation/availability request
-            guest_state = GuestState.query.filter_by(phone_number=normalized_phone).first()
+            guest_state = GuestState.find_active(normalized_phone)
             
             if guest_state:
+                tag_request(workflow_stage=f'guest_{guest_state.current_state}')
                 # Handle as guest (temporary override for responding to invitations)
                 response = self._handle_guest_message(guest_state, message)
                 
                 # Only cleanup guest state if marked as completed
-                updated_guest_state = GuestState.query.filter_by(phone_number=normalized_phone).first()
+                updated_guest_state = GuestState.find_active(normalized_phone)
                 if updated_guest_state and updated_guest_state.current_state == 'completed':
                     self._cleanup_guest_state(updated_guest_state)
                 
@@ -165,6 +175,7 @@ class SMSRouter:
             # Get active event first to check workflow stage
             active_event = self._get_active_event(planner.id)
             logger.info(f"Planner {planner.id} active event: {active_event.id if active_event else None}")
+            tag_request(workflow_stage=active_event.workflow_stage if active_event else 'no_event')
             
             # Check if we're in name collection stage FIRST - new planners must provide name before any other commands
             if active_event and active_event.workflow_stage == 'waiting_for_name':
@@ -191,7 +202,8 @@ class SMSRouter:
                 logger.info(f"Processing workflow message for event {active_event.id}")
                 return self._handle_workflow_message(active_event, message)
             else:
-                logger.info(f"No active event, handling new event request with message: '{message}'")
+                logger.info("No active event, handling new event request with message: '%s'", message, extra=log_category('sms_payload'))
+                tag_request(handler='NewEventRequest')
                 return self._handle_new_event_request(planner, message)
                 
         except Exception as e:
@@ -216,6 +228,7 @@ class SMSRouter:
             handler = self.handlers.get(event.workflow_stage)
             
             if handler:
+                tag_request(handler=type(handler).__name__)
                 result = handler.handle_message(event, message)
                 
                 # Handle stage transitions
@@ -238,8 +251,10 @@ class SMSRouter:
             current_state = guest_state.current_state
             
             if current_state == 'awaiting_availability':
+                tag_request(handler=type(self.guest_availability_handler).__name__)
                 return self._handle_availability_response(guest_state, message)
             elif current_state == 'awaiting_rsvp':
+                tag_request(handler='RSVPResponse')
                 return self._handle_rsvp_response(guest_state, message)
             elif current_state == 'completed':
                 # Guest session is complete, clean up and redirect to planner mode
@@ -317,6 +332,7 @@ class SMSRouter:
     
     def _handle_name_collection(self, planner: Planner, message: str) -> str:
         """Handle initial name collection for new planners"""
+        tag_request(handler='NameCollection')
         name = message.strip()
         
         # Reject common commands that shouldn't be treated as names
@@ -334,17 +350,15 @@ class SMSRouter:
                 event.save()
             
             # Check for existing contacts to show proper messaging
-            contacts = Contact.query.filter_by(planner_id=planner.id).order_by(Contact.name).all()
+            contact_menu = get_contact_menu_service().render_page(planner)
             
             welcome_text = f"Great to meet you, {name}! 👋\n"
             welcome_text += "Let's plan your event!\n\n"
             welcome_text += "Who's coming?\n\n"
             
-            if contacts:
-                welcome_text += "Contacts:\n"
-                for i, contact in enumerate(contacts, 1):
-                    welcome_text += f"{i}. {contact.name} ({contact.phone_number})\n"
-                welcome_text += "\nSelect contacts (e.g. '1,3') or add new guests (e.g. 'John Doe, 123-456-7890').\n\n"
+            if contact_menu:
+                welcome_text += contact_menu
+                welcome_text += "\nSelect contacts (e.g. '1,3', '1-5' or 'all') or add new guests (e.g. 'John Doe, 123-456-7890').\n\n"
             else:
                 welcome_text += "Add guests as: Name, Phone\n"
                 welcome_text += "(E.g., John Doe, 123-456-7890)\n\n"
@@ -357,47 +371,25 @@ class SMSRouter:
             return "Please tell me your name so I can help you plan your event!"
     
     def _send_rsvp_notification_to_planner(self, guest: Guest, guest_state: GuestState) -> None:
-        """Send notification to planner when guest responds to RSVP"""
+        """Queue a planner notification when guest responds to RSVP - sent as a debounced digest"""
         try:
+            from app.services.notification_digest_service import (
+                get_notification_digest_service, get_response_counts
+            )
+            
             event = guest_state.event
             planner = event.planner
-            guest_name = guest.name
-            rsvp_status = guest.rsvp_status
-            
-            # Count RSVP responses
-            total_guests = Guest.query.filter_by(event_id=event.id).count()
-            responded_guests = Guest.query.filter_by(event_id=event.id).filter(
-                Guest.rsvp_status.in_(['yes', 'no', 'maybe'])
-            ).count()
-            pending_guests = total_guests - responded_guests
-            
-            # Format RSVP status with emoji
-            status_emoji = {
-                'yes': '👍',
-                'no': '❌', 
-                'maybe': '🤔'
-            }
-            
-            status_text = {
-                'yes': 'is going',
-                'no': 'declined',
-                'maybe': 'responded maybe'
-            }
-            
-            # Create planner notification message
-            planner_message = f"{status_emoji.get(rsvp_status, '📝')} {guest_name} {status_text.get(rsvp_status, 'responded')}!\n\n"
-            planner_message += f"📊 {responded_guests}/{total_guests} guests have responded\n"
-            
-            if pending_guests > 0:
-                planner_message += f"⏳ Waiting for {pending_guests} more guest" + ("s" if pending_guests != 1 else "")
-            else:
-                planner_message += "🎉 Everyone has responded to your event!"
             
-            # Send SMS to planner
-            from app.services.sms_service import SMSService
-            sms_service = SMSService()
-            sms_service.send_sms(planner.phone_number, planner_message)
-            logger.info(f"Sent RSVP notification to planner {planner.phone_number} about {guest_name}'s response: {rsvp_status}")
+            # Count RSVP responses (O(1) counter read)
+            counts = get_response_counts(event.id)
+            pending_guests = counts['total'] - counts['rsvp_responded']
+            
+            # Coalesce bursts of RSVPs into one SMS; the last one goes out immediately
+            get_notification_digest_service().add_rsvp_response(
+                event.id, planner.phone_number, guest.name, guest.rsvp_status,
+                counts=counts, final=pending_guests == 0
+            )
+            logger.info(f"Queued RSVP notification to planner {planner.phone_number} about {guest.name}'s response: {guest.rsvp_status}")
             
         except Exception as e:
             logger.error(f"Error sending RSVP notification to planner: {e}")
@@ -480,16 +472,14 @@ class SMSRouter:
         logger.info(f"Created new event {new_event.id} in {new_event.workflow_stage} stage for planner {planner.id}")
         
         # Check for existing contacts to show (same logic as new event creation)
-        contacts = Contact.query.filter_by(planner_id=planner.id).order_by(Contact.name).all()
+        contact_menu = get_contact_menu_service().render_page(planner)
         
         welcome_text = "Let's plan your event!\n\n"
         welcome_text += "Who's coming?\n\n"
         
-        if contacts:
-            welcome_text += "Contacts:\n"
-            for i, contact in enumerate(contacts, 1):
-                welcome_text += f"{i}. {contact.name} ({contact.phone_number})\n"
-            welcome_text += "\nSelect contacts (e.g. '1,3') or add new guests (e.g. 'John Doe, 123-456-7890').\n\n"
+        if contact_menu:
+            welcome_text += contact_menu
+            welcome_text += "\nSelect contacts (e.g. '1,3', '1-5' or 'all') or add new guests (e.g. 'John Doe, 123-456-7890').\n\n"
         else:
             welcome_text += "Add guests as: Name, Phone\n"
             welcome_text += "(E.g., John Doe, 123-456-7890)\n\n"
@@ -503,7 +493,7 @@ class SMSRouter:
     
     def _handle_new_event_request(self, planner: Planner, message: str) -> str:
         """Handle new event creation requests"""
-        logger.info(f"Handling new event request for planner {planner.id} with message: '{message}'")
+        logger.info("Handling new event request for planner %s with message: '%s'", planner.id, message, extra=log_category('sms_payload'))
         
         # Check if this looks like guest input (name + phone pattern)
         if self._looks_like_guest_input(message):
@@ -519,15 +509,13 @@ class SMSRouter:
             event = result['event']
             
             # Check for existing contacts to show
-            contacts = Contact.query.filter_by(planner_id=planner.id).order_by(Contact.name).all()
+            contact_menu = get_contact_menu_service().render_page(planner)
             
             response_text = "Who's coming to your event?\n\n"
             
-            if contacts:
-                response_text += "Contacts:\n"
-                for i, contact in enumerate(contacts, 1):
-                    response_text += f"{i}. {contact.name} ({contact.phone_number})\n"
-                response_text += "\nSelect contacts (e.g. '1,3') or add new guests (e.g. 'John Doe, 123-456-7890').\n\n"
+            if contact_menu:
+                response_text += contact_menu
+                response_text += "\nSelect contacts (e.g. '1,3', '1-5' or 'all') or add new guests (e.g. 'John Doe, 123-456-7890').\n\n"
             else:
                 response_text += "Add guests as: Name, Phone\n"
                 response_text += "(E.g., John Doe, 123-456-7890)\n\n"
@@ -664,34 +652,43 @@ class SMSRouter:
 @sms_bp.route('/webhook', methods=['POST'])
 def sms_webhook():
     """Handle incoming SMS messages"""
+    # Correlate every log record for this message by Twilio's message id
+    with log_context(request.form.get('MessageSid')):
+        return _handle_webhook()
+
+def _handle_webhook():
     try:
         # Get message data from Twilio
         from_number = request.form.get('From', '').replace('+1', '')
         message_body = request.form.get('Body', '').strip()
         
-        logger.info(f"SMS webhook - From: '{from_number}', Body: '{message_body}' (length: {len(message_body)})")
+        logger.info("SMS webhook - From: '%s', Body: '%s' (length: %s)", from_number, message_body, len(message_body), extra=log_category('sms_payload'))
         
         if not from_number or not message_body:
             logger.error("Missing phone number or message body")
             return str(MessagingResponse())
         
-        # PERFORMANCE MONITORING: Track SMS response times
-        import time
-        start_time = time.time()
-        
-        # Route message and get response
-        router = init_router()
-        response_text = router.route_message(from_number, message_body)
+        # PERFORMANCE MONITORING: Time each phase of handling the message for /metrics,
+        # and profile a sample of requests when PROFILING_SAMPLE_RATE is set
+        with track_request() as timings, get_request_profiler().profile('webhook'):
+            # Route message and get response
+            router = init_router()
+            response_text = router.route_message(from_number, message_body)
+            
+            # Create Twilio response
+            with span('formatting'):
+                resp = MessagingResponse()
+                resp.message(response_text)
+                twiml = str(resp)
         
-        # Log performance metrics
-        processing_time = time.time() - start_time
-        logger.info(f"SMS processed in {processing_time:.3f}s - Response length: {len(response_text)}")
+        if timings:
+            summary = timings.summary
+            phases = ', '.join(f"{phase} {summary[phase]:.3f}s" for phase in ('db', 'ai', 'sms', 'formatting', 'app'))
+            logger.info(f"SMS processed in {summary['total']:.3f}s ({phases}) - "
+                        f"stage: {timings.labels['workflow_stage']}, handler: {timings.labels['handler']}, "
+                        f"queries: {timings.queries.count}, response length: {len(response_text)}")
         
-        # Create Twilio response
-        resp = MessagingResponse()
-        resp.message(response_text)
-        
-        return str(resp)
+        return twiml
         
     except Exception as e:
         import traceback
@@ -710,7 +707,8 @@ def test_sms():
         phone_number = data.get('phone_number', '1234567890')
         message = data.get('message', 'test')
         
-        response = router.route_message(phone_number, message)
+        with log_context(), track_request(), get_request_profiler().profile('test'):
+            response = init_router().route_message(phone_number, message)
         
         return {'response': response}, 200
         
@@ -1,9 +1,10 @@
 from typing import Optional
 import logging
 import os
-import requests
 import json
 
+from app.services.metrics_service import caller_site, span
+
 logger = logging.getLogger(__name__)
 
 class AIProcessingService:
@@ -27,6 +28,8 @@ class AIProcessingService:
             return None
             
         try:
+            import requests
+            
             headers = {
                 "Authorization": f"Bearer {self.api_key}",
                 "Content-Type": "application/json"
@@ -42,12 +45,13 @@ class AIProcessingService:
             # PERFORMANCE OPTIMIZATION: Reduced timeout from 30s to 8s
             # SMS users expect fast responses - better to fall back to regex parsing
             # than wait 30 seconds for AI. 8s is reasonable for most API calls.
-            response = requests.post(
-                f"{self.base_url}/chat/completions",
-                headers=headers,
-                json=data,
-                timeout=8  # Reduced from 30s - fallback to simple parsing if slow
-            )
+            with span('ai', site=caller_site()):
+                response = requests.post(
+                    f"{self.base_url}/chat/completions",
+                    headers=headers,
+                    json=data,
+                    timeout=8  # Reduced from 30s - fallback to simple parsing if slow
+                )
             
             if response.status_code == 200:
                 result = response.json()
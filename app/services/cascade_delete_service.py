@@ -0,0 +1,142 @@
+"""
+Cascade Delete Service
+
+Set-based deletes for the dashboard. Deleting a planner used to loop over
+their events issuing per-event guest/date deletes and never touched
+availability, leaving orphans for the integrity service to sweep up. Now
+each operation runs a fixed number of statements in one transaction:
+
+- when the database enforces foreign keys (PostgreSQL, or SQLite with
+  PRAGMA foreign_keys=ON) the ON DELETE CASCADE constraints remove the
+  subtree and only the root rows are deleted
+- otherwise every child table is deleted with one IN (subquery) statement,
+  children first
+
+Archived events keep only the original planner id, with no foreign key, so
+they are always deleted explicitly.
+"""
+
+from typing import Dict, List
+import logging
+import threading
+
+from sqlalchemy import delete, select
+
+from app import db
+from app.models.archived_event import ArchivedEvent
+from app.models.availability import Availability
+from app.models.contact import Contact
+from app.models.event import Event
+from app.models.event_date import EventDate
+from app.models.guest import Guest
+from app.models.guest_state import GuestState
+from app.models.job_lease import JobLease
+from app.models.job_run import JobRun
+from app.models.maintenance_checkpoint import MaintenanceCheckpoint
+from app.models.planner import Planner
+
+logger = logging.getLogger(__name__)
+
+
+class CascadeDeleteService:
+    """Deletes planners and their whole subtree with set-based statements"""
+
+    def database_cascades(self) -> bool:
+        """Whether the database itself applies ON DELETE CASCADE"""
+        connection = db.session.connection()
+        if connection.dialect.name == 'sqlite':
+            return bool(connection.exec_driver_sql('PRAGMA foreign_keys').scalar())
+        return True
+
+    def _event_subtree_statements(self, event_ids, cascades: bool) -> list:
+        """Child-table deletes for a set of events, needed only when the database does not cascade"""
+        if cascades:
+            return []
+        return [
+            delete(Availability).where(Availability.event_id.in_(event_ids)),
+            delete(GuestState).where(GuestState.event_id.in_(event_ids)),
+            delete(EventDate).where(EventDate.event_id.in_(event_ids)),
+            delete(Guest).where(Guest.event_id.in_(event_ids)),
+        ]
+
+    def _execute(self, statements: list, commit: bool):
+        try:
+            for statement in statements:
+                result = db.session.execute(statement, execution_options={'synchronize_session': False})
+            if commit:
+                db.session.commit()
+            return result
+        except Exception:
+            db.session.rollback()
+            raise
+
+    def delete_planners(self, planner_ids: List[int]) -> int:
+        """Delete planners with their events, guests, availability, dates, states, contacts and archived events
+
+        Commits on success and rolls back on failure; returns the number of planners deleted.
+        """
+        if not planner_ids:
+            return 0
+
+        event_ids = select(Event.id).where(Event.planner_id.in_(planner_ids)).scalar_subquery()
+        planner_phones = select(Planner.phone_number).where(Planner.id.in_(planner_ids)).scalar_subquery()
+        statements = [
+            # Planner-side conversation state is keyed by phone, not by event
+            delete(GuestState).where(GuestState.phone_number.in_(planner_phones)),
+            # Archives hold guest names and phones too
+            delete(ArchivedEvent).where(ArchivedEvent.planner_id.in_(planner_ids)),
+        ]
+        cascades = self.database_cascades()
+        statements += self._event_subtree_statements(event_ids, cascades)
+        if not cascades:
+            statements += [
+                delete(Event).where(Event.planner_id.in_(planner_ids)),
+                delete(Contact).where(Contact.planner_id.in_(planner_ids)),
+            ]
+        statements.append(delete(Planner).where(Planner.id.in_(planner_ids)))
+
+        result = self._execute(statements, commit=True)
+        logger.info(f"Deleted {result.rowcount} planner(s) {planner_ids} and their data")
+        return result.rowcount
+
+    def delete_events(self, event_ids: List[int], commit: bool = True) -> int:
+        """Delete events with their guests, availability, dates and states
+
+        With commit=False the deletes join the caller's transaction (used by archiving).
+        """
+        if not event_ids:
+            return 0
+
+        statements = self._event_subtree_statements(event_ids, self.database_cascades())
+        statements.append(delete(Event).where(Event.id.in_(event_ids)))
+        return self._execute(statements, commit=commit).rowcount
+
+    def delete_all(self) -> Dict[str, int]:
+        """Empty every table, children first - the dashboard's reset"""
+        tables = [Availability, GuestState, EventDate, Guest, Event, Contact, Planner, ArchivedEvent,
+                  MaintenanceCheckpoint, JobLease, JobRun]
+        counts = {}
+        try:
+            for model in tables:
+                result = db.session.execute(delete(model), execution_options={'synchronize_session': False})
+                counts[model.__tablename__] = result.rowcount
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        logger.info(f"Deleted all data: {counts}")
+        return counts
+
+# Global cascade delete service instance (initialized lazily)
+_cascade_delete_service = None
+_cascade_delete_service_lock = threading.Lock()
+
+
+def get_cascade_delete_service():
+    """Get or create the shared cascade delete service"""
+    global _cascade_delete_service
+    if _cascade_delete_service is None:
+        with _cascade_delete_service_lock:
+            if _cascade_delete_service is None:
+                _cascade_delete_service = CascadeDeleteService()
+    return _cascade_delete_service
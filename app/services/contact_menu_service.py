@@ -0,0 +1,161 @@
+"""
+Contact Menu Service
+
+The numbered "Contacts:" list shown to planners used to be rebuilt from a
+full contact query on every prompt and dumped into a single SMS. Menus are
+now cached per planner, keyed by Planner.contacts_version (bumped by the
+Contact flush listener) plus the planner's created_at so a recycled planner
+id never sees another planner's menu, and rendered a page at a time with
+"more" paging. Numbering is global across pages, so "12" means the same
+contact on every page until the contact list changes. The page last shown
+is kept on the planner row rather than in this cache, so a "more" served by
+another gunicorn worker still continues from it.
+"""
+
+from collections import OrderedDict, namedtuple
+from typing import List, Optional
+import logging
+import threading
+
+from app.services.metrics_service import timed
+
+logger = logging.getLogger(__name__)
+
+# Default page size when the app config does not set one
+DEFAULT_PAGE_SIZE = 10
+
+ContactMenuEntry = namedtuple('ContactMenuEntry', ['id', 'name', 'phone_number'])
+
+
+class ContactMenuService:
+    """Caches and pages the numbered contact menu for each planner"""
+
+    def __init__(self, page_size: Optional[int] = None, max_planners: int = 512):
+        self._page_size = page_size
+        self._max_planners = max_planners
+        # planner_id -> (version stamp, entries), least recently used first
+        self._menus: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def page_size(self) -> int:
+        """Contacts per page, read from CONTACT_MENU_PAGE_SIZE unless overridden"""
+        if self._page_size is not None:
+            return self._page_size
+        try:
+            from flask import current_app
+            return int(current_app.config.get('CONTACT_MENU_PAGE_SIZE', DEFAULT_PAGE_SIZE))
+        except RuntimeError:
+            # Outside an application context
+            return DEFAULT_PAGE_SIZE
+
+    def _version_stamp(self, planner) -> tuple:
+        return (planner.contacts_version or 0, planner.created_at)
+
+    def get_entries(self, planner) -> List[ContactMenuEntry]:
+        """Numbered menu entries (index 0 is contact 1); no query when the version is cached"""
+        version = self._version_stamp(planner)
+        with self._lock:
+            cached = self._menus.get(planner.id)
+            if cached and cached[0] == version:
+                self._menus.move_to_end(planner.id)
+                return cached[1]
+
+        from app import db
+        from app.models.contact import Contact
+        rows = db.session.query(Contact.id, Contact.name, Contact.phone_number).filter(
+            Contact.planner_id == planner.id
+        ).order_by(Contact.name, Contact.id).all()
+        entries = [ContactMenuEntry(*row) for row in rows]
+
+        with self._lock:
+            self._menus[planner.id] = (version, entries)
+            self._menus.move_to_end(planner.id)
+            while len(self._menus) > self._max_planners:
+                self._menus.popitem(last=False)
+        return entries
+
+    def has_contacts(self, planner) -> bool:
+        return bool(self.get_entries(planner))
+
+    @timed('formatting')
+    def render_page(self, planner, page: int = 0) -> str:
+        """Render one page as "Contacts:\\n1. Name (phone)\\n..."; empty when there are no contacts"""
+        entries = self.get_entries(planner)
+        if not entries:
+            return ""
+
+        page_size = self.page_size
+        page_count = (len(entries) + page_size - 1) // page_size
+        page = min(max(page, 0), page_count - 1)
+        self._remember_page(planner, page)
+
+        first = page * page_size
+        page_entries = entries[first:first + page_size]
+
+        menu = "Contacts:\n"
+        for number, entry in enumerate(page_entries, first + 1):
+            menu += f"{number}. {entry.name} ({entry.phone_number})\n"
+
+        if page_count > 1:
+            shown_to = first + len(page_entries)
+            menu += f"(Showing {first + 1}-{shown_to} of {len(entries)}"
+            menu += " - reply 'more' for the next page)\n" if page < page_count - 1 else ")\n"
+        return menu
+
+    def render_next_page(self, planner) -> str:
+        """Render the page after the one last shown to this planner, wrapping to the start"""
+        entries = self.get_entries(planner)
+        if not entries:
+            return ""
+
+        shown_page = planner.contact_menu_page
+        if shown_page is None or planner.contact_menu_page_version != (planner.contacts_version or 0):
+            # Nothing shown yet, or contacts changed since that page was rendered; numbering restarts
+            shown_page = -1
+
+        page_count = (len(entries) + self.page_size - 1) // self.page_size
+        next_page = shown_page + 1 if shown_page + 1 < page_count else 0
+        return self.render_page(planner, next_page)
+
+    def _remember_page(self, planner, page: int) -> None:
+        """Record the page shown on the planner row; no write when it is already recorded"""
+        version = planner.contacts_version or 0
+        if planner.contact_menu_page == page and planner.contact_menu_page_version == version:
+            return
+
+        from sqlalchemy import update
+        from app import db
+        from app.models.planner import Planner
+        db.session.execute(
+            update(Planner).where(Planner.id == planner.id).values(
+                contact_menu_page=page, contact_menu_page_version=version
+            )
+        )
+        db.session.commit()
+
+    def get_selected_contacts(self, planner, numbers: List[int]) -> list:
+        """Load the Contact rows for 1-based menu numbers, in menu order"""
+        entries = self.get_entries(planner)
+        contact_ids = [entries[number - 1].id for number in numbers if 1 <= number <= len(entries)]
+        if not contact_ids:
+            return []
+
+        from app.models.contact import Contact
+        contacts_by_id = {contact.id: contact for contact in Contact.query.filter(Contact.id.in_(contact_ids))}
+        return [contacts_by_id[contact_id] for contact_id in contact_ids if contact_id in contacts_by_id]
+
+
+# Global contact menu service instance (initialized lazily)
+_contact_menu_service = None
+_contact_menu_service_lock = threading.Lock()
+
+
+def get_contact_menu_service():
+    """Get or create the shared contact menu service"""
+    global _contact_menu_service
+    if _contact_menu_service is None:
+        with _contact_menu_service_lock:
+            if _contact_menu_service is None:
+                _contact_menu_service = ContactMenuService()
+    return _contact_menu_service
@@ -0,0 +1,230 @@
+"""
+Contact Search Service
+
+Lets planners add saved contacts by (partial) name - "add jess, mike r" -
+instead of scrolling the numbered menu. Each planner gets an in-memory index
+built lazily from their contact menu entries and rebuilt when
+Planner.contacts_version changes (any contact insert, delete or rename):
+
+- a sorted token list answers prefix queries with bisect ("mike r")
+- a trigram posting list answers typo-tolerant queries ("jessika")
+
+Results carry menu numbers, so they feed straight into contact selection.
+"""
+
+from bisect import bisect_left
+from collections import Counter, OrderedDict, namedtuple
+from heapq import nsmallest
+from typing import Dict, List, Optional
+import re
+import threading
+
+# Trigram (Dice) similarity needed for a fuzzy match, and how close a runner-up
+# must be to the best score to make the match ambiguous
+FUZZY_THRESHOLD = 0.55
+AMBIGUITY_MARGIN = 0.1
+MAX_SUGGESTIONS = 5
+
+# Leading verbs and separators in "add jess, mike r and tom"
+COMMAND_PREFIX_PATTERN = re.compile(r'^\s*(?:add|invite)\s+', re.IGNORECASE)
+TERM_SEPARATOR_PATTERN = re.compile(r'\s*(?:,|;|\n|\band\b|&)\s*', re.IGNORECASE)
+
+ContactNameResolution = namedtuple('ContactNameResolution', ['numbers', 'ambiguous', 'unmatched'])
+
+
+def is_contact_name_command(text: str) -> bool:
+    """Whether the text explicitly asks to add contacts by name ("add jess, mike r")"""
+    return bool(COMMAND_PREFIX_PATTERN.match(text))
+
+
+def _tokens(text: str) -> List[str]:
+    return re.findall(r"[a-z0-9']+", text.lower())
+
+
+def _trigrams(token: str) -> set:
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class ContactNameIndex:
+    """Prefix and trigram index over one planner's contact names
+
+    `entries` are contact menu entries; position i in the list is menu number i + 1.
+    Both indexes are keyed by distinct name tokens, which repeat heavily across
+    contacts, so lookups touch the vocabulary rather than every contact.
+    """
+
+    def __init__(self, entries: list):
+        self.entries = entries
+        # token -> positions of the contacts whose name contains it
+        self._token_positions: Dict[str, List[int]] = {}
+        self._token_trigrams: Dict[str, set] = {}
+        # trigram -> tokens containing it
+        self._postings: Dict[str, List[str]] = {}
+
+        for position, entry in enumerate(entries):
+            for token in set(_tokens(entry.name)):
+                self._token_positions.setdefault(token, []).append(position)
+
+        for token in self._token_positions:
+            trigrams = _trigrams(token)
+            self._token_trigrams[token] = trigrams
+            for trigram in trigrams:
+                self._postings.setdefault(trigram, []).append(token)
+        self._sorted_tokens = sorted(self._token_positions)
+
+    def _prefix_positions(self, prefix: str) -> Dict[int, float]:
+        """Positions with a token starting with `prefix`; exact token matches score higher"""
+        positions = {}
+        start = bisect_left(self._sorted_tokens, prefix)
+        for token in self._sorted_tokens[start:]:
+            if not token.startswith(prefix):
+                break
+            score = 1.0 if token == prefix else 0.5
+            for position in self._token_positions[token]:
+                if positions.get(position, 0) < score:
+                    positions[position] = score
+        return positions
+
+    def _fuzzy_positions(self, query: str) -> Dict[int, float]:
+        """Positions with a token whose trigram (Dice) similarity to `query` passes FUZZY_THRESHOLD"""
+        query_trigrams = _trigrams(query)
+        shared = Counter()
+        for trigram in query_trigrams:
+            shared.update(self._postings.get(trigram, ()))
+
+        positions = {}
+        for token, common in shared.items():
+            score = 2 * common / (len(query_trigrams) + len(self._token_trigrams[token]))
+            if score < FUZZY_THRESHOLD:
+                continue
+            for position in self._token_positions[token]:
+                if positions.get(position, 0) < score:
+                    positions[position] = score
+        return positions
+
+    def search(self, query: str, limit: int = MAX_SUGGESTIONS + 1) -> List[int]:
+        """Best matching positions for a partial name, best first (empty when nothing matches)
+
+        Every query token must match some token of the name - by prefix
+        ("mike r" -> "Mike Rogers") or, failing any prefix match, by trigram
+        similarity ("jessika" -> "Jessica"). Fuzzy results only include names
+        scoring within AMBIGUITY_MARGIN of the best one.
+        """
+        query_tokens = _tokens(query)
+        if not query_tokens:
+            return []
+
+        for match_positions, fuzzy in ((self._prefix_positions, False), (self._fuzzy_positions, True)):
+            scores = None
+            # Longest tokens are the most selective, so intersect from there
+            for token in sorted(set(query_tokens), key=len, reverse=True):
+                token_scores = match_positions(token)
+                if scores is None:
+                    scores = token_scores
+                else:
+                    scores = {position: score + token_scores[position]
+                              for position, score in scores.items() if position in token_scores}
+                if not scores:
+                    break
+            if scores:
+                best = max(scores.values())
+                if fuzzy:
+                    margin = AMBIGUITY_MARGIN * len(set(query_tokens))
+                    scores = {position: score for position, score in scores.items() if best - score <= margin}
+                # Ties keep menu (alphabetical) order
+                return nsmallest(limit, scores, key=lambda position: (-scores[position], position))
+        return []
+
+
+class ContactSearchService:
+    """Resolves typed contact names against a planner's cached name index"""
+
+    def __init__(self, menu_service=None, max_planners: int = 512):
+        self._menu_service = menu_service
+        self._max_planners = max_planners
+        # planner_id -> (entries list the index was built from, index)
+        self._indexes: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def menu_service(self):
+        if self._menu_service is None:
+            from app.services.contact_menu_service import get_contact_menu_service
+            self._menu_service = get_contact_menu_service()
+        return self._menu_service
+
+    def get_index(self, planner) -> ContactNameIndex:
+        # The menu service returns the same entries list until contacts_version changes
+        entries = self.menu_service.get_entries(planner)
+        with self._lock:
+            cached = self._indexes.get(planner.id)
+            if cached and cached[0] is entries:
+                self._indexes.move_to_end(planner.id)
+                return cached[1]
+
+        index = ContactNameIndex(entries)
+        with self._lock:
+            self._indexes[planner.id] = (entries, index)
+            self._indexes.move_to_end(planner.id)
+            while len(self._indexes) > self._max_planners:
+                self._indexes.popitem(last=False)
+        return index
+
+    def resolve_names(self, planner, text: str) -> Optional[ContactNameResolution]:
+        """Resolve "add jess, mike r" into menu numbers
+
+        Returns None when the text contains digits or the planner has no contacts.
+        Otherwise `numbers` holds unique matches, `ambiguous` maps a term to its
+        candidate menu numbers and `unmatched` lists terms with no match.
+        """
+        if re.search(r'\d', text):
+            return None
+
+        index = self.get_index(planner)
+        if not index.entries:
+            return None
+
+        text = COMMAND_PREFIX_PATTERN.sub('', text)
+        terms = [term.strip() for term in TERM_SEPARATOR_PATTERN.split(text) if term and term.strip()]
+
+        numbers, ambiguous, unmatched = [], {}, []
+        for term in terms:
+            positions = index.search(term)
+            if len(positions) == 1:
+                if positions[0] + 1 not in numbers:
+                    numbers.append(positions[0] + 1)
+            elif positions:
+                ambiguous[term] = [position + 1 for position in positions[:MAX_SUGGESTIONS]]
+            else:
+                unmatched.append(term)
+
+        return ContactNameResolution(numbers, ambiguous, unmatched)
+
+    def format_clarification(self, planner, resolution: ContactNameResolution) -> str:
+        """Ask the planner to pick between ambiguous matches by menu number"""
+        entries = self.menu_service.get_entries(planner)
+        message = "Which contact did you mean?\n\n"
+        for term, numbers in resolution.ambiguous.items():
+            message += f"'{term}':\n"
+            for number in numbers:
+                entry = entries[number - 1]
+                message += f"{number}. {entry.name} ({entry.phone_number})\n"
+            message += "\n"
+        message += "Reply with the numbers (e.g. '3,7')."
+        return message
+
+
+# Global contact search service instance (initialized lazily)
+_contact_search_service = None
+_contact_search_service_lock = threading.Lock()
+
+
+def get_contact_search_service():
+    """Get or create the shared contact search service"""
+    global _contact_search_service
+    if _contact_search_service is None:
+        with _contact_search_service_lock:
+            if _contact_search_service is None:
+                _contact_search_service = ContactSearchService()
+    return _contact_search_service
@@ -4,135 +4,255 @@ import os
 import sys
 sys.path.append('/Users/aaronwalters/Planner_app_live/Planner_v2')
 
-from typing import Dict
+from typing import Dict, Optional
+from datetime import datetime, time, timedelta
 from flask import current_app
+from sqlalchemy import and_, case, delete, exists, extract, func, or_, select, update
+from app import db
 from app.models.event import Event
 from app.models.guest import Guest
 from app.models.availability import Availability
+from app.models.guest_state import GuestState
+from app.models.maintenance_checkpoint import MaintenanceCheckpoint
 import logging
 
 logger = logging.getLogger(__name__)
 
 class DataIntegrityService:
-    """Service to ensure database integrity and prevent corruption"""
+    """Service to ensure database integrity and prevent corruption
     
-    def __init__(self):
+    Every check is a set-based UPDATE/DELETE run in batches of `batch_size`
+    rows, committing between batches so no run holds locks for long. Checks
+    keyed on updated_at only look at rows changed since the last successful
+    run (the high-water mark stored in maintenance_checkpoints).
+    """
+    
+    CHECKPOINT_NAME = 'data_integrity'
+    BATCH_SIZE = 500
+    # Re-check a little before the last mark to cover clock skew and long transactions
+    WATERMARK_OVERLAP = timedelta(minutes=5)
+    
+    def __init__(self, batch_size: int = None):
         # No app creation here - use current_app when needed
-        pass
+        self.batch_size = batch_size or self.BATCH_SIZE
     
-    def check_and_fix_all_issues(self) -> Dict[str, int]:
-        """Comprehensive check and fix for all data integrity issues"""
+    def check_and_fix_all_issues(self, full: bool = False) -> Dict[str, int]:
+        """Comprehensive check and fix for all data integrity issues
+        
+        Only rows changed since the last run are examined unless `full` is set.
+        """
         # This method should only be called within an app context
+        run_started = datetime.utcnow()
+        since = None if full else self._get_high_water_mark()
+        
         results = {
             'orphaned_availability': 0,
             'wrong_event_availability': 0,
             'duplicate_availability': 0,
-            'orphaned_guests': 0
+            'orphaned_guests': 0,
+            'event_counters': 0
         }
         
         # 1. Fix orphaned availability records (availability without valid guests)
         results['orphaned_availability'] = self._fix_orphaned_availability()
         
         # 2. Fix wrong-event availability records
-        results['wrong_event_availability'] = self._fix_wrong_event_availability()
+        results['wrong_event_availability'] = self._fix_wrong_event_availability(since)
         
         # 3. Fix duplicate availability records
-        results['duplicate_availability'] = self._fix_duplicate_availability()
+        results['duplicate_availability'] = self._fix_duplicate_availability(since)
         
         # 4. Fix orphaned guests (guests without events)
         results['orphaned_guests'] = self._fix_orphaned_guests()
         
+        # 5. Reconcile denormalized Event response counters with the guests table
+        results['event_counters'] = self.reconcile_event_counters(since=since)
+        
+        self._set_high_water_mark(run_started)
+        
         return results
     
-    def _fix_orphaned_availability(self) -> int:
-        """Remove availability records that don't have valid guests"""
-        orphaned = Availability.query.filter(
-            ~Availability.guest_id.in_(
-                Guest.query.with_entities(Guest.id).subquery()
+    def _get_high_water_mark(self) -> Optional[datetime]:
+        checkpoint = MaintenanceCheckpoint.query.filter_by(name=self.CHECKPOINT_NAME).first()
+        if not checkpoint or not checkpoint.high_water_mark:
+            return None
+        return checkpoint.high_water_mark - self.WATERMARK_OVERLAP
+    
+    def _set_high_water_mark(self, value: datetime) -> None:
+        checkpoint = MaintenanceCheckpoint.query.filter_by(name=self.CHECKPOINT_NAME).first()
+        if not checkpoint:
+            checkpoint = MaintenanceCheckpoint(name=self.CHECKPOINT_NAME)
+        checkpoint.high_water_mark = value
+        checkpoint.save()
+    
+    def _run_in_batches(self, make_statement) -> int:
+        """Execute a batch-limited UPDATE/DELETE until it stops matching rows"""
+        total = 0
+        while True:
+            result = db.session.execute(
+                make_statement(),
+                execution_options={'synchronize_session': False}
             )
-        ).all()
+            db.session.commit()
+            total += result.rowcount
+            if result.rowcount < self.batch_size:
+                return total
+    
+    def sweep_expired_guest_states(self, now: Optional[datetime] = None) -> int:
+        """Delete guest states past expires_at (walks the expires_at index)"""
+        expired_ids = select(GuestState.id).where(
+            GuestState.expires_at <= (now or datetime.utcnow())
+        ).limit(self.batch_size)
         
-        count = len(orphaned)
-        for record in orphaned:
-            logger.info(f"Removing orphaned availability record {record.id}")
-            record.delete()
+        count = self._run_in_batches(
+            lambda: delete(GuestState).where(GuestState.id.in_(expired_ids))
+        )
+        if count:
+            logger.info(f"Swept {count} expired guest states")
+        return count
+    
+    def _fix_orphaned_availability(self) -> int:
+        """Remove availability records that don't have valid guests
+        
+        Deleting a guest doesn't touch its availability rows' updated_at, so
+        this anti-join always covers the whole table (it walks the guest_id index).
+        """
+        orphan_ids = select(Availability.id).where(
+            ~exists().where(Guest.id == Availability.guest_id)
+        ).limit(self.batch_size)
         
+        count = self._run_in_batches(
+            lambda: delete(Availability).where(Availability.id.in_(orphan_ids))
+        )
+        if count:
+            logger.info(f"Removed {count} orphaned availability records")
         return count
     
-    def _fix_wrong_event_availability(self) -> int:
+    def _fix_wrong_event_availability(self, since: Optional[datetime] = None) -> int:
         """Fix availability records pointing to wrong events"""
-        wrong_event_records = []
-        for avail in Availability.query.all():
-            if avail.guest and avail.guest.event_id != avail.event_id:
-                wrong_event_records.append(avail)
+        guest_event_id = select(Guest.event_id).where(Guest.id == Availability.guest_id).scalar_subquery()
         
-        count = len(wrong_event_records)
-        for record in wrong_event_records:
-            logger.info(f"Fixing wrong-event availability: guest {record.guest.name}, correcting event_id from {record.event_id} to {record.guest.event_id}")
-            record.event_id = record.guest.event_id
-            record.save()
+        wrong_ids = select(Availability.id).join(Guest, Guest.id == Availability.guest_id).where(
+            Guest.event_id != Availability.event_id
+        )
+        if since is not None:
+            wrong_ids = wrong_ids.where(or_(Availability.updated_at >= since, Guest.updated_at >= since))
+        wrong_ids = wrong_ids.limit(self.batch_size)
         
+        count = self._run_in_batches(
+            lambda: update(Availability).where(Availability.id.in_(wrong_ids)).values(event_id=guest_event_id)
+        )
+        if count:
+            logger.info(f"Moved {count} wrong-event availability records to their guest's event")
         return count
     
-    def _fix_duplicate_availability(self) -> int:
-        """Remove duplicate availability records, keeping the best one"""
-        duplicates_removed = 0
+    def _fix_duplicate_availability(self, since: Optional[datetime] = None) -> int:
+        """Remove duplicate availability records, keeping the best one
         
-        for guest in Guest.query.all():
-            guest_availability = Availability.query.filter_by(guest_id=guest.id).all()
-            
-            # Group by (event_id, date)
-            date_groups = {}
-            for avail in guest_availability:
-                key = (avail.event_id, avail.date.isoformat() if avail.date else None)
-                if key not in date_groups:
-                    date_groups[key] = []
-                date_groups[key].append(avail)
-            
-            # Remove duplicates within each group
-            for key, records in date_groups.items():
-                if len(records) > 1:
-                    # Score records to keep the best one
-                    def score_record(r):
-                        score = 0
-                        # Penalize 23:59 end times (likely corrupted)
-                        if r.end_time and r.end_time.hour == 23 and r.end_time.minute == 59:
-                            score -= 100
-                        # Prefer reasonable times
-                        if r.end_time and 17 <= r.end_time.hour <= 23:
-                            score += 10
-                        # Prefer newer records (higher ID)
-                        score += r.id * 0.001
-                        return score
-                    
-                    records.sort(key=score_record, reverse=True)
-                    keep_record = records[0]
-                    
-                    # Remove duplicates
-                    for record in records[1:]:
-                        logger.info(f"Removing duplicate availability: guest {guest.name}, date {record.date}, time {record.start_time}-{record.end_time}")
-                        record.delete()
-                        duplicates_removed += 1
-        
-        return duplicates_removed
+        Ranks each (guest, event, date) group with ROW_NUMBER() and deletes
+        everything but the top row. Best = not a 23:59 end time (likely
+        corrupted), then an evening end time, then the newest record.
+        """
+        end_hour = extract('hour', Availability.end_time)
+        score = (
+            case((Availability.end_time == time(23, 59), -100), else_=0) +
+            case((and_(end_hour >= 17, end_hour <= 23), 10), else_=0)
+        )
+        rank = func.row_number().over(
+            partition_by=(Availability.guest_id, Availability.event_id, Availability.date),
+            order_by=(score.desc(), Availability.id.desc())
+        ).label('rank')
+        
+        ranked = select(Availability.id, rank)
+        if since is not None:
+            # Only groups that gained or changed a record since the last run
+            ranked = ranked.where(Availability.guest_id.in_(
+                select(Availability.guest_id).where(Availability.updated_at >= since)
+            ))
+        ranked = ranked.subquery()
+        duplicate_ids = select(ranked.c.id).where(ranked.c.rank > 1).limit(self.batch_size)
+        
+        count = self._run_in_batches(
+            lambda: delete(Availability).where(Availability.id.in_(duplicate_ids))
+        )
+        if count:
+            logger.info(f"Removed {count} duplicate availability records")
+        return count
     
     def _fix_orphaned_guests(self) -> int:
-        """Remove guests that don't belong to valid events"""
-        orphaned = Guest.query.filter(
-            ~Guest.event_id.in_(
-                Event.query.with_entities(Event.id).subquery()
+        """Remove guests that don't belong to valid events, with their availability"""
+        orphan_guest_ids = select(Guest.id).where(~exists().where(Event.id == Guest.event_id))
+        
+        self._run_in_batches(
+            lambda: delete(Availability).where(
+                Availability.id.in_(
+                    select(Availability.id).where(Availability.guest_id.in_(orphan_guest_ids)).limit(self.batch_size)
+                )
+            )
+        )
+        count = self._run_in_batches(
+            lambda: delete(Guest).where(Guest.id.in_(orphan_guest_ids.limit(self.batch_size)))
+        )
+        if count:
+            logger.info(f"Removed {count} orphaned guests")
+        return count
+    
+    def reconcile_event_counters(self, event_ids=None, since: Optional[datetime] = None) -> int:
+        """Recompute Event response counters from guests and repair any drift
+        
+        With `since`, only events touched (directly or through a guest) after
+        that time are compared.
+        """
+        if since is not None:
+            touched = select(Event.id).where(Event.updated_at >= since).union(
+                select(Guest.event_id).where(Guest.updated_at >= since)
             )
-        ).all()
+            touched_ids = [row[0] for row in db.session.execute(touched)]
+            if event_ids is not None:
+                requested = set(event_ids)
+                touched_ids = [event_id for event_id in touched_ids if event_id in requested]
+            event_ids = touched_ids
+            if not event_ids:
+                return 0
         
-        count = len(orphaned)
-        for guest in orphaned:
-            logger.info(f"Removing orphaned guest {guest.name} (event_id: {guest.event_id})")
-            # Also remove their availability records
-            for avail in guest.availability_records:
-                avail.delete()
-            guest.delete()
+        guest_counts = db.session.query(
+            Guest.event_id.label('event_id'),
+            func.count(Guest.id).label('guests_total'),
+            func.sum(case((Guest.availability_provided == True, 1), else_=0)).label('availability_responded'),
+            func.sum(case((Guest.rsvp_status == 'yes', 1), else_=0)).label('rsvp_yes'),
+            func.sum(case((Guest.rsvp_status == 'no', 1), else_=0)).label('rsvp_no'),
+            func.sum(case((Guest.rsvp_status == 'maybe', 1), else_=0)).label('rsvp_maybe')
+        )
+        if event_ids is not None:
+            guest_counts = guest_counts.filter(Guest.event_id.in_(event_ids))
+        guest_counts = guest_counts.group_by(Guest.event_id).subquery()
         
-        return count
+        counter_columns = ['guests_total', 'availability_responded', 'rsvp_yes', 'rsvp_no', 'rsvp_maybe']
+        query = db.session.query(
+            Event.id,
+            *[getattr(Event, column) for column in counter_columns],
+            *[func.coalesce(guest_counts.c[column], 0) for column in counter_columns]
+        ).outerjoin(guest_counts, guest_counts.c.event_id == Event.id)
+        
+        if event_ids is not None:
+            query = query.filter(Event.id.in_(event_ids))
+        
+        fixed = 0
+        for row in query.all():
+            stored = row[1:1 + len(counter_columns)]
+            actual = row[1 + len(counter_columns):]
+            if tuple(stored) != tuple(int(value) for value in actual):
+                logger.info(f"Reconciling counters for event {row[0]}: {dict(zip(counter_columns, stored))} -> {dict(zip(counter_columns, actual))}")
+                Event.query.filter_by(id=row[0]).update(
+                    {column: int(value) for column, value in zip(counter_columns, actual)},
+                    synchronize_session=False
+                )
+                fixed += 1
+        
+        if fixed:
+            db.session.commit()
+        
+        return fixed
     
     def run_preventive_maintenance(self) -> None:
         """Run regular maintenance to prevent corruption"""
@@ -0,0 +1,221 @@
+"""
+Event Retention Service
+
+Cancelled and finalized events (every reset/restart leaves one behind) used
+to stay in the hot tables forever, so active-event lookups, the dashboard
+and the integrity checks scanned an ever-growing history. This job moves
+events past their retention window - together with their guests,
+availability, proposed dates and guest states - into archived_events, one
+JSON payload per event, in batches with a commit per batch. Archived events
+can be restored with their original ids.
+"""
+
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional
+import logging
+import threading
+
+from sqlalchemy import and_, or_, select, DateTime, Date, Time
+
+from app import db
+from app.models.archived_event import ArchivedEvent
+from app.models.availability import Availability
+from app.models.event import Event
+from app.models.event_date import EventDate
+from app.models.guest import Guest
+from app.models.guest_state import GuestState
+from app.models.planner import Planner
+
+logger = logging.getLogger(__name__)
+
+# Defaults when the app config does not set them
+DEFAULT_RETENTION_DAYS = 30
+DEFAULT_IDLE_RETENTION_DAYS = 90
+
+# Statuses an event never leaves; these use the shorter retention window
+FINISHED_STATUSES = ('cancelled', 'finalized')
+
+# Payload sections in restore order (parents first)
+CHILD_MODELS = [
+    ('guests', Guest),
+    ('availability', Availability),
+    ('event_dates', EventDate),
+    ('guest_states', GuestState),
+]
+
+
+def _row_to_dict(table, row) -> Dict:
+    data = {}
+    for column in table.c:
+        value = getattr(row, column.name)
+        if isinstance(value, (datetime, date, time)):
+            value = value.isoformat()
+        data[column.name] = value
+    return data
+
+
+def _dict_to_row(table, data: Dict) -> Dict:
+    row = {}
+    for column in table.c:
+        value = data.get(column.name)
+        if value is not None and isinstance(column.type, DateTime):
+            value = datetime.fromisoformat(value)
+        elif value is not None and isinstance(column.type, Date):
+            value = date.fromisoformat(value)
+        elif value is not None and isinstance(column.type, Time):
+            value = time.fromisoformat(value)
+        row[column.name] = value
+    return row
+
+
+class EventRetentionService:
+    """Archives expired events in batches and restores them on demand"""
+
+    BATCH_SIZE = 200
+
+    def __init__(self, retention_days: Optional[int] = None, idle_retention_days: Optional[int] = None,
+                 batch_size: Optional[int] = None):
+        self._retention_days = retention_days
+        self._idle_retention_days = idle_retention_days
+        self.batch_size = batch_size or self.BATCH_SIZE
+
+    def _config(self, name: str, default: int) -> int:
+        try:
+            from flask import current_app
+            return int(current_app.config.get(name, default))
+        except RuntimeError:
+            # Outside an application context
+            return default
+
+    @property
+    def retention_days(self) -> int:
+        """Days a cancelled or finalized event stays hot, from EVENT_RETENTION_DAYS unless overridden"""
+        if self._retention_days is not None:
+            return self._retention_days
+        return self._config('EVENT_RETENTION_DAYS', DEFAULT_RETENTION_DAYS)
+
+    @property
+    def idle_retention_days(self) -> int:
+        """Days any other event may sit untouched, from EVENT_IDLE_RETENTION_DAYS unless overridden"""
+        if self._idle_retention_days is not None:
+            return self._idle_retention_days
+        return self._config('EVENT_IDLE_RETENTION_DAYS', DEFAULT_IDLE_RETENTION_DAYS)
+
+    def expired_events_filter(self, now: Optional[datetime] = None):
+        now = now or datetime.utcnow()
+        return or_(
+            and_(Event.status.in_(FINISHED_STATUSES),
+                 Event.updated_at < now - timedelta(days=self.retention_days)),
+            and_(Event.status.notin_(FINISHED_STATUSES),
+                 Event.updated_at < now - timedelta(days=self.idle_retention_days)),
+        )
+
+    def archive_expired_events(self, now: Optional[datetime] = None, max_batches: Optional[int] = None) -> int:
+        """Archive every expired event, a batch per transaction; returns the number archived"""
+        from app.services.cascade_delete_service import get_cascade_delete_service
+
+        expired = self.expired_events_filter(now)
+        archived = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            event_ids = db.session.execute(
+                select(Event.id).where(expired).order_by(Event.id).limit(self.batch_size)
+            ).scalars().all()
+            if not event_ids:
+                break
+
+            try:
+                db.session.add_all(self._build_archives(event_ids))
+                db.session.flush()
+                get_cascade_delete_service().delete_events(event_ids, commit=False)
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Error archiving events {event_ids[0]}-{event_ids[-1]}: {e}")
+                raise
+
+            archived += len(event_ids)
+            batches += 1
+            logger.info(f"Archived {len(event_ids)} event(s) (batch {batches})")
+
+        if archived:
+            logger.info(f"Retention run archived {archived} event(s)")
+        return archived
+
+    def _build_archives(self, event_ids: List[int]) -> List[ArchivedEvent]:
+        """One ArchivedEvent per event, loading each child table with a single IN query"""
+        payloads = {}
+        for event in db.session.execute(select(Event.__table__).where(Event.id.in_(event_ids))):
+            payloads[event.id] = {'event': _row_to_dict(Event.__table__, event)}
+            for section, _ in CHILD_MODELS:
+                payloads[event.id][section] = []
+
+        for section, model in CHILD_MODELS:
+            table = model.__table__
+            for row in db.session.execute(select(table).where(table.c.event_id.in_(event_ids))):
+                payloads[row.event_id][section].append(_row_to_dict(table, row))
+
+        return [
+            ArchivedEvent(
+                event_id=event_id,
+                planner_id=payload['event']['planner_id'],
+                status=payload['event']['status'],
+                event_updated_at=_dict_to_row(Event.__table__, payload['event'])['updated_at'],
+                payload=payload,
+            )
+            for event_id, payload in payloads.items()
+        ]
+
+    def restore_event(self, event_id: int) -> Event:
+        """Move an archived event and its rows back into the hot tables
+
+        Guest states are skipped for phones that have since started another
+        conversation (phone numbers are unique there). Raises ValueError when
+        the event is not archived, its planner no longer exists or its id is taken.
+        """
+        archive = ArchivedEvent.query.filter_by(event_id=event_id).first()
+        if not archive:
+            raise ValueError(f"Event {event_id} is not archived")
+        if not db.session.get(Planner, archive.planner_id):
+            raise ValueError(f"Planner {archive.planner_id} for event {event_id} no longer exists")
+        if db.session.get(Event, event_id):
+            # SQLite without AUTOINCREMENT can hand a freed id to a newer event
+            raise ValueError(f"Event id {event_id} is in use by another event")
+
+        payload = archive.payload
+        try:
+            db.session.execute(Event.__table__.insert(), [_dict_to_row(Event.__table__, payload['event'])])
+            for section, model in CHILD_MODELS:
+                table = model.__table__
+                rows = [_dict_to_row(table, data) for data in payload.get(section, [])]
+                if model is GuestState and rows:
+                    taken = set(db.session.execute(select(GuestState.phone_number).where(
+                        GuestState.phone_number.in_([row['phone_number'] for row in rows])
+                    )).scalars())
+                    rows = [row for row in rows if row['phone_number'] not in taken]
+                if rows:
+                    db.session.execute(table.insert(), rows)
+            db.session.delete(archive)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error restoring event {event_id}: {e}")
+            raise
+
+        logger.info(f"Restored archived event {event_id}")
+        return db.session.get(Event, event_id)
+
+
+# Global retention service instance (initialized lazily)
+_event_retention_service = None
+_event_retention_service_lock = threading.Lock()
+
+
+def get_event_retention_service():
+    """Get or create the shared event retention service"""
+    global _event_retention_service
+    if _event_retention_service is None:
+        with _event_retention_service_lock:
+            if _event_retention_service is None:
+                _event_retention_service = EventRetentionService()
+    return _event_retention_service
@@ -3,6 +3,7 @@ from datetime import datetime, date
 import logging
 from app.models.event import Event
 from app.models.planner import Planner
+from app.utils.structured_logging import log_category
 
 logger = logging.getLogger(__name__)
 
@@ -57,7 +58,7 @@ Examples:
             if response:
                 import json
                 result = json.loads(response)
-                logger.info(f"Event parsing successful: {result}")
+                logger.info("Event parsing successful: %s", result, extra=log_category('ai_payload'))
                 return result
                 
         except Exception as e:
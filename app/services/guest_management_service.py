@@ -1,12 +1,48 @@
 from typing import Dict, List, Optional
 import logging
+import re
+from app import db
 from app.models.event import Event
-from app.models.guest import Guest
+from app.models.guest import Guest, apply_event_counter_deltas
 from app.models.guest_state import GuestState
 from app.models.contact import Contact
 
 logger = logging.getLogger(__name__)
 
+# Contact selections such as "1,3", "2-5", "1-3, 7" or "all"
+CONTACT_SELECTION_PATTERN = re.compile(
+    r'^\s*(all|\d+(\s*-\s*\d+)?(\s*,\s*\d+(\s*-\s*\d+)?)*)\s*$', re.IGNORECASE
+)
+
+
+def is_contact_selection(message: str) -> bool:
+    """True if the message selects saved contacts by number, range or 'all'"""
+    return bool(CONTACT_SELECTION_PATTERN.match(message))
+
+
+def parse_contact_selection(message: str, contact_count: int) -> List[int]:
+    """Expand a contact selection into sorted 1-based contact numbers
+    
+    Malformed input, numbers outside 1..contact_count and backwards ranges
+    raise ValueError, so a phone number like "555-1234" is never read as a range.
+    """
+    if not is_contact_selection(message):
+        raise ValueError(f"Not a contact selection: {message!r}")
+    
+    if message.strip().lower() == 'all':
+        return list(range(1, contact_count + 1))
+    
+    selected = set()
+    for part in message.split(','):
+        first, _, last = part.partition('-')
+        first = int(first)
+        last = int(last) if last else first
+        if not 1 <= first <= last <= contact_count:
+            raise ValueError(f"Selection {part.strip()!r} is outside contacts 1-{contact_count}")
+        selected.update(range(first, last + 1))
+    return sorted(selected)
+
+
 class GuestManagementService:
     """Manages guest addition, availability, and RSVP tracking"""
     
@@ -54,6 +90,54 @@ class GuestManagementService:
             logger.error(f"Error adding guest: {e}")
             return None
 
+    def add_contacts_as_guests(self, event: Event, selected: List[Contact]) -> List[Guest]:
+        """Add the selected contacts as guests with one lookup query and one commit
+        
+        Contacts already on the event (matched by phone) are skipped.
+        """
+        if not selected:
+            return []
+        
+        phones = {contact.phone_number for contact in selected}
+        seen_phones = {
+            phone for (phone,) in db.session.query(Guest.phone_number).filter(
+                Guest.event_id == event.id,
+                Guest.phone_number.in_(phones)
+            )
+        }
+        
+        rows = []
+        for contact in selected:
+            if contact.phone_number in seen_phones:
+                continue
+            seen_phones.add(contact.phone_number)
+            rows.append({
+                'event_id': event.id,
+                'contact_id': contact.id,
+                'name': contact.name,
+                'phone_number': contact.phone_number,
+                'rsvp_status': 'pending',
+                'availability_provided': False
+            })
+        
+        if not rows:
+            return []
+        
+        # One executemany INSERT; the counter bump the flush listener would do is applied here
+        db.session.execute(Guest.__table__.insert(), rows)
+        apply_event_counter_deltas(db.session.connection(), {event.id: {'guests_total': len(rows)}})
+        db.session.commit()
+        logger.info(f"Added {len(rows)} contacts as guests to event {event.id}")
+        
+        new_phones = [row['phone_number'] for row in rows]
+        guests_by_phone = {
+            guest.phone_number: guest for guest in Guest.query.filter(
+                Guest.event_id == event.id,
+                Guest.phone_number.in_(new_phones)
+            )
+        }
+        return [guests_by_phone[phone] for phone in new_phones if phone in guests_by_phone]
+    
     def add_guests_from_text(self, event_id: int, text: str) -> Dict:
         """Legacy method - parse guest information from text and add to event"""
         try:
@@ -211,27 +295,13 @@ class GuestManagementService:
     def _format_dates_for_guest_request(self, event: Event) -> str:
         """Format dates as individual list items for guest requests"""
         try:
-            # Extract dates from JSON storage if available
-            if event.notes and "Dates JSON:" in event.notes:
-                import json
-                from datetime import datetime
-                dates_json_part = event.notes.split("Dates JSON: ")[1].split("\n")[0]
-                dates = json.loads(dates_json_part)
-                
+            proposed_dates = event.get_proposed_dates()
+            if proposed_dates:
                 # Format each date as a list item
-                formatted_dates = []
-                for date_str in dates:
-                    try:
-                        date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-                        formatted_date = date_obj.strftime('%A, %B %-d')
-                        formatted_dates.append(f"- {formatted_date}")
-                    except ValueError:
-                        formatted_dates.append(f"- {date_str}")
-                
-                return '\n'.join(formatted_dates)
+                return '\n'.join(f"- {date_obj.strftime('%A, %B %-d')}" for date_obj in proposed_dates)
             
-            # Fallback to old format
-            elif event.notes and "Proposed dates:" in event.notes:
+            # Fallback when the dates could not be stored individually
+            if event.notes and "Proposed dates:" in event.notes:
                 dates_text = event.notes.split("Proposed dates: ")[1].split("\n")[0]
                 return f"- {dates_text}"
             
@@ -317,12 +387,10 @@ class GuestManagementService:
         try:
             context = {}
             
-            # Extract event dates from notes if available
-            if event.notes and "Dates JSON:" in event.notes:
-                import json
-                dates_json_part = event.notes.split("Dates JSON: ")[1].split("\n")[0]
-                dates = json.loads(dates_json_part)
-                context['event_dates'] = dates
+            # Event dates as ISO strings for the availability parser
+            proposed_dates = event.get_proposed_dates()
+            if proposed_dates:
+                context['event_dates'] = [date_obj.isoformat() for date_obj in proposed_dates]
             
             return context
             
@@ -0,0 +1,440 @@
+"""
+Job Scheduler Service
+
+The maintenance jobs (integrity checks, guest state expiry, retention) used
+to run as separate cron scripts that each cold-started Flask. They now share
+one scheduler: jobs are registered with an interval or cron schedule plus
+jitter, and every run is recorded in job_runs with its duration.
+
+Exclusive jobs take a lease row in job_leases before running, so any number
+of processes (web workers with JOB_SCHEDULER_ENABLED, or the
+background_scheduler.py worker) can host the scheduler and each run still
+happens once. The lease row also holds the job's next run time, so the
+cadence survives restarts and does not depend on which process ran last.
+
+Non-exclusive jobs, such as warming in-process caches, run in every process
+that hosts them, so they only belong in processes that serve SMS: each
+gunicorn worker starts a scheduler with just those jobs (post_fork ->
+start_worker_scheduler), and background_scheduler.py hosts only the
+exclusive maintenance jobs.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+import logging
+import os
+import random
+import socket
+import threading
+import time
+
+from sqlalchemy import and_, delete, or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models.job_lease import JobLease
+from app.models.job_run import JobRun
+
+logger = logging.getLogger(__name__)
+
+# Defaults when the app config does not set them
+DEFAULT_LEASE_SECONDS = 30 * 60
+DEFAULT_RUN_HISTORY_DAYS = 14
+
+# Longest the scheduler sleeps between checks, so new registrations and
+# schedule changes made by other processes are picked up
+MAX_SLEEP_SECONDS = 60
+
+# Longest result repr kept in job_runs
+MAX_RESULT_LENGTH = 500
+
+
+def _config(name: str, default):
+    try:
+        from flask import current_app
+        return type(default)(current_app.config.get(name, default))
+    except RuntimeError:
+        # Outside an application context
+        return default
+
+
+class IntervalSchedule:
+    """Run every `seconds`"""
+
+    def __init__(self, seconds: float = 0, minutes: float = 0, hours: float = 0):
+        self.interval = timedelta(seconds=seconds, minutes=minutes, hours=hours)
+        if self.interval <= timedelta(0):
+            raise ValueError("Interval must be positive")
+
+    def next_after(self, after: datetime) -> datetime:
+        return after + self.interval
+
+    def __repr__(self):
+        return f'<IntervalSchedule {self.interval}>'
+
+
+def _parse_cron_field(field: str, low: int, high: int) -> frozenset:
+    """Values matched by one cron field: *, n, a-b, with optional /step, comma separated"""
+    values = set()
+    for part in field.split(','):
+        step = 1
+        if '/' in part:
+            part, step_text = part.split('/', 1)
+            step = int(step_text)
+            if step < 1:
+                raise ValueError(f"Invalid cron step in '{field}'")
+        if part == '*':
+            start, end = low, high
+        elif '-' in part:
+            start, end = (int(value) for value in part.split('-', 1))
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+        if not low <= start <= end <= high:
+            raise ValueError(f"Cron field '{field}' is outside {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+class CronSchedule:
+    """Standard five-field cron expression (minute hour day month weekday), in UTC
+
+    Weekdays are 0-6 with 0 as Sunday. As in cron, when both day of month and
+    weekday are restricted a time matching either one runs.
+    """
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression '{expression}' must have 5 fields")
+        self.expression = expression
+        self.minutes = _parse_cron_field(fields[0], 0, 59)
+        self.hours = _parse_cron_field(fields[1], 0, 23)
+        self.days = _parse_cron_field(fields[2], 1, 31)
+        self.months = _parse_cron_field(fields[3], 1, 12)
+        self.weekdays = _parse_cron_field(fields[4], 0, 6)
+        self._days_restricted = fields[2] != '*'
+        self._weekdays_restricted = fields[4] != '*'
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_match = moment.day in self.days
+        weekday_match = (moment.weekday() + 1) % 7 in self.weekdays
+        if self._days_restricted and self._weekdays_restricted:
+            return day_match or weekday_match
+        return day_match and weekday_match
+
+    def next_after(self, after: datetime) -> datetime:
+        """First matching minute strictly after `after`, skipping whole months/days/hours that cannot match"""
+        moment = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + timedelta(days=366 * 5)
+        while moment < limit:
+            if moment.month not in self.months:
+                moment = (moment.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(moment):
+                moment = moment.replace(hour=0, minute=0) + timedelta(days=1)
+            elif moment.hour not in self.hours:
+                moment = moment.replace(minute=0) + timedelta(hours=1)
+            elif moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+            else:
+                return moment
+        raise ValueError(f"Cron expression '{self.expression}' never matches")
+
+    def __repr__(self):
+        return f'<CronSchedule {self.expression}>'
+
+
+@dataclass
+class Job:
+    """A registered job and this process's view of when it next runs"""
+    name: str
+    func: Callable
+    schedule: object
+    jitter_seconds: float = 0
+    exclusive: bool = True
+    lease_seconds: Optional[int] = None
+    next_run_at: Optional[datetime] = None
+
+    def next_run_after(self, after: datetime) -> datetime:
+        """Next scheduled time plus random jitter, so processes and jobs don't fire in lockstep"""
+        jitter = random.uniform(0, self.jitter_seconds) if self.jitter_seconds else 0
+        return self.schedule.next_after(after) + timedelta(seconds=jitter)
+
+
+class JobScheduler:
+    """Registry and run loop for scheduled jobs"""
+
+    def __init__(self, app=None, owner: Optional[str] = None):
+        self.app = app
+        self.owner = owner or f'{socket.gethostname()}:{os.getpid()}'
+        self.jobs: Dict[str, Job] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, name: str, func: Callable = None, every: Optional[timedelta] = None,
+                 cron: Optional[str] = None, jitter_seconds: float = 0, exclusive: bool = True,
+                 lease_seconds: Optional[int] = None):
+        """Register `func` to run `every` interval or on a `cron` expression
+
+        Usable as a decorator when `func` is omitted.
+        """
+        if (every is None) == (cron is None):
+            raise ValueError(f"Job {name} needs exactly one of every= or cron=")
+        if name in self.jobs:
+            raise ValueError(f"Job {name} is already registered")
+
+        def decorator(job_func):
+            schedule = CronSchedule(cron) if cron else IntervalSchedule(seconds=every.total_seconds())
+            self.jobs[name] = Job(name=name, func=job_func, schedule=schedule, jitter_seconds=jitter_seconds,
+                                  exclusive=exclusive, lease_seconds=lease_seconds)
+            return job_func
+
+        if func is None:
+            return decorator
+        decorator(func)
+        return func
+
+    def _lease_seconds(self, job: Job) -> int:
+        if job.lease_seconds is not None:
+            return job.lease_seconds
+        return _config('JOB_LEASE_SECONDS', DEFAULT_LEASE_SECONDS)
+
+    def _acquire_lease(self, job: Job, now: datetime, force: bool = False) -> bool:
+        """Claim the job's lease if it is free and the shared next run time has come
+
+        With `force` only the lease has to be free, whenever the next run is due.
+        """
+        locked_until = now + timedelta(seconds=self._lease_seconds(job))
+        claimable = and_(
+            JobLease.name == job.name,
+            or_(JobLease.locked_until.is_(None), JobLease.locked_until < now),
+        )
+        if not force:
+            claimable = and_(claimable, or_(JobLease.next_run_at.is_(None), JobLease.next_run_at <= now))
+        result = db.session.execute(
+            update(JobLease).where(claimable).values(owner=self.owner, locked_until=locked_until),
+            execution_options={'synchronize_session': False}
+        )
+        if result.rowcount:
+            db.session.commit()
+            return True
+
+        if db.session.execute(select(JobLease.id).where(JobLease.name == job.name)).first():
+            db.session.rollback()
+            return False
+
+        try:
+            db.session.add(JobLease(name=job.name, owner=self.owner, locked_until=locked_until))
+            db.session.commit()
+            return True
+        except IntegrityError:
+            # Another process created the lease first
+            db.session.rollback()
+            return False
+
+    def _adopt_shared_schedule(self, job: Job, now: datetime) -> None:
+        """After losing the lease, wait for the shared next run (or the running lease to lapse)"""
+        row = db.session.execute(
+            select(JobLease.next_run_at, JobLease.locked_until).where(JobLease.name == job.name)
+        ).first()
+        candidates = [value for value in (row or ()) if value and value > now]
+        job.next_run_at = max(candidates) if candidates else job.next_run_after(now)
+
+    def run_job(self, name: str, now: Optional[datetime] = None, force: bool = False) -> Optional[JobRun]:
+        """Run one job now, under its lease when exclusive; returns the recorded run or None when skipped
+
+        `force` runs the job before its next run time, still skipping it while another process holds the lease.
+        """
+        job = self.jobs[name]
+        now = now or datetime.utcnow()
+        if job.exclusive and not self._acquire_lease(job, now, force=force):
+            self._adopt_shared_schedule(job, now)
+            logger.debug(f"Job {name} skipped: lease held elsewhere or not due")
+            return None
+
+        started = time.perf_counter()
+        status, result, error = 'success', None, None
+        try:
+            result = job.func()
+        except Exception as e:
+            db.session.rollback()
+            status, error = 'failed', f'{type(e).__name__}: {e}'
+            logger.error(f"Job {name} failed: {e}")
+        duration_ms = (time.perf_counter() - started) * 1000
+
+        job.next_run_at = job.next_run_after(now)
+        run = JobRun(
+            name=name,
+            owner=self.owner,
+            started_at=now,
+            finished_at=now + timedelta(milliseconds=duration_ms),
+            duration_ms=duration_ms,
+            status=status,
+            result=None if result is None else repr(result)[:MAX_RESULT_LENGTH],
+            error=error,
+        )
+        try:
+            db.session.add(run)
+            if job.exclusive:
+                db.session.execute(
+                    update(JobLease).where(JobLease.name == name, JobLease.owner == self.owner).values(
+                        owner=None, locked_until=None, next_run_at=job.next_run_at, last_run_at=now
+                    ),
+                    execution_options={'synchronize_session': False}
+                )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        logger.info(f"Job {name} {status} in {duration_ms:.0f}ms; next run at {job.next_run_at:%Y-%m-%d %H:%M:%S}")
+        return run
+
+    def run_pending(self, now: Optional[datetime] = None) -> List[JobRun]:
+        """Run every job that is due; returns the runs recorded"""
+        now = now or datetime.utcnow()
+        runs = []
+        for job in list(self.jobs.values()):
+            if job.next_run_at is None:
+                # First check in this process: interval jobs start after their jitter, cron jobs at their next match
+                if isinstance(job.schedule, IntervalSchedule):
+                    job.next_run_at = now + timedelta(seconds=random.uniform(0, job.jitter_seconds))
+                else:
+                    job.next_run_at = job.next_run_after(now)
+            if job.next_run_at > now:
+                continue
+            try:
+                run = self.run_job(job.name, now)
+            except Exception as e:
+                # Bookkeeping failed (e.g. the database is unreachable); try again next interval
+                logger.error(f"Could not run job {job.name}: {e}")
+                job.next_run_at = job.next_run_after(now)
+                continue
+            if run:
+                runs.append(run)
+        return runs
+
+    def seconds_until_next_run(self, now: Optional[datetime] = None) -> float:
+        now = now or datetime.utcnow()
+        pending = [job.next_run_at for job in self.jobs.values() if job.next_run_at]
+        if not pending:
+            return 0
+        return max(0.0, min(MAX_SLEEP_SECONDS, (min(pending) - now).total_seconds()))
+
+    def _tick(self) -> None:
+        if self.app is None:
+            self.run_pending()
+            return
+        # A fresh app context per tick returns the session's connection to the pool between runs
+        with self.app.app_context():
+            self.run_pending()
+
+    def run_forever(self) -> None:
+        """Run due jobs until stop() is called"""
+        logger.info(f"Job scheduler {self.owner} started with jobs: {', '.join(self.jobs)}")
+        while not self._stop.is_set():
+            try:
+                self._tick()
+            except Exception as e:
+                logger.error(f"Job scheduler tick failed: {e}")
+            self._stop.wait(self.seconds_until_next_run() or 1)
+        logger.info(f"Job scheduler {self.owner} stopped")
+
+    def start(self) -> threading.Thread:
+        """Run the scheduler in a daemon thread of this process"""
+        if self._thread and self._thread.is_alive():
+            return self._thread
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run_forever, name='job-scheduler', daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+
+def prune_job_runs(now: Optional[datetime] = None, history_days: Optional[int] = None) -> int:
+    """Delete job runs older than JOB_RUN_HISTORY_DAYS"""
+    if history_days is None:
+        history_days = _config('JOB_RUN_HISTORY_DAYS', DEFAULT_RUN_HISTORY_DAYS)
+    cutoff = (now or datetime.utcnow()) - timedelta(days=history_days)
+    result = db.session.execute(delete(JobRun).where(JobRun.started_at < cutoff),
+                                execution_options={'synchronize_session': False})
+    db.session.commit()
+    return result.rowcount
+
+
+def warm_contact_menus(active_within: timedelta = timedelta(days=1)) -> int:
+    """Load contact menus for planners with recently active events into this process's cache"""
+    from app.models.event import Event
+    from app.models.planner import Planner
+    from app.services.contact_menu_service import get_contact_menu_service
+
+    menu_service = get_contact_menu_service()
+    active_planner_ids = select(Event.planner_id).where(
+        Event.updated_at >= datetime.utcnow() - active_within
+    ).distinct()
+    planners = Planner.query.filter(Planner.id.in_(active_planner_ids)).limit(menu_service._max_planners).all()
+    for planner in planners:
+        menu_service.get_entries(planner)
+    return len(planners)
+
+
+def register_default_jobs(scheduler: JobScheduler) -> JobScheduler:
+    """The maintenance jobs that used to run from cron (each runs once across processes)"""
+    from app.services.data_integrity_service import DataIntegrityService
+    from app.services.event_retention_service import EventRetentionService
+
+    scheduler.register('integrity_check', lambda: DataIntegrityService().check_and_fix_all_issues(),
+                       every=timedelta(minutes=15), jitter_seconds=60)
+    scheduler.register('guest_state_expiry', lambda: DataIntegrityService().sweep_expired_guest_states(),
+                       every=timedelta(minutes=5), jitter_seconds=30)
+    scheduler.register('event_retention', lambda: EventRetentionService().archive_expired_events(),
+                       cron='30 3 * * *', jitter_seconds=300, lease_seconds=2 * 60 * 60)
+    scheduler.register('job_run_cleanup', prune_job_runs, cron='0 4 * * *', jitter_seconds=300)
+    return scheduler
+
+
+def register_worker_jobs(scheduler: JobScheduler) -> JobScheduler:
+    """Jobs that warm the caches of the process hosting them; only useful where SMS is served"""
+    scheduler.register('contact_menu_warm', warm_contact_menus,
+                       every=timedelta(minutes=10), jitter_seconds=60, exclusive=False)
+    return scheduler
+
+
+# Global scheduler instances (initialized lazily)
+_job_scheduler = None
+_job_scheduler_lock = threading.Lock()
+_worker_scheduler = None
+
+
+def get_job_scheduler(app=None):
+    """Get or create the shared scheduler with the maintenance and worker jobs registered"""
+    global _job_scheduler
+    if _job_scheduler is None:
+        with _job_scheduler_lock:
+            if _job_scheduler is None:
+                _job_scheduler = register_worker_jobs(register_default_jobs(JobScheduler(app)))
+    elif app is not None and _job_scheduler.app is None:
+        _job_scheduler.app = app
+    return _job_scheduler
+
+
+def start_scheduler(app) -> JobScheduler:
+    """Start the shared scheduler in a background thread of this process"""
+    scheduler = get_job_scheduler(app)
+    scheduler.start()
+    return scheduler
+
+
+def start_worker_scheduler(app) -> JobScheduler:
+    """Run only the worker jobs in a background thread of this web worker (gunicorn post_fork)"""
+    global _worker_scheduler
+    with _job_scheduler_lock:
+        if _worker_scheduler is None:
+            _worker_scheduler = register_worker_jobs(JobScheduler(app))
+    _worker_scheduler.start()
+    return _worker_scheduler
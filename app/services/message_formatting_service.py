@@ -2,6 +2,8 @@ from typing import Dict, List
 import logging
 from app.models.event import Event
 from app.models.guest import Guest
+from app.services.metrics_service import timed
+from app.utils.structured_logging import log_category
 
 logger = logging.getLogger(__name__)
 
@@ -67,6 +69,7 @@ class MessageFormattingService:
         # If not a standard 10-digit number, return as-is
         return phone_number
     
+    @timed('formatting')
     def format_planner_confirmation_menu(self, event: Event) -> str:
         """Generate 3-option confirmation menu"""
         guest_list = "\n".join([f"- {guest.name} ({self._format_phone_display(guest.phone_number)})" for guest in event.guests])
@@ -74,29 +77,12 @@ class MessageFormattingService:
         response_text = "Got it, planning for:\n"
         
         # Format dates as individual list items
-        if event.notes and "Dates JSON:" in event.notes:
-            # Extract dates from JSON storage
-            try:
-                import json
-                from datetime import datetime
-                dates_json_part = event.notes.split("Dates JSON: ")[1].split("\n")[0]
-                dates = json.loads(dates_json_part)
-                
-                # Format each date as a list item
-                for date_str in dates:
-                    try:
-                        date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-                        formatted_date = date_obj.strftime('%A, %B %-d')
-                        response_text += f"- {formatted_date}\n"
-                    except ValueError:
-                        response_text += f"- {date_str}\n"
-            except (json.JSONDecodeError, IndexError):
-                # Fallback to old format
-                if "Proposed dates:" in event.notes:
-                    dates_text = event.notes.split("Proposed dates: ")[1].split("\n")[0]
-                    response_text += f"- {dates_text}\n"
+        proposed_dates = event.get_proposed_dates()
+        if proposed_dates:
+            for date_obj in proposed_dates:
+                response_text += f"- {date_obj.strftime('%A, %B %-d')}\n"
         elif event.notes and "Proposed dates:" in event.notes:
-            # Fallback for old format
+            # Fallback when the dates could not be stored individually
             dates_text = event.notes.split("Proposed dates: ")[1].split("\n")[0]
             response_text += f"- {dates_text}\n"
         
@@ -109,10 +95,12 @@ class MessageFormattingService:
         
         return response_text
     
+    @timed('formatting')
     def format_availability_status(self, event: Event) -> str:
         """Create availability tracking summary"""
-        total_guests = len(event.guests)
-        provided_count = sum(1 for guest in event.guests if guest.availability_provided)
+        counts = event.get_response_counts()
+        total_guests = counts['total']
+        provided_count = counts['availability_responded']
         pending_count = total_guests - provided_count
         
         status_text = f"📊 Availability Status:\n\n"
@@ -120,7 +108,7 @@ class MessageFormattingService:
         status_text += f"⏳ Pending: {pending_count}\n\n"
         
         if pending_count > 0:
-            pending_guests = [guest for guest in event.guests if not guest.availability_provided]
+            pending_guests = Guest.query.filter_by(event_id=event.id, availability_provided=False).all()
             status_text += "Still waiting for:\n"
             for guest in pending_guests:
                 status_text += f"- {guest.name}\n"
@@ -139,6 +127,7 @@ class MessageFormattingService:
         
         return status_text
     
+    @timed('formatting')
     def format_venue_suggestions(self, venues: List[Dict], activity: str, location: str) -> str:
         """Format venue options with Google Maps links"""
         response_text = f"🎯 Perfect! Looking for {activity} in {location}.\n\n"
@@ -158,6 +147,7 @@ class MessageFormattingService:
         
         return response_text
     
+    @timed('formatting')
     def format_guest_invitation(self, event: Event, guest: Guest) -> str:
         """Create final invitation message"""
         # Format date and time - use selected_ fields from time selection
@@ -187,7 +177,7 @@ class MessageFormattingService:
         venue_info = "Selected venue"
         venue_link = ""
         if event.selected_venue:
-            logger.info(f"Raw venue data: {event.selected_venue} (type: {type(event.selected_venue)})")
+            logger.info("Raw venue data: %s", event.selected_venue, extra=log_category('parse_result'))
             try:
                 # Handle both dict and JSON string formats
                 if isinstance(event.selected_venue, dict):
@@ -198,7 +188,7 @@ class MessageFormattingService:
                 
                 venue_info = venue_data.get('name', 'Selected venue')
                 venue_link = venue_data.get('link', '')
-                logger.info(f"Parsed venue: {venue_info}, link: {venue_link}")
+                logger.info("Parsed venue: %s, link: %s", venue_info, venue_link, extra=log_category('parse_result'))
             except Exception as e:
                 logger.error(f"Error parsing venue data: {e}")
                 # Fallback to check if it's a simple string
@@ -221,6 +211,7 @@ class MessageFormattingService:
         
         return invitation_msg
     
+    @timed('formatting')
     def format_time_selection_options(self, overlaps: List[Dict], event: Event = None) -> str:
         """Format time selection with overlaps"""
         if not overlaps:
@@ -304,6 +295,7 @@ class MessageFormattingService:
         message += "Say 'restart' to try with new guests or dates"
         return message
 
+    @timed('formatting')
     def format_final_confirmation(self, event: Event) -> str:
         """Format final confirmation with all event details"""
         # Get date and time info from selected data
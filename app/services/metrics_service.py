@@ -0,0 +1,397 @@
+"""
+Request Metrics Service
+
+The SMS webhook used to log a single "SMS processed in X.XXXs" line, which
+said nothing about where the time went. Each message is now tracked as a
+request with spans for database, AI, outbound SMS and formatting time
+(whatever is left is attributed to application code). Nested spans count
+only their own time, so a formatting call that runs queries is split
+between the two phases. Totals and query counts are aggregated per workflow
+stage and handler into histograms that /metrics serves in the Prometheus
+text format, and statements repeated N_PLUS_ONE_THRESHOLD times within one
+message are logged as likely N+1 lazy loads.
+
+Histograms live in process memory. With several gunicorn workers each
+scrape would see only the worker that served it, and Prometheus would read
+every switch between workers as a counter reset, so METRICS_MULTIPROC_DIR
+(set by gunicorn.conf.py) makes the workers share them: each worker writes
+its histograms to a file there after every message, and /metrics serves
+the sum of all files. gunicorn's child_exit hook folds an exited worker's
+file into a running total, so restarts never make a counter go down.
+Without the directory, run a single worker.
+"""
+
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Dict, Iterable, List, Optional, Tuple
+import fcntl
+import glob
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+from app.services.query_counter_service import QueryCounter, count_queries, n_plus_one_threshold
+
+logger = logging.getLogger(__name__)
+
+# Seconds; tuned for SMS round trips where AI calls can take several seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Statements per message
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 250)
+
+# Phases reported for every request; 'app' is the remainder not covered by a span
+PHASES = ('db', 'ai', 'sms', 'formatting', 'app')
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(pairs: Iterable[Tuple[str, str]]) -> str:
+    pairs = list(pairs)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_bound(bound: float) -> str:
+    return '+Inf' if bound == float('inf') else repr(float(bound))
+
+
+class Histogram:
+    """Prometheus-style histogram with one series per label combination"""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        # label values -> [per-bucket counts, sum, count]
+        self._series: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(str(labels.get(name, '')) for name in self.label_names)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][index] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def snapshot(self) -> Dict[tuple, tuple]:
+        """Label values -> (cumulative bucket counts, sum, count)"""
+        with self._lock:
+            items = [(key, list(series[0]), series[1], series[2]) for key, series in self._series.items()]
+        snapshot = {}
+        for key, counts, total, count in items:
+            cumulative, running = [], 0
+            for bucket_count in counts:
+                running += bucket_count
+                cumulative.append(running)
+            snapshot[key] = (cumulative, total, count)
+        return snapshot
+
+    def render(self, snapshot: Optional[Dict[tuple, tuple]] = None) -> List[str]:
+        """Text format lines for `snapshot` (default: this process's own series)"""
+        if snapshot is None:
+            snapshot = self.snapshot()
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        for key, (cumulative, total, count) in sorted(snapshot.items()):
+            labels = list(zip(self.label_names, key))
+            for bound, bucket_count in zip(self.buckets, cumulative):
+                lines.append(f'{self.name}_bucket{_format_labels(labels + [("le", _format_bound(bound))])} {bucket_count}')
+            lines.append(f'{self.name}_sum{_format_labels(labels)} {total!r}')
+            lines.append(f'{self.name}_count{_format_labels(labels)} {count}')
+        return lines
+
+
+class MetricsRegistry:
+    """Named histograms rendered together for /metrics"""
+
+    def __init__(self):
+        self._metrics: 'OrderedDict[str, Histogram]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, help_text: str, label_names: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        """Get or create a histogram"""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = Histogram(name, help_text, label_names, buckets)
+            return metric
+
+    def snapshot(self) -> Dict[str, Dict[tuple, tuple]]:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: metric.snapshot() for metric in metrics}
+
+    def render(self, snapshots: Optional[Dict[str, Dict[tuple, tuple]]] = None) -> str:
+        """Every histogram, from `snapshots` (e.g. MultiprocessStore.read()) when given"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render(None if snapshots is None else snapshots.get(metric.name, {})))
+        return '\n'.join(lines) + '\n'
+
+
+def _merge_snapshots(target: Dict[str, Dict[tuple, tuple]], source: Dict[str, Dict[tuple, tuple]]) -> None:
+    for name, series in source.items():
+        merged = target.setdefault(name, {})
+        for key, (cumulative, total, count) in series.items():
+            if key in merged:
+                previous = merged[key]
+                cumulative = [a + b for a, b in zip(previous[0], cumulative)]
+                total, count = previous[1] + total, previous[2] + count
+            merged[key] = (list(cumulative), total, count)
+
+
+class MultiprocessStore:
+    """Histogram snapshots of every worker on this instance, one JSON file per process"""
+
+    ARCHIVE_NAME = 'metrics_exited.json'
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, pid: int) -> str:
+        return os.path.join(self.directory, f'metrics_{pid}.json')
+
+    @contextmanager
+    def _locked(self, mode: int):
+        with open(os.path.join(self.directory, '.lock'), 'a') as lock_file:
+            fcntl.flock(lock_file, mode)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _load(path: str) -> Dict[str, Dict[tuple, tuple]]:
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return {name: {tuple(key): (cumulative, total, count) for key, cumulative, total, count in series}
+                for name, series in data.items()}
+
+    def _dump(self, path: str, snapshots: Dict[str, Dict[tuple, tuple]]) -> None:
+        data = {name: [[list(key), cumulative, total, count] for key, (cumulative, total, count) in series.items()]
+                for name, series in snapshots.items()}
+        temporary = f'{path}.{os.getpid()}.tmp'
+        with open(temporary, 'w') as f:
+            json.dump(data, f)
+        # Readers see the old file or the new one, never half of it
+        os.replace(temporary, path)
+
+    def write(self, registry: MetricsRegistry) -> None:
+        """Publish this process's histograms"""
+        self._dump(self._path(os.getpid()), registry.snapshot())
+
+    def read(self) -> Dict[str, Dict[tuple, tuple]]:
+        """Histograms summed over every live and exited process"""
+        merged: Dict[str, Dict[tuple, tuple]] = {}
+        with self._locked(fcntl.LOCK_SH):
+            for path in glob.glob(os.path.join(self.directory, 'metrics_*.json')):
+                _merge_snapshots(merged, self._load(path))
+        return merged
+
+    def mark_process_dead(self, pid: int) -> None:
+        """Fold an exited worker's file into the running total (gunicorn child_exit)"""
+        path = self._path(pid)
+        if not os.path.exists(path):
+            return
+        archive = os.path.join(self.directory, self.ARCHIVE_NAME)
+        with self._locked(fcntl.LOCK_EX):
+            merged = self._load(archive)
+            _merge_snapshots(merged, self._load(path))
+            self._dump(archive, merged)
+            os.remove(path)
+
+    def clear(self) -> None:
+        """Start from zero, e.g. when a new gunicorn master starts"""
+        with self._locked(fcntl.LOCK_EX):
+            for path in glob.glob(os.path.join(self.directory, 'metrics_*.json*')):
+                os.remove(path)
+
+
+class RequestTimings:
+    """Time spent per phase while handling one message"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = defaultdict(float)
+        self.labels = {'workflow_stage': 'none', 'handler': 'none'}
+        # Final breakdown, set when the request finishes
+        self.summary: Optional[Dict[str, float]] = None
+        self.queries: Optional[QueryCounter] = None
+        # Time taken by child spans of each open span, innermost last
+        self._open_spans: List[float] = []
+
+    def record(self, phase: str, seconds: float) -> None:
+        """Attribute a leaf measurement (e.g. one query) to a phase"""
+        self.phases[phase] += seconds
+        if self._open_spans:
+            self._open_spans[-1] += seconds
+
+    def breakdown(self) -> Dict[str, float]:
+        """Seconds per phase, with the unspanned remainder as 'app'"""
+        total = time.perf_counter() - self.started
+        breakdown = {phase: self.phases.get(phase, 0.0) for phase in PHASES if phase != 'app'}
+        breakdown['app'] = max(0.0, total - sum(self.phases.values()))
+        breakdown['total'] = total
+        return breakdown
+
+
+_current_request: ContextVar[Optional[RequestTimings]] = ContextVar('request_timings', default=None)
+
+_metrics_registry = MetricsRegistry()
+
+REQUEST_DURATION = _metrics_registry.histogram(
+    'sms_request_duration_seconds', 'Time to handle an incoming SMS',
+    ('workflow_stage', 'handler'))
+PHASE_DURATION = _metrics_registry.histogram(
+    'sms_request_phase_duration_seconds', 'Time per phase (db, ai, sms, formatting, app) while handling an SMS',
+    ('phase', 'workflow_stage', 'handler'))
+QUERY_COUNT = _metrics_registry.histogram(
+    'sms_request_queries', 'SQL statements run while handling an SMS',
+    ('workflow_stage', 'handler'), buckets=QUERY_COUNT_BUCKETS)
+AI_CALL_DURATION = _metrics_registry.histogram(
+    'ai_call_duration_seconds', 'Duration of each AI completion call by call site', ('site',))
+
+
+_multiprocess_store: Optional[MultiprocessStore] = None
+_multiprocess_store_lock = threading.Lock()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    return _metrics_registry
+
+
+def get_multiprocess_store() -> Optional[MultiprocessStore]:
+    """The store in METRICS_MULTIPROC_DIR, or None when each process keeps its own histograms"""
+    global _multiprocess_store
+    try:
+        from flask import current_app
+        directory = current_app.config.get('METRICS_MULTIPROC_DIR')
+    except RuntimeError:
+        # Outside an application context
+        directory = os.environ.get('METRICS_MULTIPROC_DIR')
+    if not directory:
+        return None
+    if _multiprocess_store is None or _multiprocess_store.directory != directory:
+        with _multiprocess_store_lock:
+            if _multiprocess_store is None or _multiprocess_store.directory != directory:
+                _multiprocess_store = MultiprocessStore(directory)
+    return _multiprocess_store
+
+
+def render_metrics() -> str:
+    """/metrics body: every worker's histograms when they share a store, else this process's"""
+    store = get_multiprocess_store()
+    return _metrics_registry.render(store.read() if store else None)
+
+
+def current_request() -> Optional[RequestTimings]:
+    return _current_request.get()
+
+
+def metrics_enabled() -> bool:
+    try:
+        from flask import current_app
+        return bool(current_app.config.get('PERFORMANCE_METRICS_ENABLED', True))
+    except RuntimeError:
+        # Outside an application context
+        return True
+
+
+@contextmanager
+def track_request():
+    """Collect spans for one incoming message and fold them into the histograms"""
+    if not metrics_enabled():
+        yield None
+        return
+
+    timings = RequestTimings()
+    token = _current_request.set(timings)
+    try:
+        with count_queries(on_query=lambda statement, seconds: timings.record('db', seconds)) as queries:
+            timings.queries = queries
+            yield timings
+    finally:
+        _current_request.reset(token)
+        timings.summary = timings.breakdown()
+        REQUEST_DURATION.observe(timings.summary['total'], **timings.labels)
+        for phase in PHASES:
+            PHASE_DURATION.observe(timings.summary[phase], phase=phase, **timings.labels)
+        QUERY_COUNT.observe(queries.count, **timings.labels)
+        for statement, count in queries.repeated(n_plus_one_threshold()):
+            logger.warning(f"Possible N+1 in {timings.labels['workflow_stage']}/{timings.labels['handler']}: "
+                           f"{count}x {' '.join(statement.split())[:200]}")
+        store = get_multiprocess_store()
+        if store is not None:
+            try:
+                store.write(_metrics_registry)
+            except OSError as e:
+                logger.error(f"Could not write metrics to {store.directory}: {e}")
+
+
+def tag_request(**labels) -> None:
+    """Set workflow_stage/handler labels for the current message"""
+    timings = _current_request.get()
+    if timings is not None:
+        timings.labels.update({name: str(value) for name, value in labels.items() if value is not None})
+
+
+@contextmanager
+def span(phase: str, site: Optional[str] = None):
+    """Time a block as `phase`; AI spans also record per-call-site durations"""
+    timings = _current_request.get()
+    if timings is not None:
+        timings._open_spans.append(0.0)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        if timings is not None:
+            child_time = timings._open_spans.pop()
+            timings.phases[phase] += elapsed - child_time
+            if timings._open_spans:
+                timings._open_spans[-1] += elapsed
+        if site is not None:
+            AI_CALL_DURATION.observe(elapsed, site=site)
+
+
+def timed(phase: str):
+    """Decorator form of span()"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(phase):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def caller_site(depth: int = 2) -> str:
+    """'module.function' of the caller's caller, used to label AI call sites"""
+    frame = sys._getframe(depth)
+    module = frame.f_globals.get('__name__', '').rsplit('.', 1)[-1]
+    return f'{module}.{frame.f_code.co_name}'
+
@@ -0,0 +1,273 @@
+"""
+Planner Notification Digests
+
+Guest responses used to trigger one planner SMS each, so a 20-person event
+produced a burst of 20 texts. Responses for the same event are now buffered
+for a short window and sent to the planner as a single digest, e.g.
+"✅ Ana, Ben and Cy have provided their availability! 📊 7/20 ...".
+
+The buffer lives in the memory of each process. Pending digests are sent
+when the process exits (atexit, and gunicorn's worker_exit hook for
+workers stopped on deploy, restart or timeout), but not if the process is
+killed outright. Each gunicorn worker buffers separately too, so when two
+workers handle responses for the same event in one window, the planner
+gets one digest from each.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+import atexit
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Default debounce window when the app config does not set one
+DEFAULT_DIGEST_WINDOW_SECONDS = 60
+
+RSVP_STATUS_EMOJI = {
+    'yes': '👍',
+    'no': '❌',
+    'maybe': '🤔'
+}
+
+RSVP_STATUS_TEXT = {
+    'yes': 'is going',
+    'no': 'declined',
+    'maybe': 'responded maybe'
+}
+
+
+@dataclass
+class PendingDigest:
+    """Responses buffered for one (event, notification kind) pair"""
+    event_id: int
+    kind: str
+    planner_phone: str
+    entries: List[Dict] = field(default_factory=list)
+    created_at: float = field(default_factory=time.monotonic)
+    timer: Optional[threading.Timer] = None
+    app: object = None
+
+
+def get_response_counts(event_id: int) -> Dict[str, int]:
+    """Total, availability-responded and RSVP-responded guests from the Event counters"""
+    from app import db
+    from app.models.event import Event
+
+    event = db.session.get(Event, event_id)
+    if not event:
+        return {'total': 0, 'availability_responded': 0, 'rsvp_responded': 0}
+    return event.get_response_counts()
+
+
+class NotificationDigestService:
+    """Coalesces guest responses into debounced planner notifications"""
+
+    def __init__(self, window_seconds: Optional[float] = None, sms_service=None):
+        self._window_seconds = window_seconds
+        self._sms_service = sms_service
+        self._pending: Dict[tuple, PendingDigest] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def sms_service(self):
+        if self._sms_service is None:
+            from app.services.sms_service import SMSService
+            self._sms_service = SMSService()
+        return self._sms_service
+
+    @property
+    def window_seconds(self) -> float:
+        """Debounce window, read from NOTIFICATION_DIGEST_WINDOW_SECONDS unless overridden"""
+        if self._window_seconds is not None:
+            return self._window_seconds
+        try:
+            from flask import current_app
+            return float(current_app.config.get('NOTIFICATION_DIGEST_WINDOW_SECONDS', DEFAULT_DIGEST_WINDOW_SECONDS))
+        except RuntimeError:
+            # Outside an application context
+            return DEFAULT_DIGEST_WINDOW_SECONDS
+
+    def add_availability_response(self, event_id: int, planner_phone: str, guest_name: str,
+                                  counts: Dict[str, int] = None, final: bool = False) -> None:
+        """Queue an availability response; `final` sends the digest immediately"""
+        self._add(event_id, 'availability', planner_phone, {'name': guest_name}, counts, final)
+
+    def add_rsvp_response(self, event_id: int, planner_phone: str, guest_name: str, rsvp_status: str,
+                          counts: Dict[str, int] = None, final: bool = False) -> None:
+        """Queue an RSVP response; `final` sends the digest immediately"""
+        self._add(event_id, 'rsvp', planner_phone, {'name': guest_name, 'status': rsvp_status}, counts, final)
+
+    def _add(self, event_id: int, kind: str, planner_phone: str, entry: Dict,
+             counts: Dict[str, int], final: bool) -> None:
+        key = (event_id, kind)
+        window = self.window_seconds
+
+        with self._lock:
+            digest = self._pending.get(key)
+            if digest is None:
+                digest = PendingDigest(event_id=event_id, kind=kind, planner_phone=planner_phone,
+                                       app=self._current_app())
+                self._pending[key] = digest
+            digest.entries.append(entry)
+
+            # Schedule the flush when the window opens; later responses ride along
+            start_timer = not final and window > 0 and digest.timer is None
+            if start_timer:
+                digest.timer = threading.Timer(window, self._flush_from_timer, args=(key,))
+                digest.timer.daemon = True
+
+        if start_timer:
+            digest.timer.start()
+            logger.info(f"Queued {kind} digest for event {event_id} ({window:.0f}s window)")
+        elif final or window <= 0:
+            self.flush(event_id, kind, counts=counts)
+
+    def flush(self, event_id: int, kind: str, counts: Dict[str, int] = None) -> bool:
+        """Send the pending digest for an event now, if there is one"""
+        with self._lock:
+            digest = self._pending.pop((event_id, kind), None)
+        if digest is None:
+            return False
+
+        if digest.timer is not None:
+            digest.timer.cancel()
+
+        if counts is None:
+            counts = get_response_counts(event_id)
+
+        message = self.format_digest(digest, counts)
+        self.sms_service.send_sms(digest.planner_phone, message)
+        logger.info(f"Sent {kind} digest to planner {digest.planner_phone} for event {event_id} "
+                    f"covering {len(digest.entries)} response(s)")
+        return True
+
+    def flush_all(self) -> int:
+        """Send every pending digest - used on shutdown (flush_pending_digests) and in tests"""
+        with self._lock:
+            keys = list(self._pending.keys())
+        return sum(1 for event_id, kind in keys if self._flush_with_app(event_id, kind))
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def _flush_from_timer(self, key: tuple) -> None:
+        try:
+            self._flush_with_app(*key)
+        except Exception as e:
+            logger.error(f"Error sending planner digest for event {key[0]}: {e}")
+
+    def _flush_with_app(self, event_id: int, kind: str) -> bool:
+        """Flush inside the app context captured when the digest was opened"""
+        with self._lock:
+            digest = self._pending.get((event_id, kind))
+            app = digest.app if digest else None
+
+        if app is None:
+            return self.flush(event_id, kind)
+        with app.app_context():
+            return self.flush(event_id, kind)
+
+    def _current_app(self):
+        try:
+            from flask import current_app
+            return current_app._get_current_object()
+        except RuntimeError:
+            return None
+
+    def format_digest(self, digest: PendingDigest, counts: Dict[str, int]) -> str:
+        if digest.kind == 'rsvp':
+            return self._format_rsvp_digest(digest.entries, counts)
+        return self._format_availability_digest(digest.entries, counts)
+
+    def _format_availability_digest(self, entries: List[Dict], counts: Dict[str, int]) -> str:
+        names = _unique_names(entries)
+        total_guests = counts['total']
+        responded_guests = counts['availability_responded']
+        remaining_guests = total_guests - responded_guests
+
+        verb = "has" if len(names) == 1 else "have"
+        planner_message = f"✅ {_join_names(names)} {verb} provided their availability!\n\n"
+
+        if remaining_guests > 0:
+            planner_message += f"📊 {responded_guests}/{total_guests} guests have responded\n"
+            planner_message += f"⏳ Waiting for {remaining_guests} more guest" + ("s" if remaining_guests != 1 else "") + "\n\n"
+            planner_message += "Press 1 to view current overlaps"
+        else:
+            planner_message += "🎉 Everyone has responded!\n\n"
+            planner_message += "Would you like to:\n"
+            planner_message += "1. Pick a time\n"
+            planner_message += "2. Add more guests"
+
+        return planner_message
+
+    def _format_rsvp_digest(self, entries: List[Dict], counts: Dict[str, int]) -> str:
+        total_guests = counts['total']
+        responded_guests = counts['rsvp_responded']
+        pending_guests = total_guests - responded_guests
+
+        # Latest answer wins if a guest changed their mind inside the window
+        latest = {}
+        for entry in entries:
+            latest.pop(entry['name'], None)
+            latest[entry['name']] = entry['status']
+
+        planner_message = ""
+        for guest_name, rsvp_status in latest.items():
+            planner_message += f"{RSVP_STATUS_EMOJI.get(rsvp_status, '📝')} {guest_name} {RSVP_STATUS_TEXT.get(rsvp_status, 'responded')}!\n"
+        planner_message += "\n"
+        planner_message += f"📊 {responded_guests}/{total_guests} guests have responded\n"
+
+        if pending_guests > 0:
+            planner_message += f"⏳ Waiting for {pending_guests} more guest" + ("s" if pending_guests != 1 else "")
+        else:
+            planner_message += "🎉 Everyone has responded to your event!"
+
+        return planner_message
+
+
+def _unique_names(entries: List[Dict]) -> List[str]:
+    names = []
+    for entry in entries:
+        if entry['name'] not in names:
+            names.append(entry['name'])
+    return names
+
+
+def _join_names(names: List[str]) -> str:
+    """Join names as 'Ana', 'Ana and Ben' or 'Ana, Ben and Cy'"""
+    if len(names) <= 1:
+        return ''.join(names)
+    return f"{', '.join(names[:-1])} and {names[-1]}"
+
+
+# Global digest service instance (initialized lazily)
+_digest_service = None
+_digest_service_lock = threading.Lock()
+
+
+def get_notification_digest_service():
+    """Get or create the shared notification digest service"""
+    global _digest_service
+    if _digest_service is None:
+        with _digest_service_lock:
+            if _digest_service is None:
+                _digest_service = NotificationDigestService()
+    return _digest_service
+
+
+def flush_pending_digests() -> int:
+    """Send this process's buffered digests before it exits; returns how many were sent"""
+    if _digest_service is None:
+        return 0
+    try:
+        return _digest_service.flush_all()
+    except Exception as e:
+        logger.error(f"Error sending pending planner digests on shutdown: {e}")
+        return 0
+
+
+atexit.register(flush_pending_digests)
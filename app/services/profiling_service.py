@@ -0,0 +1,160 @@
+"""
+Request Profiling Service
+
+Opt-in cProfile sampling for the SMS endpoints. When PROFILING_SAMPLE_RATE
+is above zero, that fraction of /sms/webhook and /sms/test requests is
+profiled and the stats written to PROFILING_DIR, one .prof file per request,
+named with the workflow stage and handler recorded by the metrics service.
+The directory keeps the newest PROFILING_MAX_FILES files. profile_report.py
+merges them and prints the top functions.
+
+Only one request is profiled at a time per process: concurrent requests are
+simply not sampled, since cProfile cannot run two profilers at once.
+"""
+
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+import cProfile
+import logging
+import os
+import random
+import re
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Defaults when the app config does not set them
+DEFAULT_PROFILE_DIR = 'profiles'
+DEFAULT_MAX_FILES = 500
+
+# <timestamp>_<pid>_<endpoint>__<workflow_stage>__<handler>.prof
+PROFILE_NAME_PATTERN = re.compile(
+    r'^(?P<timestamp>\d{8}T\d{6}\.\d{6})_(?P<pid>\d+)_(?P<endpoint>[\w-]+?)__(?P<stage>[\w-]+)__(?P<handler>[\w-]+)\.prof$'
+)
+
+
+def _safe(value) -> str:
+    return re.sub(r'[^A-Za-z0-9_-]', '-', str(value)) or 'none'
+
+
+def parse_profile_name(filename: str) -> Optional[Dict[str, str]]:
+    """Tags encoded in a profile file name, or None for other files"""
+    match = PROFILE_NAME_PATTERN.match(os.path.basename(filename))
+    return match.groupdict() if match else None
+
+
+class RequestProfiler:
+    """Samples requests with cProfile and writes them to a rotating directory"""
+
+    def __init__(self, sample_rate: Optional[float] = None, directory: Optional[str] = None,
+                 max_files: Optional[int] = None):
+        self._sample_rate = sample_rate
+        self._directory = directory
+        self._max_files = max_files
+        # Held while a request is being profiled
+        self._active = threading.Lock()
+
+    def _config(self, name: str, default):
+        try:
+            from flask import current_app
+            return type(default)(current_app.config.get(name, default))
+        except RuntimeError:
+            # Outside an application context
+            return default
+
+    @property
+    def sample_rate(self) -> float:
+        """Fraction of requests profiled, from PROFILING_SAMPLE_RATE unless overridden"""
+        if self._sample_rate is not None:
+            return self._sample_rate
+        return self._config('PROFILING_SAMPLE_RATE', 0.0)
+
+    @property
+    def directory(self) -> str:
+        if self._directory is not None:
+            return self._directory
+        return self._config('PROFILING_DIR', DEFAULT_PROFILE_DIR)
+
+    @property
+    def max_files(self) -> int:
+        if self._max_files is not None:
+            return self._max_files
+        return self._config('PROFILING_MAX_FILES', DEFAULT_MAX_FILES)
+
+    @contextmanager
+    def profile(self, endpoint: str):
+        """Profile the block if this request is sampled; tags come from the metrics service at exit"""
+        rate = self.sample_rate
+        if rate <= 0 or random.random() >= rate or not self._active.acquire(blocking=False):
+            yield None
+            return
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+            try:
+                yield profiler
+            finally:
+                profiler.disable()
+                try:
+                    self._write(profiler, endpoint)
+                except Exception as e:
+                    # Profiling must never break the request
+                    logger.error(f"Error writing request profile: {e}")
+        finally:
+            self._active.release()
+
+    def _write(self, profiler: cProfile.Profile, endpoint: str) -> str:
+        from app.services.metrics_service import current_request
+
+        timings = current_request()
+        labels = timings.labels if timings else {}
+        filename = (f"{datetime.utcnow():%Y%m%dT%H%M%S.%f}_{os.getpid()}_{_safe(endpoint)}"
+                    f"__{_safe(labels.get('workflow_stage', 'none'))}__{_safe(labels.get('handler', 'none'))}.prof")
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, filename)
+        profiler.dump_stats(path)
+        self._rotate()
+        logger.info(f"Wrote request profile {path}")
+        return path
+
+    def _rotate(self) -> None:
+        """Delete the oldest profiles beyond max_files (names sort by time)"""
+        profiles = sorted(name for name in os.listdir(self.directory) if parse_profile_name(name))
+        for name in profiles[:max(0, len(profiles) - self.max_files)]:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                # Another worker rotated it first
+                pass
+
+
+def find_profiles(directory: str, stage: Optional[str] = None, handler: Optional[str] = None,
+                  endpoint: Optional[str] = None) -> List[str]:
+    """Profile paths in `directory`, oldest first, optionally filtered by tag"""
+    paths = []
+    for name in sorted(os.listdir(directory)):
+        tags = parse_profile_name(name)
+        if not tags:
+            continue
+        if (stage and tags['stage'] != stage) or (handler and tags['handler'] != handler) \
+                or (endpoint and tags['endpoint'] != endpoint):
+            continue
+        paths.append(os.path.join(directory, name))
+    return paths
+
+
+# Global profiler instance (initialized lazily)
+_request_profiler = None
+_request_profiler_lock = threading.Lock()
+
+
+def get_request_profiler():
+    """Get or create the shared request profiler"""
+    global _request_profiler
+    if _request_profiler is None:
+        with _request_profiler_lock:
+            if _request_profiler is None:
+                _request_profiler = RequestProfiler()
+    return _request_profiler
@@ -0,0 +1,117 @@
+"""
+Query Counter Service
+
+Counts the SQL statements and database time of a block of code from the
+SQLAlchemy engine events, and flags statements that run many times with
+only their parameters changing - the signature of an N+1 lazy load such as
+touching event.guests or guest.event.planner inside a loop.
+
+Every inbound SMS is counted by the metrics service (see track_request),
+which logs suspected N+1 statements with the workflow stage and handler.
+Tests use assert_query_budget to pin the query count of each stage.
+"""
+
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, List, Optional, Tuple
+import logging
+import time
+
+from sqlalchemy import event as sa_event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Default repeat count at which a statement is reported as a likely N+1
+DEFAULT_N_PLUS_ONE_THRESHOLD = 5
+
+
+class QueryCounter:
+    """Statements and database time observed while the counter is active"""
+
+    def __init__(self, on_query: Optional[Callable[[str, float], None]] = None):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: Counter = Counter()
+        self._on_query = on_query
+
+    def add(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.statements[statement] += 1
+        if self._on_query:
+            self._on_query(statement, seconds)
+
+    def repeated(self, threshold: int = DEFAULT_N_PLUS_ONE_THRESHOLD) -> List[Tuple[str, int]]:
+        """Statements executed at least `threshold` times, most repeated first"""
+        return [(statement, count) for statement, count in self.statements.most_common() if count >= threshold]
+
+    def describe(self, limit: int = 10) -> str:
+        lines = [f"{self.count} queries in {self.seconds * 1000:.1f}ms"]
+        for statement, count in self.statements.most_common(limit):
+            lines.append(f"  {count}x {' '.join(statement.split())[:200]}")
+        return '\n'.join(lines)
+
+
+# Counters for the blocks currently being counted, outermost first
+_active_counters: ContextVar[Tuple[QueryCounter, ...]] = ContextVar('query_counters', default=())
+
+
+@contextmanager
+def count_queries(on_query: Optional[Callable[[str, float], None]] = None):
+    """Count the statements run in this block (nested blocks each see their own)"""
+    counter = QueryCounter(on_query)
+    token = _active_counters.set(_active_counters.get() + (counter,))
+    try:
+        yield counter
+    finally:
+        _active_counters.reset(token)
+
+
+def n_plus_one_threshold() -> int:
+    try:
+        from flask import current_app
+        return int(current_app.config.get('N_PLUS_ONE_THRESHOLD', DEFAULT_N_PLUS_ONE_THRESHOLD))
+    except RuntimeError:
+        # Outside an application context
+        return DEFAULT_N_PLUS_ONE_THRESHOLD
+
+
+@contextmanager
+def assert_query_budget(max_queries: int, max_repeats: Optional[int] = None):
+    """Fail if the block runs more than `max_queries` statements, or any one statement more than `max_repeats` times
+
+    Test helper, e.g.:
+        with assert_query_budget(12, max_repeats=2):
+            router.route_message(phone, 'done')
+    """
+    with count_queries() as counter:
+        yield counter
+    if counter.count > max_queries:
+        raise AssertionError(f"Query budget of {max_queries} exceeded: {counter.describe()}")
+    if max_repeats is not None and counter.repeated(max_repeats + 1):
+        raise AssertionError(f"Statement repeated more than {max_repeats} times (N+1?): {counter.describe()}")
+
+
+@sa_event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _active_counters.get():
+        conn.info.setdefault('query_start_times', []).append(time.perf_counter())
+
+
+@sa_event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    counters = _active_counters.get()
+    start_times = conn.info.get('query_start_times')
+    if counters and start_times:
+        elapsed = time.perf_counter() - start_times.pop()
+        for counter in counters:
+            counter.add(statement, elapsed)
+
+
+@sa_event.listens_for(Engine, 'handle_error')
+def _handle_error(exception_context):
+    connection = exception_context.connection
+    if connection is not None and connection.info.get('query_start_times'):
+        connection.info['query_start_times'].pop()
@@ -3,8 +3,13 @@ Singleton Service Manager for Performance Optimization
 
 This module provides shared service instances to avoid recreating
 services for every SMS message. Services are created once and reused.
+The services hold no per-request state, so one set is shared by every
+thread of a threaded (gthread) worker; creation is locked so concurrent
+first requests cannot build two sets or see a half-built one.
 """
 
+import threading
+
 from app.services import (
     EventWorkflowService,
     GuestManagementService,
@@ -18,19 +23,18 @@ class ServiceManager:
     """Singleton manager for shared service instances"""
     
     _instance = None
-    _initialized = False
+    _lock = threading.Lock()
     
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
+            with cls._lock:
+                if cls._instance is None:
+                    # Fully initialize before publishing the instance to other threads
+                    instance = super().__new__(cls)
+                    instance._initialize_services()
+                    cls._instance = instance
         return cls._instance
     
-    def __init__(self):
-        # Only initialize once, even if called multiple times
-        if not self._initialized:
-            self._initialize_services()
-            ServiceManager._initialized = True
-    
     def _initialize_services(self):
         """Initialize all services once"""
         self.event_service = EventWorkflowService()
@@ -2,6 +2,9 @@ from typing import Dict, List
 import logging
 import os
 
+from app.services.metrics_service import span
+from app.utils.structured_logging import log_category
+
 logger = logging.getLogger(__name__)
 
 class SMSService:
@@ -31,17 +34,18 @@ class SMSService:
         """Send SMS message"""
         try:
             if not self.client:
-                logger.info(f"[SMS SIMULATION] To: {to_number}, Message: {message}")
+                logger.info("[SMS SIMULATION] To: %s, Message: %s", to_number, message, extra=log_category('sms_payload'))
                 return True
             
             # Ensure E.164 format for Twilio
             phone_number = to_number if str(to_number).startswith('+') else f"+1{to_number}"
                 
-            message = self.client.messages.create(
-                body=message,
-                from_=self.from_number,
-                to=phone_number
-            )
+            with span('sms'):
+                message = self.client.messages.create(
+                    body=message,
+                    from_=self.from_number,
+                    to=phone_number
+                )
             return True
             
         except Exception as e:
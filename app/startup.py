@@ -0,0 +1,106 @@
+"""
+Application warm-up
+
+Work that used to happen on the first SMS - configuring the ORM mappers,
+building the router and its 13 handlers, the shared services, the Twilio
+client and phone number metadata - is done once by warm_up() when the WSGI module is loaded. Under
+gunicorn with preload_app (see gunicorn.conf.py) that is the master
+process, so every forked worker starts warm and shares those objects
+copy-on-write.
+
+/ready answers 503 until warm_up() has finished and 200 afterwards, for
+deploy health checks that should not route traffic to a cold process.
+"""
+
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+# The schema db.create_all() built before deploys ran migrations; databases from then have no alembic_version
+PRE_MIGRATIONS_REVISION = 'cda99ebfccf0'
+
+
+def is_ready(app) -> bool:
+    return bool(app.extensions.get('warmed_up'))
+
+
+def ensure_schema(app) -> None:
+    """Create tables for a new database (or always, with INITIALIZE_DB=true)
+
+    A new database is stamped with the latest migration so later deploys
+    upgrade it from there. An existing database that create_all() built
+    without Alembic is stamped at PRE_MIGRATIONS_REVISION, so migrate_schema
+    applies everything added since. Other databases are left to the Alembic
+    migrations (migrate_schema).
+    """
+    from flask_migrate import stamp
+    from sqlalchemy import inspect
+    from app import db
+
+    initialize = os.getenv('INITIALIZE_DB', 'false').lower() == 'true'
+    with app.app_context():
+        inspector = inspect(db.engine)
+        new_database = not inspector.has_table('planners')
+        unversioned = not new_database and not inspector.has_table('alembic_version')
+        if unversioned:
+            logger.info(f"Stamping unversioned database at {PRE_MIGRATIONS_REVISION}")
+            stamp(directory=MIGRATIONS_DIRECTORY, revision=PRE_MIGRATIONS_REVISION)
+        # create_all() would add tables the pending migrations are about to create
+        if new_database or (initialize and not unversioned):
+            logger.info("Creating database tables")
+            db.create_all()
+        if new_database:
+            stamp(directory=MIGRATIONS_DIRECTORY)
+
+
+def migrate_schema(app) -> None:
+    """Create a new database, or apply pending migrations (flask db upgrade) to an existing one
+
+    Run once per deploy before gunicorn starts (start.sh, the Procfile's release
+    phase): tables and columns added since the last deploy exist only after this.
+    """
+    from flask_migrate import upgrade
+
+    ensure_schema(app)
+    with app.app_context():
+        upgrade(directory=MIGRATIONS_DIRECTORY)
+
+
+def warm_up(app, create_schema: bool = False) -> float:
+    """Build everything the first message would otherwise pay for; returns seconds taken"""
+    start = time.perf_counter()
+    with app.app_context():
+        if create_schema:
+            ensure_schema(app)
+
+        from sqlalchemy.orm import configure_mappers
+        configure_mappers()
+
+        from app.routes.sms import init_router
+        init_router()
+
+        # Region metadata is loaded on the first parse
+        import phonenumbers
+        phonenumbers.parse('2125550100', 'US')
+
+        if os.getenv('OPENAI_API_KEY'):
+            # AI calls import requests on first use
+            import requests  # noqa: F401
+
+        from app import db
+        # Connections opened above must not be shared with forked workers
+        db.engine.dispose()
+
+    app.extensions['warmed_up'] = True
+    elapsed = time.perf_counter() - start
+    logger.info(f"App warmed up in {elapsed * 1000:.0f}ms")
+    return elapsed
+
+
+if __name__ == '__main__':
+    # python -m app.startup: the deploy's migration step
+    from app import create_app
+    migrate_schema(create_app())
@@ -1,17 +1,12 @@
-from openai import OpenAI
 from flask import current_app
 import json
 import logging
+import threading
 from typing import Dict, List, Optional, Any
 
-logger = logging.getLogger(__name__)
+from app.services.metrics_service import span
 
-# Log OpenAI version for debugging
-try:
-    import openai
-    logger.info(f"OpenAI library version: {openai.__version__}")
-except Exception as e:
-    logger.error(f"Error checking OpenAI version: {e}")
+logger = logging.getLogger(__name__)
 
 
 class AIService:
@@ -19,9 +14,17 @@ class AIService:
     
     def __init__(self):
         self.client = None
+        # Serializes client creation when threads hit a cold service together
+        self._client_lock = threading.Lock()
     
     def _initialize_client(self):
-        """Initialize OpenAI client with configuration."""
+        """Initialize OpenAI client with configuration (once, even under concurrent calls)."""
+        with self._client_lock:
+            if self.client is None:
+                self._create_client()
+    
+    def _create_client(self):
+        """Create and smoke-test the OpenAI client; leaves self.client None on failure."""
         try:
             api_key = current_app.config.get('OPENAI_API_KEY')
             
@@ -40,8 +43,12 @@ class AIService:
             logger.info(f"API key length: {len(api_key)}")
             logger.info(f"API key prefix: {api_key[:10]}...")
             
+            # The SDK is imported on first use so importing this module stays cheap
+            import openai
+            logger.info(f"OpenAI library version: {openai.__version__}")
+            
             # Try to create client with ONLY api_key parameter to avoid conflicts
-            self.client = OpenAI(api_key=api_key)
+            self.client = openai.OpenAI(api_key=api_key)
             logger.info("OpenAI client created successfully")
             
             # Test the client with a simple request to verify it works
@@ -152,14 +159,15 @@ class AIService:
             if context:
                 user_prompt += f"\n\nAdditional context: {json.dumps(context)}"
             
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.3
-            )
+            with span('ai', site='ai.parse_event_input'):
+                response = self.client.chat.completions.create(
+                    model="gpt-3.5-turbo",
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    temperature=0.3
+                )
             
             result = json.loads(response.choices[0].message.content)
             logger.info(f"Event parsing successful: {result.get('confidence', 'unknown')} confidence")
@@ -220,14 +228,15 @@ class AIService:
             if context:
                 user_prompt += f"\n\nContext: {json.dumps(context)}"
             
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.3
-            )
+            with span('ai', site='ai.parse_availability'):
+                response = self.client.chat.completions.create(
+                    model="gpt-3.5-turbo",
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    temperature=0.3
+                )
             
             result = json.loads(response.choices[0].message.content)
             logger.info(f"Availability parsing successful: {result.get('confidence', 'unknown')} confidence")
@@ -294,13 +303,14 @@ Requirements:
             
             # Use GPT-3.5-turbo with very generous timeout for broad terms
             logger.info("Making OpenAI API request...")
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=400,
-                temperature=0.7,
-                timeout=30  # Very generous timeout - give OpenAI the best chance
-            )
+            with span('ai', site='ai.suggest_venues'):
+                response = self.client.chat.completions.create(
+                    model="gpt-3.5-turbo",
+                    messages=[{"role": "user", "content": prompt}],
+                    max_tokens=400,
+                    temperature=0.7,
+                    timeout=30  # Very generous timeout - give OpenAI the best chance
+                )
             
             content = response.choices[0].message.content.strip()
             logger.info(f"OpenAI response received successfully: {len(content)} characters")
@@ -507,14 +517,15 @@ Requirements:
             locations_text = ", ".join(guest_locations)
             user_prompt = f"Find central location for guests from: {locations_text}"
             
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.5
-            )
+            with span('ai', site='ai.suggest_central_location'):
+                response = self.client.chat.completions.create(
+                    model="gpt-3.5-turbo",
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    temperature=0.5
+                )
             
             result = json.loads(response.choices[0].message.content)
             logger.info(f"Central location suggestions generated for {len(guest_locations)} locations")
@@ -644,13 +655,16 @@ Requirements:
 
 # Global AI service instance (initialized lazily)
 _ai_service = None
+_ai_service_lock = threading.Lock()
 
 
 def get_ai_service():
     """Get or create AI service instance."""
     global _ai_service
     if _ai_service is None:
-        _ai_service = AIService()
+        with _ai_service_lock:
+            if _ai_service is None:
+                _ai_service = AIService()
     return _ai_service
 
 
@@ -895,14 +909,15 @@ def parse_dates_from_text(text: str) -> Dict[str, Any]:
         DOUBLE-CHECK your day-of-week calculations against the reference points above.
         """
         
-        response = ai_service.client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"Parse these dates: {text}"}
-            ],
-            temperature=0.3
-        )
+        with span('ai', site='ai.parse_dates_from_text'):
+            response = ai_service.client.chat.completions.create(
+                model="gpt-3.5-turbo",
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": f"Parse these dates: {text}"}
+                ],
+                temperature=0.3
+            )
         
         result = json.loads(response.choices[0].message.content)
         logger.info(f"Date parsing successful: {result.get('confidence', 'unknown')} confidence")
@@ -1,6 +1,50 @@
 import re
 import phonenumbers
-from phonenumbers import geocoder, carrier
+
+
+# Common phone number patterns
+PHONE_PATTERNS = [
+    r'\b\d{3}-\d{3}-\d{4}\b',  # 123-456-7890
+    r'\b\(\d{3}\)\s*\d{3}-\d{4}\b',  # (123) 456-7890
+    r'\b\d{3}\.\d{3}\.\d{4}\b',  # 123.456.7890
+    r'\b\d{10}\b',  # 1234567890
+    r'\b1\s*\d{3}\s*\d{3}\s*\d{4}\b',  # 1 123 456 7890
+    r'\+1\s*\d{3}\s*\d{3}\s*\d{4}\b',  # +1 123 456 7890
+]
+
+# Separators and joiners trimmed from around guest names
+NAME_EDGE_PATTERN = re.compile(r'^[\W_]+|[\W_]+$')
+NAME_JOINER_PATTERN = re.compile(r'^(?:and|&|plus)\s+|\s+(?:and|&|plus)$', re.IGNORECASE)
+NAME_LIST_MARKER_PATTERN = re.compile(r'^\d+[.)]\s*')
+
+
+def to_e164(phone, region="US"):
+    """
+    Format a phone number as E.164 (+15551234567) using phonenumbers.
+    
+    Numbers without a '+' are read as `region` numbers; digit strings too
+    long for that are read as already carrying their country code (the
+    form normalize_phone returns), so international numbers keep theirs.
+    
+    Args:
+        phone (str): Phone number with potential formatting
+        region (str): Region for numbers without a country code
+        
+    Returns:
+        str: E.164 number, or "" when it can't be a phone number
+    """
+    if not phone:
+        return ""
+    
+    text = str(phone).strip()
+    for candidate in (text, '+' + re.sub(r'[^\d]', '', text)):
+        try:
+            parsed = phonenumbers.parse(candidate, region)
+        except phonenumbers.NumberParseException:
+            continue
+        if phonenumbers.is_possible_number(parsed):
+            return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
+    return ""
 
 
 def normalize_phone(phone):
@@ -11,16 +55,21 @@ def normalize_phone(phone):
         phone (str): Phone number with potential formatting
         
     Returns:
-        str: Normalized phone number with only digits
+        str: Normalized phone number with only digits, including the
+        country code when it parses as a valid phone number
     """
     if not phone:
         return ""
     
-    # Remove all non-digit characters
+    e164 = to_e164(phone)
+    if e164 and phonenumbers.is_valid_number(phonenumbers.parse(e164)):
+        return e164[1:]
+    
+    # Not a valid number - remove all non-digit characters
     normalized = re.sub(r'[^\d]', '', str(phone))
     
     # Handle US numbers - add country code if missing
-    if len(normalized) == 10:
+    if len(normalized) == 10 and not str(phone).strip().startswith('+'):
         normalized = '1' + normalized
     
     return normalized
@@ -39,16 +88,12 @@ def format_phone_display(phone):
     if not phone:
         return ""
     
-    # First normalize to remove any existing formatting
+    # First normalize to remove any existing formatting (US numbers gain their country code)
     clean = normalize_phone(phone)
     
-    # Handle different lengths
     if len(clean) == 11 and clean.startswith('1'):
         # US number with country code
         clean = clean[1:]  # Remove country code for display
-    elif len(clean) == 10:
-        # US number without country code
-        pass
     else:
         # International or invalid number - return as-is
         return phone
@@ -70,19 +115,7 @@ def format_phone_for_twilio(phone):
     Returns:
         str: Phone number formatted for Twilio
     """
-    normalized = normalize_phone(phone)
-    
-    if not normalized:
-        return ""
-    
-    # Ensure US country code
-    if len(normalized) == 10:
-        normalized = '1' + normalized
-    elif len(normalized) == 11 and not normalized.startswith('1'):
-        # International number - keep as-is
-        pass
-    
-    return '+' + normalized
+    return to_e164(phone)
 
 
 def validate_phone_number(phone):
@@ -95,6 +128,9 @@ def validate_phone_number(phone):
     Returns:
         dict: Validation result with is_valid, country, carrier info
     """
+    # Loaded here: the geocoder and carrier data add ~0.6s to app import
+    from phonenumbers import geocoder, carrier
+    
     try:
         # Parse the number (assume US if no country code)
         parsed = phonenumbers.parse(phone, "US")
@@ -131,18 +167,8 @@ def extract_phone_numbers_from_text(text):
     if not text:
         return []
     
-    # Common phone number patterns
-    patterns = [
-        r'\b\d{3}-\d{3}-\d{4}\b',  # 123-456-7890
-        r'\b\(\d{3}\)\s*\d{3}-\d{4}\b',  # (123) 456-7890
-        r'\b\d{3}\.\d{3}\.\d{4}\b',  # 123.456.7890
-        r'\b\d{10}\b',  # 1234567890
-        r'\b1\s*\d{3}\s*\d{3}\s*\d{4}\b',  # 1 123 456 7890
-        r'\+1\s*\d{3}\s*\d{3}\s*\d{4}\b',  # +1 123 456 7890
-    ]
-    
     found_numbers = []
-    for pattern in patterns:
+    for pattern in PHONE_PATTERNS:
         matches = re.findall(pattern, text)
         found_numbers.extend(matches)
     
@@ -154,3 +180,89 @@ def extract_phone_numbers_from_text(text):
             normalized_numbers.append(normalized)
     
     return normalized_numbers
+
+
+def _find_phone_spans(text):
+    """
+    Locate phone numbers in text as (start, end, phone) tuples.
+    
+    phonenumbers.PhoneNumberMatcher handles most formats; the regex patterns
+    above are used when it finds nothing.
+    """
+    spans = []
+    for match in phonenumbers.PhoneNumberMatcher(text, "US", leniency=phonenumbers.Leniency.POSSIBLE):
+        number = match.number
+        if number.country_code == 1:
+            # US numbers need an area code; "555-1234" is not a guest's phone
+            phone = str(number.national_number)
+            if len(phone) < 10:
+                continue
+        else:
+            # Written with +country code, which the planner only does on purpose
+            phone = phonenumbers.format_number(number, phonenumbers.PhoneNumberFormat.E164)
+        spans.append((match.start, match.end, phone))
+    
+    if not spans:
+        for pattern in PHONE_PATTERNS:
+            for match in re.finditer(pattern, text):
+                if not any(start < match.end() and match.start() < end for start, end, _ in spans):
+                    digits = normalize_phone(match.group())
+                    spans.append((match.start(), match.end(), digits[1:] if len(digits) == 11 else digits))
+        spans.sort()
+    
+    return spans
+
+
+def _clean_guest_name(segment):
+    name = re.sub(r'\s+', ' ', segment)
+    previous = None
+    while name != previous:
+        previous = name
+        name = NAME_LIST_MARKER_PATTERN.sub('', name)
+        name = NAME_EDGE_PATTERN.sub('', name)
+        name = NAME_JOINER_PATTERN.sub('', name).strip()
+    return name
+
+
+def extract_guests_from_text(text):
+    """
+    Deterministically extract guests from "Name, phone" style text.
+    
+    Handles "John 5105935336", "Aaron(9145606464)", "Mary Smith, 111-555-1234",
+    "555-123-4567 John Smith" and several guests per message
+    ("John 555-123-4567 and Mary (555) 987-6543", one per line, ...).
+    
+    Args:
+        text (str): Planner message
+        
+    Returns:
+        list: [{'name': ..., 'phone': ...}] or an empty list when the text
+        can't be split unambiguously (no phones, or a phone without a name)
+    """
+    if not text:
+        return []
+    
+    spans = _find_phone_spans(text)
+    if not spans:
+        return []
+    
+    # Text around the phones: segments[i] precedes phone i, segments[-1] trails the last one
+    segments = []
+    position = 0
+    for start, end, _ in spans:
+        segments.append(text[position:start])
+        position = end
+    segments.append(text[position:])
+    names = [_clean_guest_name(segment) for segment in segments]
+    
+    # Name-first ("John 555...") or phone-first ("555... John"), never both
+    if names[0] and names[-1]:
+        return []
+    names = names[:-1] if names[0] else names[1:]
+    
+    guests = []
+    for name, (_, _, phone) in zip(names, spans):
+        if not name or not re.search(r'[A-Za-z]', name):
+            return []
+        guests.append({'name': name, 'phone': phone})
+    return guests
@@ -2,6 +2,7 @@ from twilio.rest import Client
 from twilio.twiml.messaging_response import MessagingResponse
 from flask import current_app
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -144,13 +145,16 @@ class SMSService:
 
 # Global SMS service instance (initialized lazily)
 _sms_service = None
+_sms_service_lock = threading.Lock()
 
 
 def get_sms_service():
     """Get or create SMS service instance."""
     global _sms_service
     if _sms_service is None:
-        _sms_service = SMSService()
+        with _sms_service_lock:
+            if _sms_service is None:
+                _sms_service = SMSService()
     return _sms_service
 
 
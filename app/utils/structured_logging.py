@@ -0,0 +1,277 @@
+"""
+Structured, asynchronous logging
+
+Handlers used to write AI prompts, raw AI responses and parsed payloads to
+stdout at INFO on every message, synchronously on the request thread. With
+configure_logging() the root logger instead gets a QueueHandler: the request
+thread only filters the record and merges its arguments, and a
+QueueListener thread formats and writes it.
+
+- Records are JSON lines carrying the request id of the inbound SMS (the
+  Twilio MessageSid) and the workflow stage and handler from the metrics
+  service, so one conversation turn can be followed across loggers.
+- Records logged with extra=log_category('ai_payload') and similar are
+  sampled per request at the LOG_SAMPLE_RATES rate for their category: a
+  sampled request keeps its whole payload trail, the rest keep none.
+- Long string arguments are truncated to LOG_MAX_MESSAGE_LENGTH before the
+  message is built.
+- When the queue is full records are dropped and counted rather than
+  blocking the request.
+- The listener thread belongs to one process. A forked child (a gunicorn
+  worker under preload_app) gets a fresh queue and its own listener; the
+  parent's listener is stopped around the fork so its queue is drained
+  and unlocked.
+
+Use %-style arguments for payload logs so nothing is formatted for records
+that are sampled out.
+"""
+
+from collections.abc import Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import uuid
+import zlib
+
+# Defaults when the app config does not set them
+DEFAULT_SAMPLE_RATES = {'ai_payload': 0.05, 'parse_result': 0.1, 'sms_payload': 0.1}
+DEFAULT_MAX_MESSAGE_LENGTH = 1000
+DEFAULT_QUEUE_SIZE = 10000
+
+_request_id: ContextVar[Optional[str]] = ContextVar('log_request_id', default=None)
+
+# The listener started by configure_logging, so repeated create_app() calls reuse it
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+_targets: list = []
+
+
+def log_category(name: str) -> Dict[str, str]:
+    """extra= for a sampled record, e.g. logger.info("AI response: %s", text, extra=log_category('ai_payload'))"""
+    return {'category': name}
+
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+@contextmanager
+def log_context(request_id: Optional[str] = None):
+    """Tag every record logged in this block with a request id"""
+    token = _request_id.set(request_id or new_request_id())
+    try:
+        yield _request_id.get()
+    finally:
+        _request_id.reset(token)
+
+
+def current_request_id() -> Optional[str]:
+    return _request_id.get()
+
+
+def parse_sample_rates(value) -> Dict[str, float]:
+    """'ai_payload=0.05,sms_payload=1' -> {'ai_payload': 0.05, 'sms_payload': 1.0}"""
+    if isinstance(value, dict):
+        return {name: float(rate) for name, rate in value.items()}
+    rates = {}
+    for part in (value or '').split(','):
+        if '=' in part:
+            name, rate = part.split('=', 1)
+            rates[name.strip()] = float(rate)
+    return rates
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a fraction of categorized records, deciding once per request and category"""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        category = getattr(record, 'category', None)
+        if category is None or record.levelno >= logging.WARNING:
+            return True
+        rate = self.rates.get(category, 1.0)
+        if rate >= 1:
+            return True
+        request_id = _request_id.get()
+        if request_id is None:
+            return random.random() < rate
+        return zlib.crc32(f'{request_id}:{category}'.encode()) / 2 ** 32 < rate
+
+
+class RequestContextFilter(logging.Filter):
+    """Copies the request id, stage and handler onto the record while still on the request thread"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        from app.services.metrics_service import current_request
+
+        record.request_id = _request_id.get()
+        timings = current_request()
+        if timings is not None:
+            record.workflow_stage = timings.labels.get('workflow_stage')
+            record.handler = timings.labels.get('handler')
+        return True
+
+
+class TruncatingFilter(logging.Filter):
+    """Shortens long string, dict and list arguments (and long plain messages) before they are merged
+
+    Other arguments are left alone so %d and %f placeholders still format.
+    """
+
+    def __init__(self, max_length: int):
+        super().__init__()
+        self.max_length = max_length
+
+    def _truncate(self, value):
+        if isinstance(value, (dict, list, tuple)):
+            # Payload records often pass parsed dicts; render those here so they can be cut too
+            rendered = str(value)
+            return self._truncate(rendered) if len(rendered) > self.max_length else value
+        if isinstance(value, str) and len(value) > self.max_length:
+            return f'{value[:self.max_length]}... [{len(value) - self.max_length} more chars]'
+        return value
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if isinstance(record.args, Mapping):
+            # logger.info("...: %s", some_dict) stores the dict itself as record.args
+            if '%(' in str(record.msg):
+                record.args = {key: self._truncate(value) for key, value in record.args.items()}
+            else:
+                record.args = (self._truncate(dict(record.args)),)
+        elif isinstance(record.args, tuple) and record.args:
+            record.args = tuple(self._truncate(arg) for arg in record.args)
+        elif isinstance(record.msg, str):
+            record.msg = self._truncate(record.msg)
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line"""
+
+    CONTEXT_FIELDS = ('request_id', 'workflow_stage', 'handler', 'category')
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for field in self.CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of raising when the queue is full"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def build_queue_handler(log_queue, sample_rates: Dict[str, float], max_message_length: int) -> QueueHandler:
+    handler = DroppingQueueHandler(log_queue)
+    handler.addFilter(SamplingFilter(sample_rates))
+    handler.addFilter(RequestContextFilter())
+    handler.addFilter(TruncatingFilter(max_message_length))
+    return handler
+
+
+def configure_logging(app) -> Optional[QueueListener]:
+    """Route the root logger through a background queue writer
+
+    Handlers a script already installed (e.g. with logging.basicConfig) keep
+    their format and move behind the queue; otherwise records go to stdout as
+    JSON, or as text with LOG_FORMAT=text.
+    """
+    global _queue_handler, _targets
+    if _queue_handler is not None:
+        return _listener
+
+    config = app.config
+    root = logging.getLogger()
+    targets = list(root.handlers)
+    if not targets:
+        stream_handler = logging.StreamHandler(sys.stdout)
+        if config.get('LOG_FORMAT', 'json') == 'json':
+            stream_handler.setFormatter(JsonFormatter())
+        else:
+            stream_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+        targets = [stream_handler]
+
+    log_queue = queue.Queue(maxsize=int(config.get('LOG_QUEUE_SIZE', DEFAULT_QUEUE_SIZE)))
+    queue_handler = build_queue_handler(
+        log_queue,
+        sample_rates={**DEFAULT_SAMPLE_RATES, **parse_sample_rates(config.get('LOG_SAMPLE_RATES'))},
+        max_message_length=int(config.get('LOG_MAX_MESSAGE_LENGTH', DEFAULT_MAX_MESSAGE_LENGTH)),
+    )
+
+    root.handlers = [queue_handler]
+    root.setLevel(config.get('LOG_LEVEL', 'INFO'))
+
+    _queue_handler = queue_handler
+    _targets = targets
+    _start_listener()
+    # Flush what is still queued on shutdown
+    atexit.register(stop_listener)
+    return _listener
+
+
+def _start_listener() -> None:
+    global _listener
+    _listener = QueueListener(_queue_handler.queue, *_targets, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_listener() -> None:
+    """Write out everything queued and stop this process's listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _before_fork() -> None:
+    stop_listener()
+
+
+def _after_fork_in_parent() -> None:
+    if _queue_handler is not None and _listener is None:
+        _start_listener()
+
+
+def _after_fork_in_child() -> None:
+    global _listener
+    if _queue_handler is None:
+        return
+    # The parent's thread does not exist here; give the child its own queue and listener
+    _listener = None
+    _queue_handler.queue = queue.Queue(maxsize=_queue_handler.queue.maxsize)
+    _start_listener()
+
+
+os.register_at_fork(before=_before_fork, after_in_parent=_after_fork_in_parent,
+                    after_in_child=_after_fork_in_child)
@@ -3,7 +3,6 @@ New AI-powered venue suggestion system for the event planner.
 Clean, simple, and reliable implementation.
 """
 
-from openai import OpenAI
 from flask import current_app
 import json
 import logging
@@ -82,7 +81,8 @@ def try_ai_venue_suggestions(activity: str, location: str, requirements: Optiona
             logger.error("No OpenAI API key found")
             return {'success': False, 'error': 'No API key'}
         
-        # Create client
+        # Create client (SDK imported on first use)
+        from openai import OpenAI
         client = OpenAI(api_key=api_key)
         
         # Create simple, clear prompt
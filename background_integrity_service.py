@@ -9,6 +9,7 @@ Usage:
 - Run once: python background_integrity_service.py
 - Run as cron job: */15 * * * * cd /path/to/app && python background_integrity_service.py
 - Run as daemon: Use supervisor or similar process manager
+- Scheduled with the other maintenance jobs: python background_scheduler.py
 """
 
 import os
@@ -34,16 +35,21 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def run_integrity_maintenance():
-    """Run a single integrity check and maintenance cycle"""
+def run_integrity_maintenance(full=False):
+    """Run a single integrity check and maintenance cycle
+    
+    Checks are incremental from the last run's high-water mark unless `full` is set.
+    Expired guest states are swept too, but TTL expiry is routine, so the sweep is
+    logged on its own and never counted among the issues fixed.
+    """
     try:
         app = create_app()
         
         with app.app_context():
-            logger.info("Starting data integrity maintenance cycle")
+            logger.info(f"Starting {'full' if full else 'incremental'} data integrity maintenance cycle")
             
             integrity_service = DataIntegrityService()
-            results = integrity_service.check_and_fix_all_issues()
+            results = integrity_service.check_and_fix_all_issues(full=full)
             
             total_fixed = sum(results.values())
             
@@ -52,6 +58,9 @@ def run_integrity_maintenance():
             else:
                 logger.info("No data integrity issues found - database is clean")
             
+            swept = integrity_service.sweep_expired_guest_states()
+            logger.info(f"Swept {swept} expired guest states")
+            
             return results
             
     except Exception as e:
@@ -82,6 +91,8 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Background Data Integrity Maintenance")
     parser.add_argument("--continuous", action="store_true", 
                        help="Run continuously (default: run once)")
+    parser.add_argument("--full", action="store_true",
+                       help="Check every row instead of only rows changed since the last run")
     parser.add_argument("--interval", type=int, default=15,
                        help="Minutes between checks in continuous mode (default: 15)")
     
@@ -90,7 +101,7 @@ if __name__ == "__main__":
     if args.continuous:
         run_continuous_maintenance(args.interval)
     else:
-        results = run_integrity_maintenance()
+        results = run_integrity_maintenance(full=args.full)
         total_fixed = sum(results.values())
         print(f"Integrity check complete. Fixed {total_fixed} issues.")
         sys.exit(0 if total_fixed == 0 else 1)
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Background Event Retention Service
+
+Archives cancelled/finalized events older than EVENT_RETENTION_DAYS and any
+other event idle longer than EVENT_IDLE_RETENTION_DAYS, with their guests,
+availability, proposed dates and guest states, into archived_events.
+
+Usage:
+- Run once: python background_retention_service.py
+- Run as cron job: 0 3 * * * cd /path/to/app && python background_retention_service.py
+- Restore an event: python background_retention_service.py --restore 123
+"""
+
+import os
+import sys
+import logging
+
+# Add app directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app
+from app.services.event_retention_service import EventRetentionService
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [RETENTION] %(levelname)s: %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def run_retention(batch_size=None):
+    """Archive every expired event; returns the number archived"""
+    app = create_app()
+    
+    with app.app_context():
+        service = EventRetentionService(batch_size=batch_size)
+        logger.info(f"Archiving finished events older than {service.retention_days} days "
+                    f"and idle events older than {service.idle_retention_days} days")
+        return service.archive_expired_events()
+
+def restore_event(event_id):
+    """Restore one archived event into the hot tables"""
+    app = create_app()
+    
+    with app.app_context():
+        event = EventRetentionService().restore_event(event_id)
+        logger.info(f"Restored event {event.id} ({event.status})")
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Background Event Retention")
+    parser.add_argument("--restore", type=int, metavar="EVENT_ID",
+                       help="Restore an archived event instead of archiving")
+    parser.add_argument("--batch-size", type=int, default=None,
+                       help="Events archived per transaction (default: 200)")
+    
+    args = parser.parse_args()
+    
+    if args.restore:
+        restore_event(args.restore)
+    else:
+        archived = run_retention(args.batch_size)
+        print(f"Retention complete. Archived {archived} events.")
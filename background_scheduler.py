@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Background Job Scheduler
+
+Runs every maintenance job (integrity checks, guest state expiry, event
+retention, job history cleanup) from one long-lived process instead of a
+cron entry per script, each of which cold-started Flask. Cache warming
+runs in the web workers, which serve the SMS the caches are for.
+Exclusive jobs take a lease in job_leases, so running this alongside web
+workers with JOB_SCHEDULER_ENABLED=true still runs each job once.
+
+Usage:
+- Run as worker: python background_scheduler.py
+- List jobs and their last runs: python background_scheduler.py --list
+- Run one job now: python background_scheduler.py --run integrity_check
+"""
+
+import os
+import sys
+import logging
+
+# Add app directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app
+from app.models import JobLease, JobRun
+from app.services.job_scheduler_service import JobScheduler, register_default_jobs
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [SCHEDULER] %(levelname)s: %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def list_jobs(app, scheduler):
+    """Print each job's schedule, next shared run and most recent run"""
+    with app.app_context():
+        for job in scheduler.jobs.values():
+            lease = JobLease.query.filter_by(name=job.name).first()
+            last_run = JobRun.query.filter_by(name=job.name).order_by(JobRun.started_at.desc()).first()
+            next_run = lease.next_run_at if lease else None
+            last = f"{last_run.status} in {last_run.duration_ms:.0f}ms at {last_run.started_at}" if last_run else "never run"
+            print(f"{job.name:20} {job.schedule!r:40} next: {next_run or 'on start'}  last: {last}")
+
+def run_job(app, scheduler, name):
+    """Run one job immediately, due or not (still under its lease)"""
+    with app.app_context():
+        run = scheduler.run_job(name, force=True)
+        if run is None:
+            print(f"{name} is running in another process")
+            return 1
+        print(f"{name} {run.status} in {run.duration_ms:.0f}ms: {run.error or run.result}")
+        return 0 if run.status == 'success' else 1
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Background Job Scheduler")
+    parser.add_argument("--list", action="store_true",
+                       help="List registered jobs and their last runs")
+    parser.add_argument("--run", metavar="JOB",
+                       help="Run one job now instead of scheduling")
+    
+    args = parser.parse_args()
+    
+    app = create_app()
+    scheduler = register_default_jobs(JobScheduler(app))
+    
+    if args.list:
+        list_jobs(app, scheduler)
+    elif args.run:
+        if args.run not in scheduler.jobs:
+            parser.error(f"unknown job {args.run}; choose from {', '.join(scheduler.jobs)}")
+        sys.exit(run_job(app, scheduler, args.run))
+    else:
+        try:
+            scheduler.run_forever()
+        except KeyboardInterrupt:
+            logger.info("Scheduler stopped by user")
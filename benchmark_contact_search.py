@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark for contact name search
+
+Builds a ContactNameIndex over synthetic contacts and times lookups for
+prefix ("jess", "mike r") and typo ("jessika") queries. Lookups should stay
+well under a millisecond at 5,000 contacts.
+
+Usage: python benchmark_contact_search.py [contact_count]
+"""
+
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.contact_menu_service import ContactMenuEntry
+from app.services.contact_search_service import ContactNameIndex
+
+FIRST_NAMES = ['Jess', 'Jessica', 'Mike', 'Michael', 'Sarah', 'Tom', 'Anna', 'David', 'Maria', 'Chris',
+               'Katie', 'Ben', 'Laura', 'Sam', 'Olivia', 'Noah', 'Emma', 'Liam', 'Ava', 'Lucas']
+LAST_NAMES = ['Rogers', 'Allen', 'Brown', 'Smith', 'Garcia', 'Nguyen', 'Patel', 'Kim', 'Lopez', 'Clark',
+              'Walker', 'Young', 'King', 'Wright', 'Scott', 'Green', 'Baker', 'Adams', 'Nelson', 'Hill']
+# Syllables for generated surnames, so the token vocabulary grows with the contact list
+SYLLABLES = ['ar', 'ber', 'cal', 'den', 'fer', 'gan', 'hol', 'ins', 'jor', 'kel',
+             'lan', 'mor', 'nis', 'os', 'per', 'quin', 'ros', 'sten', 'tor', 'vik']
+QUERIES = ['jess', 'mike r', 'sarah smi', 'jessika', 'micheal', 'tom', 'xavier', 'olivia hill']
+
+
+def build_entries(contact_count, seed=7):
+    """Synthetic contact menu entries, sorted by name like the real menu"""
+    rng = random.Random(seed)
+    entries = []
+    for i in range(contact_count):
+        if i < 400:
+            last_name = rng.choice(LAST_NAMES)
+        else:
+            last_name = ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).title()
+        name = f"{rng.choice(FIRST_NAMES)} {last_name}"
+        entries.append(ContactMenuEntry(i + 1, name, f"+1555{i:07d}"))
+    entries.sort(key=lambda entry: (entry.name, entry.id))
+    return entries
+
+
+def time_lookups(index, queries=QUERIES, rounds=200):
+    """Median and worst per-lookup time in milliseconds"""
+    timings = []
+    for _ in range(rounds):
+        for query in queries:
+            start = time.perf_counter()
+            index.search(query)
+            timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), max(timings)
+
+
+def main():
+    contact_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    entries = build_entries(contact_count)
+
+    start = time.perf_counter()
+    index = ContactNameIndex(entries)
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"🧪 Contact search over {contact_count} contacts")
+    print(f"  Index build: {build_ms:.1f}ms")
+
+    for query in QUERIES:
+        median_ms, worst_ms = time_lookups(index, [query])
+        print(f"  {query!r:14} median {median_ms:.3f}ms  worst {worst_ms:.3f}ms  "
+              f"({len(index.search(query))} match(es))")
+
+    median_ms, worst_ms = time_lookups(index)
+    print(f"  Overall: median {median_ms:.3f}ms, worst {worst_ms:.3f}ms")
+
+
+if __name__ == '__main__':
+    main()
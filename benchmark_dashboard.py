@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the admin dashboard pages
+
+Seeds a throwaway SQLite database with planners, contacts, events and guests
+(100,000 events by default) and times each dashboard page along with the
+number of SQL statements it runs. Page time should stay flat as the event
+count grows because every view is built from GROUP BY/COUNT queries and
+paginated rows.
+
+Usage: python benchmark_dashboard.py [event_count]
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import event as sa_event
+
+from app import create_app, db
+from app.config import TestingConfig
+from app.models import Planner, Event, Guest, Contact
+
+PAGES = ['/dashboard/', '/dashboard/events', '/dashboard/planners', '/dashboard/contacts']
+STAGES = ['collecting_guests', 'collecting_dates', 'collecting_availability', 'final_confirmation']
+
+
+def seed(event_count, events_per_planner=20):
+    """Bulk insert rows with Core executemany so seeding 100k events takes seconds"""
+    planner_count = max(event_count // events_per_planner, 1)
+    now = datetime.utcnow()
+
+    db.session.execute(Planner.__table__.insert(), [
+        {'id': p + 1, 'phone_number': f'+1555{p:07d}', 'name': f'Planner {p}', 'contacts_version': 0,
+         'created_at': now - timedelta(minutes=p), 'updated_at': now}
+        for p in range(planner_count)
+    ])
+    db.session.execute(Contact.__table__.insert(), [
+        {'id': p + 1, 'planner_id': p + 1, 'name': f'Friend {p}', 'phone_number': f'+1556{p:07d}',
+         'created_at': now - timedelta(minutes=p), 'updated_at': now}
+        for p in range(planner_count)
+    ])
+    db.session.execute(Event.__table__.insert(), [
+        {'id': e + 1, 'planner_id': e % planner_count + 1, 'workflow_stage': STAGES[e % len(STAGES)],
+         'status': 'planning', 'guests_total': 1, 'created_at': now - timedelta(minutes=e), 'updated_at': now}
+        for e in range(event_count)
+    ])
+    db.session.execute(Guest.__table__.insert(), [
+        {'event_id': e + 1, 'contact_id': e % planner_count + 1, 'name': f'Friend {e % planner_count}',
+         'phone_number': f'+1556{e % planner_count:07d}', 'created_at': now, 'updated_at': now}
+        for e in range(event_count)
+    ])
+    db.session.commit()
+
+
+def time_page(client, url, rounds=5):
+    """Median page time in milliseconds and SQL statements per request"""
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    timings = []
+    sa_event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        for _ in range(rounds):
+            start = time.perf_counter()
+            response = client.get(url)
+            timings.append((time.perf_counter() - start) * 1000)
+            assert response.status_code == 200
+    finally:
+        sa_event.remove(db.engine, 'before_cursor_execute', listener)
+    return statistics.median(timings), len(statements) // rounds
+
+
+def main():
+    event_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    db_path = os.path.join(tempfile.mkdtemp(), 'dashboard_benchmark.db')
+
+    class BenchmarkConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{db_path}'
+
+    app = create_app(BenchmarkConfig)
+    with app.app_context():
+        db.create_all()
+        start = time.perf_counter()
+        seed(event_count)
+        print(f"🧪 Dashboard over {event_count} events (seeded in {time.perf_counter() - start:.1f}s)")
+
+        client = app.test_client()
+        for url in PAGES:
+            median_ms, statement_count = time_page(client, url)
+            print(f"  {url:22} median {median_ms:7.1f}ms  {statement_count} SQL statements")
+
+    os.remove(db_path)
+
+
+if __name__ == '__main__':
+    main()
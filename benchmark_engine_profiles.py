@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Engine Profile Benchmark
+
+Runs the conversation load generator (load_test_conversations.py) once per
+database engine profile (app/database.py), each against a fresh database,
+and prints throughput and latency side by side - 'none' is Flask-SQLAlchemy's
+defaults, so the table shows what a profile buys under concurrent load.
+
+Usage:
+- python benchmark_engine_profiles.py                          (SQLite: none vs sqlite)
+- python benchmark_engine_profiles.py --planners 40 --concurrency 16 --report profiles.json
+- python benchmark_engine_profiles.py --database-url postgresql://localhost/gatherly_bench --profiles none postgres
+  (the Postgres database is reused; pass an empty one, runs use separate phone numbers)
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from load_test_conversations import InProcessTarget, run_load_test
+
+
+def run_profile(profile, args, first_index):
+    database_url = args.database_url
+    tempdir = None
+    if database_url is None:
+        tempdir = tempfile.TemporaryDirectory()
+        database_url = f"sqlite:///{os.path.join(tempdir.name, f'{profile}.db')}"
+
+    target = InProcessTarget(database_url, args.ai_latency_ms, args.sms_latency_ms, profile)
+    config = {'profile': profile, 'planners': args.planners, 'guests': args.guests,
+              'concurrency': args.concurrency, 'ai_latency_ms': args.ai_latency_ms}
+    try:
+        return run_load_test(target, args.planners, args.guests, args.concurrency, config, first_index)
+    finally:
+        target.close()
+        if tempdir:
+            tempdir.cleanup()
+
+
+def print_comparison(reports):
+    print(f"\n{'profile':10} {'msgs':>6} {'err':>4} {'msg/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for profile, report in reports.items():
+        totals = report['totals']
+        print(f"{profile:10} {totals['messages']:6d} {totals['errors']:4d} {totals['throughput_msgs_per_s']:8.1f} "
+              f"{totals['p50_ms']:8.1f} {totals['p95_ms']:8.1f} {totals['p99_ms']:8.1f}")
+
+    baseline = reports.get('none')
+    if baseline and baseline['totals']['throughput_msgs_per_s']:
+        for profile, report in reports.items():
+            if profile != 'none':
+                ratio = report['totals']['throughput_msgs_per_s'] / baseline['totals']['throughput_msgs_per_s']
+                print(f"\n{profile}: {ratio:.2f}x the throughput of the defaults")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compare database engine profiles under the conversation load generator")
+    parser.add_argument("--profiles", nargs='+', help="Profiles to run (default: none and the URL's own profile)")
+    parser.add_argument("--database-url", help="Database to run against (default: a fresh SQLite file per profile)")
+    parser.add_argument("--planners", type=int, default=20, help="Conversations per profile (default: 20)")
+    parser.add_argument("--guests", type=int, default=3, help="Guests per planner (default: 3)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Conversations in flight (default: 8)")
+    parser.add_argument("--ai-latency-ms", type=float, default=0.0, help="Delay of the stub AI transport")
+    parser.add_argument("--sms-latency-ms", type=float, default=0.0, help="Delay of the stub SMS transport")
+    parser.add_argument("--report", help="Write the JSON reports to this path")
+
+    args = parser.parse_args()
+
+    profiles = args.profiles
+    if not profiles:
+        own = 'postgres' if (args.database_url or '').startswith(('postgres://', 'postgresql')) else 'sqlite'
+        profiles = ['none', own]
+
+    reports = {}
+    for run, profile in enumerate(profiles):
+        print(f"Running profile {profile}...")
+        # Separate phone numbers per run so a shared database never sees the same conversation twice
+        reports[profile] = run_profile(profile, args, first_index=run * args.planners)
+
+    print_comparison(reports)
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(reports, f, indent=2)
+        print(f"\nReports written to {args.report}")
+
+    sys.exit(0 if all(report['totals']['errors'] == 0 for report in reports.values()) else 1)
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the availability overlap and scheduling algorithms
+
+Times AvailabilityService._calculate_time_overlap and the app.utils.scheduling
+helpers (find_time_overlaps, find_overlapping_availability,
+find_time_slot_overlaps, merge_adjacent_overlaps, suggest_optimal_time_slots)
+over seeded synthetic availability. Scenarios vary the number of guests,
+dates, time windows per guest and the share of all-day answers, so the
+same inputs are produced on every run.
+
+Results can be saved as a baseline (benchmark_overlaps_baseline.json) and
+later runs compared against it: a case fails when its time per call grows
+by more than --threshold times the baseline. Timings are normalized by a
+fixed pure-Python calibration loop whose rounds alternate with each case's,
+so a baseline recorded on one machine stays meaningful on a faster or
+slower one.
+
+Noise: every time is the fastest of several rounds with the garbage
+collector off. A case can still run up to ~1.55x slower in one process
+than in another on an unchanged tree (measured on a shared single-vCPU
+container), so the baseline keeps each case's fastest time over 3
+processes, and a case over the threshold is re-timed in up to 2 fresh
+processes before it is reported. With that, four back-to-back runs on an
+unchanged tree peaked at 1.38x-1.46x, under the default 1.5x threshold.
+On a noisier host raise --threshold rather than trusting a single run.
+
+Usage:
+- python benchmark_overlaps.py                      compare against the baseline
+- python benchmark_overlaps.py --save-baseline      record a new baseline
+- python benchmark_overlaps.py --scenario large --algorithm calculate_time_overlap
+"""
+
+import gc
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from datetime import date, time as dt_time, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.availability_service import AvailabilityService
+from app.utils.scheduling import (
+    find_overlapping_availability, find_time_overlaps, find_time_slot_overlaps,
+    merge_adjacent_overlaps, suggest_optimal_time_slots,
+)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_overlaps_baseline.json')
+DEFAULT_THRESHOLD = 1.5
+# Timed rounds per case, each followed by a calibration round; the fastest of each counts
+ROUNDS = 7
+# Fresh-process re-measurements of a case over the threshold before it is reported
+REMEASURE_ATTEMPTS = 2
+# Processes a saved baseline takes its per-case minimum from (1 in-process + the rest in subprocesses)
+BASELINE_RUNS = 1 + REMEASURE_ATTEMPTS
+
+# name -> guests, dates, time windows per guest and date, share of all-day answers
+SCENARIOS = {
+    'small': {'guests': 4, 'dates': 2, 'windows': 1, 'all_day_share': 0.0},
+    'typical': {'guests': 8, 'dates': 3, 'windows': 1, 'all_day_share': 0.2},
+    'large': {'guests': 25, 'dates': 5, 'windows': 1, 'all_day_share': 0.1},
+    'dense': {'guests': 12, 'dates': 3, 'windows': 3, 'all_day_share': 0.0},
+    'all_day_mix': {'guests': 15, 'dates': 4, 'windows': 1, 'all_day_share': 0.5},
+}
+
+FIRST_DATE = date(2025, 8, 16)
+
+
+class SyntheticGuest:
+    """Stands in for Guest; hashable like a model instance"""
+
+    def __init__(self, guest_id, name):
+        self.id = guest_id
+        self.name = name
+
+
+class SyntheticAvailability:
+    """Stands in for an Availability row"""
+
+    def __init__(self, guest, day, start_time, end_time, all_day):
+        self.guest = guest
+        self.guest_id = guest.id
+        self.date = day
+        self.start_time = start_time
+        self.end_time = end_time
+        self.all_day = all_day
+        self.preference_level = 'available'
+
+
+def generate_availability(guests, dates, windows=1, all_day_share=0.0, seed=0):
+    """Seeded availability rows: windows start 8am-8pm on the half hour and last 1-6 hours"""
+    rng = random.Random(seed)
+    people = [SyntheticGuest(g + 1, f'Guest {g + 1}') for g in range(guests)]
+    rows = []
+    for d in range(dates):
+        day = FIRST_DATE + timedelta(days=7 * (d // 2) + d % 2)
+        for guest in people:
+            if rng.random() < all_day_share:
+                rows.append(SyntheticAvailability(guest, day, dt_time(8, 0), dt_time(23, 59), True))
+                continue
+            for _ in range(windows):
+                start = rng.randrange(16, 41)  # half hours from 8:00 to 20:00
+                end = min(start + rng.randrange(2, 13), 47)
+                rows.append(SyntheticAvailability(
+                    guest, day, dt_time(start // 2, 30 * (start % 2)), dt_time(end // 2, 30 * (end % 2)), False))
+    return rows
+
+
+def by_date(rows):
+    groups = {}
+    for row in rows:
+        groups.setdefault(row.date, []).append(row)
+    return list(groups.values())
+
+
+def guest_dicts(rows):
+    """The per-date input of AvailabilityService._calculate_time_overlap"""
+    return [{'guest_id': r.guest_id, 'guest_name': r.guest.name, 'start_time': r.start_time,
+             'end_time': r.end_time, 'all_day': r.all_day} for r in rows]
+
+
+def time_slots(rows):
+    """The input of find_time_slot_overlaps"""
+    return [{'start': r.start_time, 'end': r.end_time, 'guest': r.guest, 'preference': r.preference_level}
+            for r in rows if not r.all_day]
+
+
+def slot_overlaps(rows):
+    """Unmerged overlap periods, the input of merge_adjacent_overlaps"""
+    overlaps = []
+    for r in rows:
+        if r.all_day:
+            continue
+        hours = (r.end_time.hour * 60 + r.end_time.minute - r.start_time.hour * 60 - r.start_time.minute) / 60
+        overlaps.append({'start': r.start_time, 'end': r.end_time, 'guest_count': 2, 'duration_hours': hours,
+                         'confidence': 'medium', 'guests': [r.guest]})
+    return overlaps
+
+
+def build_cases(rows):
+    """Algorithm name -> zero-argument callable running it over every date of the scenario"""
+    service = AvailabilityService()
+    days = by_date(rows)
+    per_date_guests = [guest_dicts(day) for day in days]
+    per_date_timed = [[r for r in day if not r.all_day] for day in days]
+    per_date_slots = [time_slots(day) for day in days]
+    per_date_overlaps = [slot_overlaps(day) for day in days]
+    date_overlaps = find_overlapping_availability(rows)
+
+    return {
+        'calculate_time_overlap': lambda: [service._calculate_time_overlap(g) for g in per_date_guests],
+        'find_time_overlaps': lambda: [find_time_overlaps(t) for t in per_date_timed],
+        'find_overlapping_availability': lambda: find_overlapping_availability(rows),
+        'find_time_slot_overlaps': lambda: [find_time_slot_overlaps(s) for s in per_date_slots],
+        'merge_adjacent_overlaps': lambda: [merge_adjacent_overlaps(o) for o in per_date_overlaps],
+        'suggest_optimal_time_slots': lambda: suggest_optimal_time_slots(date_overlaps),
+    }
+
+
+ALGORITHMS = list(build_cases([]).keys())
+
+
+def _timed(func, number):
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    return time.perf_counter() - start
+
+
+def _calls_per_round(func, min_round_seconds):
+    number = 1
+    while _timed(func, number) < min_round_seconds and number < 1 << 16:
+        number *= 2
+    return number
+
+
+def time_call(func, rounds=ROUNDS, min_round_seconds=0.05, reference=None):
+    """Fastest round's seconds per call, calling often enough per round to be measurable
+
+    The minimum is the run least disturbed by the scheduler and other load;
+    slow rounds are noise, not a property of the code. The garbage collector
+    is off while timing, as in timeit, so a collection triggered by earlier
+    allocations is not charged to whichever case happens to be running.
+
+    With a reference function its rounds alternate with func's and
+    (func seconds, reference seconds) is returned, so both were measured at
+    the same machine speed.
+    """
+    funcs = [func] + ([reference] if reference else [])
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        numbers = [_calls_per_round(f, min_round_seconds) for f in funcs]
+        best = [float('inf')] * len(funcs)
+        for _ in range(rounds):
+            for i, (f, number) in enumerate(zip(funcs, numbers)):
+                best[i] = min(best[i], _timed(f, number) / number)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return tuple(best) if reference else best[0]
+
+
+def _calibration_workload():
+    """A fixed pure-Python workload, the unit timings are normalized by"""
+    total = 0
+    for i in range(20000):
+        total += i * i % 7
+    return sorted(str(i) for i in range(2000))
+
+
+def run_benchmarks(scenarios=None, algorithms=None, seed=0, cases=None):
+    """{'calibration_us': ..., 'results': {'scenario/algorithm': microseconds per call}}
+
+    Every case is timed against its own interleaved calibration rounds and
+    scaled to the run's fastest calibration, so the machine speeding up or
+    slowing down part-way through a run does not move individual cases.
+    `cases` limits the run to those 'scenario/algorithm' names.
+    """
+    wanted = [case.split('/') for case in cases] if cases else [
+        (name, algorithm) for name in scenarios or SCENARIOS for algorithm in algorithms or ALGORITHMS]
+    timings = {}
+    for name in dict.fromkeys(name for name, _ in wanted):
+        built = build_cases(generate_availability(seed=seed, **SCENARIOS[name]))
+        for algorithm in (a for n, a in wanted if n == name):
+            timings[f'{name}/{algorithm}'] = time_call(built[algorithm], reference=_calibration_workload)
+    calibration = min(local for _, local in timings.values())
+    results = {case: round(seconds * calibration / local * 1e6, 2) for case, (seconds, local) in timings.items()}
+    return {'seed': seed, 'calibration_us': round(calibration * 1e6, 2), 'results': results}
+
+
+def run_in_subprocess(cases, seed=0):
+    """run_benchmarks for these cases in a fresh interpreter
+
+    A case's speed also depends on the process it runs in (memory layout,
+    hash seed), which re-timing it in the same process cannot shake off.
+    """
+    code = ("import json, sys\n"
+            f"sys.path.insert(0, {os.path.dirname(os.path.abspath(__file__))!r})\n"
+            "from benchmark_overlaps import run_benchmarks\n"
+            f"print(json.dumps(run_benchmarks(cases={list(cases)!r}, seed={seed})))\n")
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def merge_runs(runs):
+    """Fastest time per case across runs, each converted to the fastest run's calibration"""
+    calibration = min(run['calibration_us'] for run in runs)
+    results = {}
+    for run in runs:
+        scale = calibration / run['calibration_us']
+        for case, us in run['results'].items():
+            results[case] = min(results.get(case, float('inf')), round(us * scale, 2))
+    return {'seed': runs[0]['seed'], 'calibration_us': calibration, 'results': results}
+
+
+def remeasure_regressions(current, baseline, threshold=DEFAULT_THRESHOLD, attempts=REMEASURE_ATTEMPTS):
+    """Time each case over the threshold again in a fresh process, keeping its fastest time
+
+    A real regression is slow every time, a noisy run is not. Returns the
+    merged run and its comparison rows.
+    """
+    rows = compare(current, baseline, threshold)
+    for _ in range(attempts):
+        regressed = [row[0] for row in rows if row[4]]
+        if not regressed:
+            break
+        current = merge_runs([current, run_in_subprocess(regressed, current['seed'])])
+        rows = compare(current, baseline, threshold)
+    return current, rows
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """(case, baseline us, current us, normalized ratio, regressed) for cases present in both runs"""
+    scale = baseline['calibration_us'] / current['calibration_us']
+    rows = []
+    for case, current_us in current['results'].items():
+        baseline_us = baseline['results'].get(case)
+        if not baseline_us:
+            continue
+        ratio = current_us * scale / baseline_us
+        rows.append((case, baseline_us, current_us, ratio, ratio > threshold))
+    return rows
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark overlap and scheduling algorithms")
+    parser.add_argument("--scenario", action='append', choices=list(SCENARIOS), help="Scenario to run (repeatable)")
+    parser.add_argument("--algorithm", action='append', choices=ALGORITHMS, help="Algorithm to run (repeatable)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic availability (default: 0)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--save-baseline", action='store_true', help="Write this run as the baseline")
+    parser.add_argument("--baseline-runs", type=int, default=BASELINE_RUNS,
+                        help=f"Processes a saved baseline takes each case's fastest time from (default: {BASELINE_RUNS})")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Fail when a case is this many times slower than the baseline (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--output", help="Also write this run's results as JSON")
+
+    args = parser.parse_args()
+
+    current = run_benchmarks(args.scenario, args.algorithm, args.seed)
+    print(f"🧪 Overlap benchmarks (seed {args.seed}, calibration {current['calibration_us']:.0f}us)")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+
+    if args.save_baseline:
+        # As fast a time per case as a re-measured comparison would reach
+        extra_runs = [run_in_subprocess(current['results'], args.seed) for _ in range(args.baseline_runs - 1)]
+        current = merge_runs([current] + extra_runs)
+        baseline = {'results': {}}
+        if os.path.exists(args.baseline) and (args.scenario or args.algorithm):
+            # Partial runs update only their own cases
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+            scale = baseline['calibration_us'] / current['calibration_us']
+            current['results'] = {**baseline['results'],
+                                  **{case: round(us * scale, 2) for case, us in current['results'].items()}}
+            current['calibration_us'] = baseline['calibration_us']
+        with open(args.baseline, 'w') as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+        for case, us in sorted(current['results'].items()):
+            print(f"  {case:48} {us:12.1f}us")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        for case, us in current['results'].items():
+            print(f"  {case:48} {us:12.1f}us")
+        print(f"No baseline at {args.baseline}; run with --save-baseline to record one")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get('seed', 0) != args.seed:
+        print(f"Baseline was recorded with seed {baseline.get('seed')}, not {args.seed}")
+        return 2
+
+    current, rows = remeasure_regressions(current, baseline, args.threshold)
+    print(f"  {'case':48} {'baseline':>12} {'current':>12} {'ratio':>7}")
+    for case, baseline_us, current_us, ratio, regressed in rows:
+        flag = '  ❌ REGRESSION' if regressed else ''
+        print(f"  {case:48} {baseline_us:10.1f}us {current_us:10.1f}us {ratio:6.2f}x{flag}")
+
+    regressions = [row for row in rows if row[4]]
+    if regressions:
+        print(f"\n{len(regressions)} case(s) slower than {args.threshold}x the baseline")
+        return 1
+    print(f"\nAll {len(rows)} cases within {args.threshold}x of the baseline")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -25,6 +25,63 @@ class Config:
     
     # App Configuration
     DEBUG = os.environ.get('FLASK_ENV') == 'development'
+    
+    # Planner notifications: guest responses within this window are sent as one digest
+    NOTIFICATION_DIGEST_WINDOW_SECONDS = int(os.environ.get('NOTIFICATION_DIGEST_WINDOW_SECONDS', 60))
+    
+    # Contacts shown per SMS in the numbered contact menu ('more' pages through the rest)
+    CONTACT_MENU_PAGE_SIZE = int(os.environ.get('CONTACT_MENU_PAGE_SIZE', 10))
+    
+    # Rows per page in the admin dashboard tables
+    DASHBOARD_PAGE_SIZE = int(os.environ.get('DASHBOARD_PAGE_SIZE', 50))
+    
+    # Bearer token for the read-only admin JSON API (open like the dashboard when unset)
+    ADMIN_API_TOKEN = os.environ.get('ADMIN_API_TOKEN')
+    
+    # Retention: cancelled/finalized events are archived after this many days, other events once idle this long
+    EVENT_RETENTION_DAYS = int(os.environ.get('EVENT_RETENTION_DAYS', 30))
+    EVENT_IDLE_RETENTION_DAYS = int(os.environ.get('EVENT_IDLE_RETENTION_DAYS', 90))
+    
+    # Guest conversations (availability/RSVP requests) expire after this many hours without activity
+    GUEST_STATE_TTL_HOURS = int(os.environ.get('GUEST_STATE_TTL_HOURS', 168))
+    
+    # Maintenance job scheduler: run it inside web workers too (a DB lease keeps each run to one process)
+    JOB_SCHEDULER_ENABLED = os.environ.get('JOB_SCHEDULER_ENABLED', 'false').lower() == 'true'
+    # Seconds a job may run before its lease lapses and another process can take over
+    JOB_LEASE_SECONDS = int(os.environ.get('JOB_LEASE_SECONDS', 1800))
+    # Days of job run history kept in job_runs
+    JOB_RUN_HISTORY_DAYS = int(os.environ.get('JOB_RUN_HISTORY_DAYS', 14))
+    
+    # Per-message latency breakdown (db/ai/sms/formatting) served at /metrics; optional bearer token for scrapes
+    PERFORMANCE_METRICS_ENABLED = os.environ.get('PERFORMANCE_METRICS_ENABLED', 'true').lower() == 'true'
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+    # Directory where gunicorn workers share their histograms (set by gunicorn.conf.py)
+    METRICS_MULTIPROC_DIR = os.environ.get('METRICS_MULTIPROC_DIR')
+    # A statement run this many times while handling one SMS is logged as a likely N+1 lazy load
+    N_PLUS_ONE_THRESHOLD = int(os.environ.get('N_PLUS_ONE_THRESHOLD', 5))
+    
+    # Sampling profiler: fraction of SMS requests profiled with cProfile (0 disables), kept newest-first in PROFILING_DIR
+    PROFILING_SAMPLE_RATE = float(os.environ.get('PROFILING_SAMPLE_RATE', 0))
+    PROFILING_DIR = os.environ.get('PROFILING_DIR', 'profiles')
+    PROFILING_MAX_FILES = int(os.environ.get('PROFILING_MAX_FILES', 500))
+    
+    # Structured logging: json or text; payload categories sampled per request, e.g. 'ai_payload=0.05,sms_payload=1'
+    LOG_FORMAT = os.environ.get('LOG_FORMAT', 'json')
+    LOG_SAMPLE_RATES = os.environ.get('LOG_SAMPLE_RATES', 'ai_payload=0.05,parse_result=0.1,sms_payload=0.1')
+    LOG_MAX_MESSAGE_LENGTH = int(os.environ.get('LOG_MAX_MESSAGE_LENGTH', 1000))
+    
+    # Database engine profile (app/database.py): auto picks postgres, sqlite or sqlite_memory from the URL; none keeps SQLAlchemy defaults
+    DATABASE_ENGINE_PROFILE = os.environ.get('DATABASE_ENGINE_PROFILE', 'auto')
+    # Postgres pool per worker process: one connection per gunicorn thread plus overflow for timer threads
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', os.environ.get('GUNICORN_THREADS', 8)))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 4))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 10))
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800))
+    # Postgres statement_timeout in ms (0 disables it, e.g. for a long migration)
+    DB_STATEMENT_TIMEOUT_MS = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', 30000))
+    # SQLite: how long a writer waits for the lock, and bytes of the file read through mmap
+    DB_BUSY_TIMEOUT_MS = int(os.environ.get('DB_BUSY_TIMEOUT_MS', 10000))
+    DB_SQLITE_MMAP_SIZE = int(os.environ.get('DB_SQLITE_MMAP_SIZE', 268435456))
 
 class DevelopmentConfig(Config):
     """Development configuration"""
@@ -38,6 +95,7 @@ class TestingConfig(Config):
     """Testing configuration"""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    NOTIFICATION_DIGEST_WINDOW_SECONDS = 0
 
 config = {
     'development': DevelopmentConfig,
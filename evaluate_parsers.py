@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Parser corpus harness
+
+Runs the labeled inputs in parser_corpus.json (guest availability, event
+dates, guest contacts and start times) through each parser tier and reports
+accuracy, coverage and per-input latency, so we can see which inputs the
+deterministic parsers already handle and which still depend on AI.
+
+Tiers:
+- regex: what the handler does without AI (extract_guests_from_text and
+  _regex_parse_guest, _simple_parse_availability behind the input check,
+  _simple_parse_dates, _simple_time_parse)
+- replayed_ai: the handler's AI path fed the response recorded in the corpus
+  entry ("ai_response"), so prompt-to-result handling is tested without
+  calling OpenAI; entries without a recording are reported as uncovered
+- pipeline: the handler's full parse method (deterministic first, AI, then
+  fallback) with the same recorded responses, i.e. what production returns
+- live_ai: the AI path against OpenAI (--live-ai, needs OPENAI_API_KEY);
+  --record stores the responses in the corpus for replay
+
+Each corpus entry has a kind, the input, the expected structured result
+(null when the input should be rejected), event_dates for availability, and
+optionally known_gaps: tiers known to miss the input today. The clock is
+frozen at the corpus "now" so weekday names resolve to the same dates on
+every run.
+
+Usage:
+- python evaluate_parsers.py
+- python evaluate_parsers.py --kind availability --tier regex --verbose
+- python evaluate_parsers.py --live-ai --record --report parsers.json
+"""
+
+import json
+import os
+import re
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'parser_corpus.json')
+
+KINDS = ('availability', 'dates', 'guests', 'time')
+TIERS = ('regex', 'replayed_ai', 'pipeline', 'live_ai')
+OUTCOMES = ('correct', 'correct_reject', 'wrong', 'rejected', 'false_accept', 'error', 'uncovered')
+
+# Modules whose parsers read the clock through their module-level datetime name
+CLOCK_MODULES = ('app.handlers.guest_availability_handler', 'app.handlers.date_collection_handler')
+
+
+def load_corpus(path=DEFAULT_CORPUS):
+    with open(path) as f:
+        return json.load(f)
+
+
+@contextmanager
+def frozen_clock(now):
+    """Make datetime.now() in the parser modules return `now`"""
+    import importlib
+
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return cls.fromtimestamp(now.timestamp(), tz) if tz else cls(*now.timetuple()[:6])
+
+    modules = [importlib.import_module(name) for name in CLOCK_MODULES]
+    originals = [module.datetime for module in modules]
+    for module in modules:
+        module.datetime = FrozenDatetime
+    try:
+        yield
+    finally:
+        for module, original in zip(modules, originals):
+            module.datetime = original
+
+
+class ReplayAIService:
+    """Answers make_completion with a fixed recorded response"""
+
+    def __init__(self):
+        from app.services.ai_processing_service import AIProcessingService
+        self._service = AIProcessingService()
+        self._service.api_key = 'replay'
+        self._service.make_completion = lambda prompt, max_tokens=200: self.response
+        self.response = None
+
+    def __getattr__(self, name):
+        return getattr(self._service, name)
+
+
+class Parsers:
+    """The handler parse entry points for each kind and tier"""
+
+    def __init__(self, live_ai=False):
+        from app.handlers.date_collection_handler import DateCollectionHandler
+        from app.handlers.guest_availability_handler import GuestAvailabilityHandler
+        from app.handlers.guest_collection_handler import GuestCollectionHandler
+        from app.services.ai_processing_service import AIProcessingService
+
+        self.replay = ReplayAIService()
+        self.live = AIProcessingService() if live_ai else None
+        # Last raw AI response seen by the live tier, for --record
+        self.last_live_response = None
+
+        def build(handler_class):
+            handler = handler_class(None, None, None, self.replay)
+            # Some handlers create their own AI client in __init__
+            handler.ai_service = self.replay
+            return handler
+
+        self.availability = build(GuestAvailabilityHandler)
+        self.dates = build(DateCollectionHandler)
+        self.guests = build(GuestCollectionHandler)
+
+    def regex(self, kind, text, context):
+        if kind == 'availability':
+            if not self.availability._is_valid_availability_input(text, context):
+                return {'success': False}
+            return self.availability._simple_parse_availability(text, context)
+        if kind == 'dates':
+            return self.dates._simple_parse_dates(text)
+        if kind == 'guests':
+            from app.utils.phone import extract_guests_from_text
+            guests = extract_guests_from_text(text)
+            return {'success': True, 'guests': guests} if guests else self.guests._regex_parse_guest(text)
+        return self.replay._simple_time_parse(text)
+
+    def ai(self, kind, text, context):
+        if kind == 'availability':
+            return self.availability._ai_parse_availability(text, context)
+        if kind == 'dates':
+            return self.dates._ai_parse_dates(text)
+        if kind == 'guests':
+            return self.guests._ai_parse_guest(text)
+        return self.replay.parse_time_input(text)
+
+    def pipeline(self, kind, text, context):
+        if kind == 'availability':
+            return self.availability._parse_availability_input(text, context)
+        if kind == 'dates':
+            return self.dates._parse_date_input(text)
+        if kind == 'guests':
+            return self.guests._parse_guest_input(text)
+        return self.replay.parse_time_input(text)
+
+    def run(self, tier, kind, text, context, recorded):
+        """Parser result for one input, or None when the tier has nothing to run"""
+        if tier == 'regex':
+            return self.regex(kind, text, context)
+        if tier == 'live_ai':
+            if self.live is None:
+                return None
+            responses = []
+            original = self.live.make_completion
+
+            def recording(prompt, max_tokens=200):
+                responses.append(original(prompt, max_tokens))
+                return responses[-1]
+            self.replay.response = None
+            self.replay._service.make_completion = recording
+            try:
+                return self.ai(kind, text, context)
+            finally:
+                self.replay._service.make_completion = lambda prompt, max_tokens=200: self.replay.response
+                self.last_live_response = responses[-1] if responses else None
+        self.replay.response = recorded
+        if tier == 'replayed_ai':
+            if recorded is None:
+                return None
+            return self.ai(kind, text, context)
+        return self.pipeline(kind, text, context)
+
+
+def _digits(phone):
+    return re.sub(r'\D', '', str(phone or ''))[-10:]
+
+
+def normalize(kind, result):
+    """Comparable form of a parser result; None when it did not parse"""
+    if not isinstance(result, dict) or not result.get('success'):
+        return None
+    if kind == 'availability':
+        return sorted((a.get('date'), a.get('start_time'), a.get('end_time'), bool(a.get('all_day')))
+                      for a in result.get('available_dates') or [])
+    if kind == 'dates':
+        return sorted(result.get('dates') or [])
+    if kind == 'guests':
+        return sorted((' '.join(str(g.get('name', '')).split()).lower(), _digits(g.get('phone')))
+                      for g in result.get('guests') or [])
+    return (result.get('start_hour'), result.get('start_minute') or 0)
+
+
+def expected_value(kind, expected):
+    """Normalized expectation; None means the input should be rejected"""
+    if expected is None:
+        return None
+    return normalize(kind, {'success': True, **expected})
+
+
+def classify(actual, expected):
+    if actual is None:
+        return 'correct_reject' if expected is None else 'rejected'
+    if expected is None:
+        return 'false_accept'
+    return 'correct' if actual == expected else 'wrong'
+
+
+def evaluate(corpus, kinds=None, tiers=('regex', 'replayed_ai', 'pipeline'), live_ai=False):
+    """Outcome and latency of every corpus entry under every tier"""
+    import logging
+    logging.disable(logging.CRITICAL)
+    parsers = Parsers(live_ai=live_ai)
+    now = datetime.fromisoformat(corpus['now'])
+    results = []
+    try:
+        with frozen_clock(now):
+            for entry in corpus['entries']:
+                if kinds and entry['kind'] not in kinds:
+                    continue
+                kind, text = entry['kind'], entry['input']
+                context = {'event_dates': entry['event_dates']} if entry.get('event_dates') else {}
+                expected = expected_value(kind, entry.get('expected'))
+                for tier in tiers:
+                    start = time.perf_counter()
+                    try:
+                        result = parsers.run(tier, kind, text, context, entry.get('ai_response'))
+                        error = None
+                    except Exception as e:
+                        result, error = None, f'{type(e).__name__}: {e}'
+                    elapsed = time.perf_counter() - start
+                    uncovered = (tier == 'replayed_ai' and entry.get('ai_response') is None) or \
+                        (tier == 'live_ai' and not live_ai)
+                    if uncovered:
+                        outcome, actual = 'uncovered', None
+                    elif error:
+                        outcome, actual = 'error', None
+                    else:
+                        actual = normalize(kind, result)
+                        outcome = classify(actual, expected)
+                    row = {'kind': kind, 'input': text, 'tier': tier, 'outcome': outcome,
+                           'latency_ms': round(elapsed * 1000, 3), 'actual': actual, 'expected': expected,
+                           'known_gap': tier in entry.get('known_gaps', [])}
+                    if error:
+                        row['error'] = error
+                    if tier == 'live_ai':
+                        row['ai_response'] = parsers.last_live_response
+                    results.append(row)
+    finally:
+        logging.disable(logging.NOTSET)
+    return results
+
+
+def summarize(results):
+    """Per kind and tier: accuracy, coverage and latency"""
+    groups = {}
+    for row in results:
+        groups.setdefault((row['kind'], row['tier']), []).append(row)
+
+    summary = {}
+    for (kind, tier), rows in sorted(groups.items()):
+        evaluated = [r for r in rows if r['outcome'] != 'uncovered']
+        should_parse = [r for r in evaluated if r['expected'] is not None]
+        latencies = sorted(r['latency_ms'] for r in evaluated) or [0.0]
+        summary[f'{kind}/{tier}'] = {
+            'inputs': len(rows),
+            'evaluated': len(evaluated),
+            'accuracy': round(sum(r['outcome'] in ('correct', 'correct_reject') for r in evaluated)
+                              / len(evaluated), 3) if evaluated else None,
+            # Share of inputs that should parse which this tier parsed at all (right or wrong)
+            'coverage': round(sum(r['actual'] is not None for r in should_parse)
+                              / len(should_parse), 3) if should_parse else None,
+            'outcomes': {outcome: sum(r['outcome'] == outcome for r in rows)
+                         for outcome in OUTCOMES},
+            'p50_ms': round(statistics.median(latencies), 3),
+            'max_ms': round(latencies[-1], 3),
+        }
+    return summary
+
+
+def needs_ai(results):
+    """Inputs the regex tier gets wrong but the replayed AI gets right"""
+    by_input = {}
+    for row in results:
+        by_input.setdefault((row['kind'], row['input']), {})[row['tier']] = row['outcome']
+    return [{'kind': kind, 'input': text, 'regex': outcomes.get('regex')}
+            for (kind, text), outcomes in by_input.items()
+            if outcomes.get('regex') not in ('correct', 'correct_reject')
+            and outcomes.get('replayed_ai') in ('correct', 'correct_reject')]
+
+
+def record_responses(corpus, results, path):
+    """Store live AI responses in the corpus so the replayed tier can use them"""
+    responses = {(r['kind'], r['input']): r['ai_response'] for r in results
+                 if r['tier'] == 'live_ai' and r.get('ai_response')}
+    for entry in corpus['entries']:
+        response = responses.get((entry['kind'], entry['input']))
+        if response:
+            entry['ai_response'] = response
+    with open(path, 'w') as f:
+        json.dump(corpus, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+    return len(responses)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Score the parsers against the labeled corpus")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="Corpus JSON file")
+    parser.add_argument("--kind", action='append', choices=KINDS, help="Only this kind of input (repeatable)")
+    parser.add_argument("--tier", action='append', choices=TIERS, help="Only this tier (repeatable)")
+    parser.add_argument("--live-ai", action='store_true', help="Also run the live_ai tier against OpenAI")
+    parser.add_argument("--record", action='store_true', help="With --live-ai, save responses into the corpus")
+    parser.add_argument("--verbose", action='store_true', help="List every input that was not handled correctly")
+    parser.add_argument("--report", help="Write summary and per-input results as JSON")
+
+    args = parser.parse_args()
+
+    tiers = args.tier or (['regex', 'replayed_ai', 'pipeline'] + (['live_ai'] if args.live_ai else []))
+    if 'live_ai' in tiers and not os.getenv('OPENAI_API_KEY'):
+        print("live_ai needs OPENAI_API_KEY")
+        return 2
+
+    corpus = load_corpus(args.corpus)
+    results = evaluate(corpus, args.kind, tiers, live_ai='live_ai' in tiers)
+    summary = summarize(results)
+
+    print(f"🧪 Parser corpus: {len(corpus['entries'])} inputs, clock frozen at {corpus['now']}\n")
+    print(f"  {'kind/tier':26} {'scored':>6} {'accuracy':>9} {'coverage':>9} {'wrong':>6} {'rejected':>9} "
+          f"{'false+':>7} {'errors':>7} {'p50 ms':>8} {'max ms':>8}")
+    for name, stats in summary.items():
+        accuracy = f"{stats['accuracy']:.0%}" if stats['accuracy'] is not None else '-'
+        coverage = f"{stats['coverage']:.0%}" if stats['coverage'] is not None else '-'
+        outcomes = stats['outcomes']
+        print(f"  {name:26} {stats['evaluated']:6d} {accuracy:>9} {coverage:>9} {outcomes['wrong']:6d} "
+              f"{outcomes['rejected']:9d} {outcomes['false_accept']:7d} {outcomes['error']:7d} {stats['p50_ms']:8.2f} {stats['max_ms']:8.2f}")
+
+    ai_only = needs_ai(results)
+    if ai_only:
+        print(f"\n{len(ai_only)} input(s) still need AI:")
+        for item in ai_only:
+            print(f"  [{item['kind']}] {item['input']!r} (regex: {item['regex']})")
+
+    if args.verbose:
+        print("\nMisses:")
+        for row in results:
+            if row['outcome'] not in ('correct', 'correct_reject', 'uncovered'):
+                got = row.get('error') or row['actual']
+                print(f"  {row['tier']:12} [{row['kind']}] {row['input']!r}: {row['outcome']}"
+                      f"\n{'':17}got {got}\n{'':17}expected {row['expected']}")
+
+    if args.record and args.live_ai:
+        count = record_responses(corpus, results, args.corpus)
+        print(f"\nRecorded {count} AI response(s) in {args.corpus}")
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump({'summary': summary, 'needs_ai': ai_only, 'results': results}, f, indent=2, default=str)
+        print(f"\nReport written to {args.report}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
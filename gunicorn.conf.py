@@ -0,0 +1,70 @@
+"""
+Gunicorn settings, picked up automatically from the working directory
+
+preload_app loads wsgi.py in the master, so the app is created and warmed
+up once (app/startup.py) and workers fork with the router, handlers and
+imported modules already in memory, shared copy-on-write.
+
+With preload the master also runs anything create_app starts, so leave
+JOB_SCHEDULER_ENABLED off for the web process and run the scheduler as its
+own process (the Procfile's worker: background_scheduler.py). Jobs that
+warm per-process caches run in each worker instead, started in post_fork.
+
+Workers are threaded (gthread): a message mostly waits on OpenAI and
+Twilio, so each worker handles GUNICORN_THREADS messages at once over the
+shared router and services, which are built under a lock and keep no
+per-request state. gevent is not supported - psycopg2 blocks the whole
+hub without green patching. Keep the database pool at least as large as
+the thread count (the default 5 + 10 overflow covers 8 threads).
+
+/metrics histograms are per process, so workers share them through files
+in METRICS_MULTIPROC_DIR (app/services/metrics_service.py); otherwise each
+scrape would see a different worker's counters.
+"""
+import os
+import tempfile
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', '2'))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('GUNICORN_THREADS', '8'))
+timeout = 120
+preload_app = True
+
+# Set before wsgi.py is preloaded so the app picks it up
+os.environ.setdefault('METRICS_MULTIPROC_DIR',
+                      os.path.join(tempfile.gettempdir(), f"gatherly-metrics-{os.environ.get('PORT', '5000')}"))
+
+loglevel = 'info'
+accesslog = '-'
+errorlog = '-'
+
+
+def on_starting(server):
+    # Counts left by a previous master are not this instance's
+    from app.services.metrics_service import MultiprocessStore
+    MultiprocessStore(os.environ['METRICS_MULTIPROC_DIR']).clear()
+
+
+def post_fork(server, worker):
+    # Never reuse a database connection the master may have opened
+    from app import db
+    app = server.app.wsgi()
+    with app.app_context():
+        db.engine.dispose(close=False)
+
+    # Warm this worker's own caches (the scheduler process serves no SMS)
+    from app.services.job_scheduler_service import start_worker_scheduler
+    start_worker_scheduler(app)
+
+
+def worker_exit(server, worker):
+    # Digests are buffered per worker; send them before a deploy or timeout drops them
+    from app.services.notification_digest_service import flush_pending_digests
+    flush_pending_digests()
+
+
+def child_exit(server, worker):
+    # Keep the exited worker's counts in the instance totals
+    from app.services.metrics_service import MultiprocessStore
+    MultiprocessStore(os.environ['METRICS_MULTIPROC_DIR']).mark_process_dead(worker.pid)
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Conversation Load Generator
+
+Simulates N planners and their guests walking the whole workflow
+concurrently: name, guests, dates, availability requests, guest replies,
+availability status and overlap view, time, activity, venue, start time,
+invitations and RSVPs. Every message is timed and checked against the
+reply that step should produce, then throughput and per-step p50/p95/p99
+latency are printed and optionally written as JSON for trend tracking.
+
+Two targets:
+- inprocess (default): calls SMSRouter.route_message directly against a
+  throwaway SQLite database (or --database-url), with the AI and Twilio
+  transports replaced by stubs that sleep for --ai-latency-ms /
+  --sms-latency-ms, so results do not depend on external services
+- http: posts Twilio-style forms to --url (e.g. http://localhost:5000/sms/webhook);
+  run that server without OPENAI_API_KEY/TWILIO_* so it uses its built-in
+  simulation transports
+
+Usage:
+- python load_test_conversations.py --planners 50 --guests 3 --concurrency 8
+- python load_test_conversations.py --engine-profile none   (Flask-SQLAlchemy defaults, for comparison)
+- python load_test_conversations.py --target http --url http://localhost:5000/sms/webhook --report load.json
+"""
+
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+ERROR_MARKER = 'Sorry, there was an error'
+
+
+def build_conversation(index, guest_count):
+    """Steps for one planner and their guests as (step, phone, message, expected reply fragment)"""
+    planner = f'555{index:07d}'
+    guests = [f'556{index:05d}{g:02d}' for g in range(guest_count)]
+    steps = [
+        ('start', planner, 'hi', "What's your name"),
+        ('name', planner, f'Planner {index}', 'Great to meet you'),
+    ]
+    steps += [('add_guest', planner, f'Guest {g} Load, {phone}', 'Added') for g, phone in enumerate(guests)]
+    steps += [
+        ('guests_done', planner, 'done', "let's set some dates"),
+        ('dates', planner, 'Saturday', 'planning for'),
+        ('request_availability', planner, '1', 'Availability requests sent'),
+    ]
+    for phone in guests:
+        steps += [
+            ('guest_availability', phone, 'Saturday 2-6pm', "Here's your availability"),
+            ('guest_confirm', phone, '1', 'recorded your availability'),
+        ]
+    steps += [
+        ('availability_status', planner, 'status', 'Availability Status'),
+        ('overlap_view', planner, '1', 'Best available timeslots'),
+        ('select_time', planner, '1', 'Time selected'),
+        ('activity', planner, 'Dinner in Brooklyn', 'great options'),
+        ('select_venue', planner, '1', 'Event Ready to Send'),
+        ('start_time_prompt', planner, '1', 'What time would you like to start'),
+        ('set_start_time', planner, '4pm', 'Event Ready to Send'),
+        ('send_invitations', planner, '2', 'Invitations sent'),
+    ]
+    steps += [('guest_rsvp', phone, 'yes', "You're confirmed") for phone in guests]
+    return steps
+
+
+class InProcessTarget:
+    """Routes messages through SMSRouter in this process with stub AI and SMS transports"""
+
+    def __init__(self, database_url=None, ai_latency_ms=0.0, sms_latency_ms=0.0, engine_profile='auto'):
+        # Never reach real services from a load test
+        for name in ('OPENAI_API_KEY', 'TWILIO_SID', 'TWILIO_AUTH', 'TWILIO_NUMBER',
+                     'TWILIO_ACCOUNT_SID', 'TWILIO_AUTH_TOKEN', 'TWILIO_PHONE_NUMBER'):
+            os.environ.pop(name, None)
+
+        from app import create_app, db
+        from app.config import Config
+        from app.services.ai_processing_service import AIProcessingService
+        from app.services.sms_service import SMSService
+
+        self._tempdir = None
+        if database_url is None:
+            self._tempdir = tempfile.TemporaryDirectory()
+            database_url = f"sqlite:///{os.path.join(self._tempdir.name, 'load.db')}"
+
+        class LoadTestConfig(Config):
+            SQLALCHEMY_DATABASE_URI = database_url
+            DATABASE_ENGINE_PROFILE = engine_profile
+            if engine_profile == 'none' and database_url.startswith('sqlite'):
+                # Wait for SQLite's writer lock instead of failing under concurrency
+                SQLALCHEMY_ENGINE_OPTIONS = {'connect_args': {'timeout': 30}}
+            NOTIFICATION_DIGEST_WINDOW_SECONDS = 0
+            PERFORMANCE_METRICS_ENABLED = True
+            TESTING = True
+
+        def stub_completion(service, prompt, max_tokens=200):
+            time.sleep(ai_latency_ms / 1000)
+            # Handlers fall back to their regex parsers, as when the AI times out
+            return None
+
+        def stub_send_sms(service, to_number, message):
+            time.sleep(sms_latency_ms / 1000)
+            return True
+
+        AIProcessingService.make_completion = stub_completion
+        SMSService.send_sms = stub_send_sms
+
+        self.app = create_app(LoadTestConfig)
+        with self.app.app_context():
+            db.create_all()
+            from app.routes.sms import init_router
+            self.router = init_router()
+
+    def send(self, phone, message):
+        from app.services.metrics_service import track_request
+        with self.app.app_context(), track_request():
+            return self.router.route_message(phone, message)
+
+    def close(self):
+        from app import db
+        with self.app.app_context():
+            db.engine.dispose()
+        if self._tempdir:
+            self._tempdir.cleanup()
+
+
+class HttpTarget:
+    """Posts Twilio webhook forms to a running server"""
+
+    def __init__(self, url):
+        import requests
+        self.url = url
+        self._local = threading.local()
+        self._requests = requests
+
+    def send(self, phone, message):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = self._requests.Session()
+        response = session.post(self.url, data={'From': f'+1{phone}', 'Body': message}, timeout=60)
+        response.raise_for_status()
+        return response.text
+
+    def close(self):
+        pass
+
+
+class Results:
+    """Latencies and failures per step, safe to record from many threads"""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.unexpected = defaultdict(int)
+        self.samples = {}
+        self.completed = 0
+        self._lock = threading.Lock()
+
+    def record(self, step, seconds, reply, expected):
+        with self._lock:
+            self.latencies[step].append(seconds)
+            if reply is None or ERROR_MARKER in reply:
+                self.errors[step] += 1
+            elif expected not in reply:
+                self.unexpected[step] += 1
+                # Keep one example per step to make a broken flow easy to diagnose
+                self.samples.setdefault(step, reply[:300])
+
+    def conversation_done(self):
+        with self._lock:
+            self.completed += 1
+
+
+def run_conversation(target, steps, results):
+    ok = True
+    for step, phone, message, expected in steps:
+        start = time.perf_counter()
+        try:
+            reply = target.send(phone, message)
+        except Exception as e:
+            reply = None
+            print(f"  {step} from {phone} failed: {e}")
+        results.record(step, time.perf_counter() - start, reply, expected)
+        ok = ok and reply is not None and expected in reply
+    if ok:
+        results.conversation_done()
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(results, elapsed, config):
+    stages = {}
+    all_latencies = []
+    for step, latencies in results.latencies.items():
+        ordered = sorted(latencies)
+        all_latencies.extend(ordered)
+        stages[step] = {
+            'count': len(ordered),
+            'errors': results.errors[step],
+            'unexpected': results.unexpected[step],
+            'mean_ms': round(statistics.mean(ordered) * 1000, 2),
+            'p50_ms': round(percentile(ordered, 0.50) * 1000, 2),
+            'p95_ms': round(percentile(ordered, 0.95) * 1000, 2),
+            'p99_ms': round(percentile(ordered, 0.99) * 1000, 2),
+            'max_ms': round(ordered[-1] * 1000, 2),
+        }
+    all_latencies.sort()
+    return {
+        'generated_at': datetime.utcnow().isoformat(timespec='seconds') + 'Z',
+        'config': config,
+        'totals': {
+            'messages': len(all_latencies),
+            'conversations': config['planners'],
+            'completed_conversations': results.completed,
+            'errors': sum(results.errors.values()),
+            'unexpected_replies': sum(results.unexpected.values()),
+            'elapsed_s': round(elapsed, 3),
+            'throughput_msgs_per_s': round(len(all_latencies) / elapsed, 1) if elapsed else 0.0,
+            'p50_ms': round(percentile(all_latencies, 0.50) * 1000, 2),
+            'p95_ms': round(percentile(all_latencies, 0.95) * 1000, 2),
+            'p99_ms': round(percentile(all_latencies, 0.99) * 1000, 2),
+        },
+        'stages': stages,
+        'unexpected_samples': results.samples,
+    }
+
+
+def run_load_test(target, planners, guests, concurrency, config, first_index=0):
+    results = Results()
+    conversations = [build_conversation(first_index + i, guests) for i in range(planners)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for steps in conversations:
+            pool.submit(run_conversation, target, steps, results)
+    return summarize(results, time.perf_counter() - start, config)
+
+
+def print_report(report):
+    totals = report['totals']
+    print(f"\n{totals['messages']} messages in {totals['elapsed_s']}s "
+          f"({totals['throughput_msgs_per_s']} msg/s), "
+          f"{totals['completed_conversations']}/{totals['conversations']} conversations completed, "
+          f"{totals['errors']} errors, {totals['unexpected_replies']} unexpected replies")
+    print(f"Overall p50 {totals['p50_ms']}ms  p95 {totals['p95_ms']}ms  p99 {totals['p99_ms']}ms\n")
+    print(f"{'step':22} {'count':>6} {'err':>4} {'unexp':>5} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for step, stats in report['stages'].items():
+        print(f"{step:22} {stats['count']:6d} {stats['errors']:4d} {stats['unexpected']:5d} "
+              f"{stats['p50_ms']:8.1f} {stats['p95_ms']:8.1f} {stats['p99_ms']:8.1f}")
+    for step, sample in report['unexpected_samples'].items():
+        print(f"\nUnexpected reply at {step}: {sample!r}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Simulate concurrent planner/guest conversations")
+    parser.add_argument("--planners", type=int, default=20, help="Conversations to run (default: 20)")
+    parser.add_argument("--guests", type=int, default=3, help="Guests per planner (default: 3)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Conversations in flight (default: 4)")
+    parser.add_argument("--target", choices=['inprocess', 'http'], default='inprocess')
+    parser.add_argument("--url", default="http://localhost:5000/sms/webhook", help="Webhook URL for --target http")
+    parser.add_argument("--database-url", help="Database for --target inprocess (default: throwaway SQLite file)")
+    parser.add_argument("--engine-profile", default='auto',
+                       help="DATABASE_ENGINE_PROFILE for --target inprocess: auto, none, postgres, sqlite (default: auto)")
+    parser.add_argument("--ai-latency-ms", type=float, default=0.0, help="Delay of the stub AI transport")
+    parser.add_argument("--sms-latency-ms", type=float, default=0.0, help="Delay of the stub SMS transport")
+    parser.add_argument("--first-index", type=int, default=0,
+                       help="Offset for generated phone numbers, to rerun against a database that has data")
+    parser.add_argument("--report", help="Write the JSON report to this path")
+
+    args = parser.parse_args()
+
+    if args.target == 'http':
+        target = HttpTarget(args.url)
+    else:
+        target = InProcessTarget(args.database_url, args.ai_latency_ms, args.sms_latency_ms, args.engine_profile)
+
+    config = {key: value for key, value in vars(args).items() if key != 'report'}
+    try:
+        report = run_load_test(target, args.planners, args.guests, args.concurrency, config, args.first_index)
+    finally:
+        target.close()
+
+    print_report(report)
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.report}")
+
+    sys.exit(0 if report['totals']['errors'] == 0 and report['totals']['unexpected_replies'] == 0 else 1)
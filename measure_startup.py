@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Startup time measurement
+
+Starts a fresh interpreter (as a gunicorn worker would) and times each step
+from a cold process to a served message: importing the app package,
+create_app(), warming the app (router, handlers and shared services), and
+the first and second SMS through the test client. Each step is measured
+over --runs fresh processes and the median reported, so the effect of lazy
+imports and --preload warm-up can be compared before and after a change.
+
+Usage: python measure_startup.py [--runs 5] [--importtime]
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+STEPS = ('import_app', 'create_app', 'warm_up', 'first_message', 'second_message')
+
+# Runs in the child interpreter; prints the cumulative milliseconds at each step
+CHILD = r'''
+import json, os, sys, time
+start = time.perf_counter()
+marks = {}
+def mark(step):
+    marks[step] = (time.perf_counter() - start) * 1000
+
+from app import create_app, db
+mark('import_app')
+
+from config import TestingConfig
+class StartupConfig(TestingConfig):
+    SQLALCHEMY_DATABASE_URI = os.environ['STARTUP_DATABASE_URL']
+    TESTING = False
+app = create_app(StartupConfig)
+mark('create_app')
+
+try:
+    from app.startup import warm_up
+except ImportError:
+    # Trees without a warm-up step build the router on first use
+    def warm_up(app):
+        with app.app_context():
+            from app.routes.sms import init_router
+            init_router()
+warm_up(app)
+mark('warm_up')
+
+client = app.test_client()
+client.post('/sms/test', json={'phone_number': '5550000001', 'message': 'hi'})
+mark('first_message')
+client.post('/sms/test', json={'phone_number': '5550000002', 'message': 'hi'})
+mark('second_message')
+
+print('STARTUP ' + json.dumps(marks), flush=True)
+'''
+
+
+def run_once(database_url):
+    env = {**os.environ, 'STARTUP_DATABASE_URL': database_url}
+    for name in ('OPENAI_API_KEY', 'TWILIO_ACCOUNT_SID', 'TWILIO_AUTH_TOKEN', 'TWILIO_PHONE_NUMBER'):
+        env.pop(name, None)
+    output = subprocess.run([sys.executable, '-c', CHILD], env=env, capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout
+    # Skip the app's own log lines on stdout
+    marks = json.loads(next(line[8:] for line in output.splitlines() if line.startswith('STARTUP ')))
+    # Cumulative marks -> per-step durations
+    durations, previous = {}, 0.0
+    for step in STEPS:
+        durations[step] = marks[step] - previous
+        previous = marks[step]
+    durations['total'] = previous
+    return durations
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Measure cold start of the app")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh processes to measure (default: 5)")
+    parser.add_argument("--importtime", action='store_true', help="Also list the slowest imports of create_app()")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = f"sqlite:///{os.path.join(directory, 'startup.db')}"
+        # Schema once up front so the measured runs do not include table creation
+        subprocess.run([sys.executable, '-c', 'from app import create_app, db\n'
+                        'from config import TestingConfig\n'
+                        f'TestingConfig.SQLALCHEMY_DATABASE_URI = {database_url!r}\n'
+                        'app = create_app(TestingConfig)\n'
+                        'app.app_context().push(); db.create_all()'],
+                       check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        runs = [run_once(database_url) for _ in range(args.runs)]
+
+    print(f"🧪 Cold start, median of {args.runs} fresh processes")
+    for step in STEPS + ('total',):
+        print(f"  {step:16} {statistics.median(run[step] for run in runs):8.1f}ms")
+
+    if args.importtime:
+        stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'from app import create_app; create_app("testing")'], capture_output=True,
+                                text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stderr
+        rows = []
+        for line in stderr.splitlines():
+            parts = line.split('|')
+            if len(parts) == 3 and parts[1].strip().isdigit():
+                rows.append((int(parts[1]), parts[2].rstrip()))
+        print("\nSlowest imports (cumulative):")
+        for micros, name in sorted(rows, reverse=True)[:15]:
+            print(f"  {micros / 1000:8.1f}ms {name}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+"""Add denormalized response counters to events
+
+Revision ID: a1c4e7d2b9f0
+Revises: cda99ebfccf0
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1c4e7d2b9f0'
+down_revision = 'cda99ebfccf0'
+branch_labels = None
+depends_on = None
+
+COUNTER_COLUMNS = ['guests_total', 'availability_responded', 'rsvp_yes', 'rsvp_no', 'rsvp_maybe']
+
+
+def upgrade():
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        for column in COUNTER_COLUMNS:
+            batch_op.add_column(sa.Column(column, sa.Integer(), nullable=False, server_default='0'))
+
+    # Backfill from the guests table
+    op.execute("""
+        UPDATE events SET
+            guests_total = (SELECT COUNT(*) FROM guests WHERE guests.event_id = events.id),
+            availability_responded = (SELECT COUNT(*) FROM guests WHERE guests.event_id = events.id AND guests.availability_provided),
+            rsvp_yes = (SELECT COUNT(*) FROM guests WHERE guests.event_id = events.id AND guests.rsvp_status = 'yes'),
+            rsvp_no = (SELECT COUNT(*) FROM guests WHERE guests.event_id = events.id AND guests.rsvp_status = 'no'),
+            rsvp_maybe = (SELECT COUNT(*) FROM guests WHERE guests.event_id = events.id AND guests.rsvp_status = 'maybe')
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        for column in reversed(COUNTER_COLUMNS):
+            batch_op.drop_column(column)
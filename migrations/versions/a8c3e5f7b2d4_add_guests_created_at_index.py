@@ -0,0 +1,24 @@
+"""Add created_at index on guests for admin API keyset pagination
+
+Revision ID: a8c3e5f7b2d4
+Revises: f4b8d1e6a9c2
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8c3e5f7b2d4'
+down_revision = 'f4b8d1e6a9c2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_guests_created_at', 'guests', ['created_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_guests_created_at', table_name='guests')
@@ -0,0 +1,71 @@
+"""Add event_dates table and backfill from Event.notes
+
+Revision ID: b7d2f4e8c1a3
+Revises: a1c4e7d2b9f0
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from datetime import datetime
+import json
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d2f4e8c1a3'
+down_revision = 'a1c4e7d2b9f0'
+branch_labels = None
+depends_on = None
+
+
+def _parse_notes_dates(notes):
+    """Dates stored as 'Dates JSON: [...]' inside the free-text notes"""
+    if not notes or "Dates JSON:" not in notes:
+        return []
+    try:
+        raw_dates = json.loads(notes.split("Dates JSON: ")[1].split("\n")[0])
+    except (ValueError, IndexError):
+        return []
+
+    dates = []
+    for raw in raw_dates:
+        try:
+            parsed = datetime.strptime(str(raw), '%Y-%m-%d').date()
+        except ValueError:
+            continue
+        if parsed not in dates:
+            dates.append(parsed)
+    return dates
+
+
+def upgrade():
+    event_dates = op.create_table('event_dates',
+        sa.Column('event_id', sa.Integer(), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['event_id'], ['events.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_event_dates_event_id_date', 'event_dates', ['event_id', 'date'], unique=True)
+
+    # Backfill from the "Dates JSON:" line in notes
+    connection = op.get_bind()
+    events = connection.execute(
+        sa.text("SELECT id, notes FROM events WHERE notes LIKE '%Dates JSON:%'")
+    ).fetchall()
+
+    now = datetime.utcnow()
+    rows = [
+        {'event_id': event_id, 'date': event_date, 'created_at': now, 'updated_at': now}
+        for event_id, notes in events
+        for event_date in _parse_notes_dates(notes)
+    ]
+    if rows:
+        op.bulk_insert(event_dates, rows)
+
+
+def downgrade():
+    op.drop_index('ix_event_dates_event_id_date', table_name='event_dates')
+    op.drop_table('event_dates')
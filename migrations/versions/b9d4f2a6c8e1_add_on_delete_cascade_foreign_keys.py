@@ -0,0 +1,61 @@
+"""Declare ON DELETE CASCADE / SET NULL on foreign keys
+
+Revision ID: b9d4f2a6c8e1
+Revises: a8c3e5f7b2d4
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b9d4f2a6c8e1'
+down_revision = 'a8c3e5f7b2d4'
+branch_labels = None
+depends_on = None
+
+# (table, column, referred table, ondelete)
+FOREIGN_KEYS = [
+    ('events', 'planner_id', 'planners', 'CASCADE'),
+    ('contacts', 'planner_id', 'planners', 'CASCADE'),
+    ('guests', 'event_id', 'events', 'CASCADE'),
+    ('guests', 'contact_id', 'contacts', 'SET NULL'),
+    ('guest_states', 'event_id', 'events', 'CASCADE'),
+    ('availability', 'event_id', 'events', 'CASCADE'),
+    ('availability', 'guest_id', 'guests', 'CASCADE'),
+    ('event_dates', 'event_id', 'events', 'CASCADE'),
+]
+
+# The original foreign keys are unnamed; SQLite batch mode names them on reflection with this
+SQLITE_NAMING_CONVENTION = {'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s'}
+
+
+def _replace_foreign_keys(cascade):
+    if op.get_bind().dialect.name == 'sqlite':
+        tables = dict.fromkeys(table for table, _, _, _ in FOREIGN_KEYS)
+        for table in tables:
+            with op.batch_alter_table(table, recreate='always',
+                                      naming_convention=SQLITE_NAMING_CONVENTION) as batch_op:
+                for fk_table, column, referred, ondelete in FOREIGN_KEYS:
+                    if fk_table != table:
+                        continue
+                    name = f'fk_{table}_{column}_{referred}'
+                    batch_op.drop_constraint(name, type_='foreignkey')
+                    batch_op.create_foreign_key(name, referred, [column], ['id'],
+                                                ondelete=ondelete if cascade else None)
+        return
+
+    # PostgreSQL's default constraint names
+    for table, column, referred, ondelete in FOREIGN_KEYS:
+        name = f'{table}_{column}_fkey'
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(name, table, referred, [column], ['id'], ondelete=ondelete if cascade else None)
+
+
+def upgrade():
+    _replace_foreign_keys(cascade=True)
+
+
+def downgrade():
+    _replace_foreign_keys(cascade=False)
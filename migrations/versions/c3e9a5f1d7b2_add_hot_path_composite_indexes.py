@@ -0,0 +1,36 @@
+"""Add composite indexes for the hot router query patterns
+
+Revision ID: c3e9a5f1d7b2
+Revises: b7d2f4e8c1a3
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3e9a5f1d7b2'
+down_revision = 'b7d2f4e8c1a3'
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns)
+INDEXES = [
+    ('ix_guests_event_id_phone_number', 'guests', ['event_id', 'phone_number']),
+    ('ix_guests_event_id_availability_provided', 'guests', ['event_id', 'availability_provided']),
+    ('ix_availability_event_id_guest_id', 'availability', ['event_id', 'guest_id']),
+    ('ix_events_planner_id_status', 'events', ['planner_id', 'status']),
+    ('ix_contacts_planner_id_phone_number', 'contacts', ['planner_id', 'phone_number']),
+    ('ix_contacts_planner_id_name', 'contacts', ['planner_id', 'name']),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    for name, table, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,38 @@
+"""Add archived_events table for event retention
+
+Revision ID: c6e1a9d3f5b7
+Revises: b9d4f2a6c8e1
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c6e1a9d3f5b7'
+down_revision = 'b9d4f2a6c8e1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('archived_events',
+        sa.Column('event_id', sa.Integer(), nullable=False),
+        sa.Column('planner_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('event_updated_at', sa.DateTime(), nullable=True),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_archived_events_event_id', 'archived_events', ['event_id'], unique=True)
+    op.create_index('ix_archived_events_planner_id', 'archived_events', ['planner_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_archived_events_planner_id', table_name='archived_events')
+    op.drop_index('ix_archived_events_event_id', table_name='archived_events')
+    op.drop_table('archived_events')
@@ -0,0 +1,47 @@
+"""Add maintenance checkpoints and updated_at indexes for incremental integrity checks
+
+Revision ID: d5f1b8c2e4a6
+Revises: c3e9a5f1d7b2
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5f1b8c2e4a6'
+down_revision = 'c3e9a5f1d7b2'
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns)
+INDEXES = [
+    ('ix_guests_updated_at', 'guests', ['updated_at']),
+    ('ix_availability_updated_at', 'availability', ['updated_at']),
+    ('ix_availability_guest_id_event_id_date', 'availability', ['guest_id', 'event_id', 'date']),
+    ('ix_events_updated_at', 'events', ['updated_at']),
+]
+
+
+def upgrade():
+    op.create_table('maintenance_checkpoints',
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('high_water_mark', sa.DateTime(), nullable=True),
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_maintenance_checkpoints_name', 'maintenance_checkpoints', ['name'], unique=True)
+
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    for name, table, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+
+    op.drop_index('ix_maintenance_checkpoints_name', table_name='maintenance_checkpoints')
+    op.drop_table('maintenance_checkpoints')
@@ -0,0 +1,36 @@
+"""Add expires_at to guest_states
+
+Revision ID: d8f3b5a7c9e2
+Revises: c6e1a9d3f5b7
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from datetime import datetime, timedelta
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8f3b5a7c9e2'
+down_revision = 'c6e1a9d3f5b7'
+branch_labels = None
+depends_on = None
+
+# Matches the default GUEST_STATE_TTL_HOURS
+DEFAULT_TTL = timedelta(days=7)
+
+
+def upgrade():
+    with op.batch_alter_table('guest_states', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('expires_at', sa.DateTime(), nullable=True))
+        batch_op.create_index('ix_guest_states_expires_at', ['expires_at'], unique=False)
+
+    # Existing conversations get one TTL from the upgrade before the sweeper may remove them
+    guest_states = sa.table('guest_states', sa.column('expires_at', sa.DateTime()))
+    op.execute(guest_states.update().values(expires_at=datetime.utcnow() + DEFAULT_TTL))
+
+
+def downgrade():
+    with op.batch_alter_table('guest_states', schema=None) as batch_op:
+        batch_op.drop_index('ix_guest_states_expires_at')
+        batch_op.drop_column('expires_at')
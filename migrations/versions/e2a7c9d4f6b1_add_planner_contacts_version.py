@@ -0,0 +1,26 @@
+"""Add contacts_version to planners for contact menu caching
+
+Revision ID: e2a7c9d4f6b1
+Revises: d5f1b8c2e4a6
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2a7c9d4f6b1'
+down_revision = 'd5f1b8c2e4a6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('planners', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('contacts_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('planners', schema=None) as batch_op:
+        batch_op.drop_column('contacts_version')
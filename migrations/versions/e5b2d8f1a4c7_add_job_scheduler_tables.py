@@ -0,0 +1,56 @@
+"""Add job_leases and job_runs tables for the job scheduler
+
+Revision ID: e5b2d8f1a4c7
+Revises: d8f3b5a7c9e2
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b2d8f1a4c7'
+down_revision = 'd8f3b5a7c9e2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('job_leases',
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('owner', sa.String(length=100), nullable=True),
+        sa.Column('locked_until', sa.DateTime(), nullable=True),
+        sa.Column('next_run_at', sa.DateTime(), nullable=True),
+        sa.Column('last_run_at', sa.DateTime(), nullable=True),
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_job_leases_name', 'job_leases', ['name'], unique=True)
+
+    op.create_table('job_runs',
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('owner', sa.String(length=100), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=False),
+        sa.Column('finished_at', sa.DateTime(), nullable=False),
+        sa.Column('duration_ms', sa.Float(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('result', sa.Text(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_job_runs_started_at', 'job_runs', ['started_at'], unique=False)
+    op.create_index('ix_job_runs_name_started_at', 'job_runs', ['name', 'started_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_job_runs_name_started_at', table_name='job_runs')
+    op.drop_index('ix_job_runs_started_at', table_name='job_runs')
+    op.drop_table('job_runs')
+    op.drop_index('ix_job_leases_name', table_name='job_leases')
+    op.drop_table('job_leases')
@@ -0,0 +1,36 @@
+"""Add indexes for dashboard aggregates and pagination
+
+Revision ID: f4b8d1e6a9c2
+Revises: e2a7c9d4f6b1
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f4b8d1e6a9c2'
+down_revision = 'e2a7c9d4f6b1'
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns)
+INDEXES = [
+    ('ix_events_created_at', 'events', ['created_at']),
+    ('ix_events_workflow_stage', 'events', ['workflow_stage']),
+    ('ix_planners_created_at', 'planners', ['created_at']),
+    ('ix_contacts_created_at', 'contacts', ['created_at']),
+    ('ix_guests_contact_id', 'guests', ['contact_id']),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    for name, table, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
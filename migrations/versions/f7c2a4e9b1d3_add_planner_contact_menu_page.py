@@ -0,0 +1,28 @@
+"""Add contact_menu_page to planners so menu paging is shared by all workers
+
+Revision ID: f7c2a4e9b1d3
+Revises: e5b2d8f1a4c7
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f7c2a4e9b1d3'
+down_revision = 'e5b2d8f1a4c7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('planners', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('contact_menu_page', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('contact_menu_page_version', sa.Integer(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('planners', schema=None) as batch_op:
+        batch_op.drop_column('contact_menu_page_version')
+        batch_op.drop_column('contact_menu_page')
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Request Profile Report
+
+Merges the request profiles written when PROFILING_SAMPLE_RATE is set and
+prints the top functions, optionally only for one workflow stage, handler
+or endpoint.
+
+Usage:
+- Top 30 functions by cumulative time: python profile_report.py
+- One handler, by own time: python profile_report.py --handler GuestCollectionHandler --sort tottime
+- List the sampled profiles and their tags: python profile_report.py --list
+"""
+
+import os
+import sys
+import pstats
+from collections import Counter
+
+# Add app directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.profiling_service import DEFAULT_PROFILE_DIR, find_profiles, parse_profile_name
+
+def list_profiles(paths):
+    """Print how many profiles were sampled per stage and handler"""
+    counts = Counter()
+    for path in paths:
+        tags = parse_profile_name(path)
+        counts[(tags['endpoint'], tags['stage'], tags['handler'])] += 1
+    for (endpoint, stage, handler), count in counts.most_common():
+        print(f"{count:6d}  {endpoint:10} {stage:30} {handler}")
+
+def print_report(paths, sort, top, stream=sys.stdout):
+    """Merge the profiles and print the top functions"""
+    stats = pstats.Stats(*paths, stream=stream)
+    stats.strip_dirs().sort_stats(sort)
+    print(f"Merged {len(paths)} profile(s)", file=stream)
+    stats.print_stats(top)
+    return stats
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Merge request profiles and show top functions")
+    parser.add_argument("--dir", default=os.environ.get('PROFILING_DIR', DEFAULT_PROFILE_DIR),
+                       help="Profile directory (default: PROFILING_DIR or ./profiles)")
+    parser.add_argument("--stage", help="Only profiles for this workflow stage")
+    parser.add_argument("--handler", help="Only profiles for this handler")
+    parser.add_argument("--endpoint", choices=['webhook', 'test'], help="Only profiles for this endpoint")
+    parser.add_argument("--sort", default="cumulative", choices=['cumulative', 'tottime', 'ncalls'],
+                       help="Sort order (default: cumulative)")
+    parser.add_argument("--top", type=int, default=30,
+                       help="Functions to show (default: 30)")
+    parser.add_argument("--list", action="store_true",
+                       help="List sampled profiles per stage and handler instead")
+    
+    args = parser.parse_args()
+    
+    if not os.path.isdir(args.dir):
+        parser.error(f"no profile directory at {args.dir}")
+    paths = find_profiles(args.dir, stage=args.stage, handler=args.handler, endpoint=args.endpoint)
+    if not paths:
+        print("No matching profiles")
+        sys.exit(1)
+    
+    if args.list:
+        list_profiles(paths)
+    else:
+        print_report(paths, args.sort, args.top)
@@ -4,18 +4,12 @@ Production entry point for the SMS Event Planner application.
 Used by Railway and other deployment platforms.
 """
 import os
-from app import create_app, db
+from app import create_app
+from app.startup import warm_up
 
-# Create the Flask application
+# Create the Flask application and build the router before serving
 app = create_app()
-
-# Initialize database tables for production
-try:
-    with app.app_context():
-        db.create_all()
-        print("Database tables created successfully")
-except Exception as e:
-    print(f"Database initialization error: {e}")
+warm_up(app, create_schema=True)
 
 if __name__ == '__main__':
     # For Railway deployment, use PORT environment variable
@@ -32,10 +32,10 @@ else
     exit 1
 fi
 
-# Run database migrations/setup
-echo "Initializing database..."
-python -c "from app import create_app, db; app = create_app(); app.app_context().push(); db.create_all(); print('Database initialized')"
+# Create a new database or apply pending migrations (flask db upgrade) before any worker starts
+echo "Migrating database..."
+python -m app.startup
 
-# Start Gunicorn
+# Start Gunicorn; gunicorn.conf.py sets workers/threads and preloads wsgi.py, which warms the app once
 echo "Starting Gunicorn..."
-exec gunicorn wsgi:app --bind 0.0.0.0:$PORT --workers 1 --timeout 120 --log-level info --access-logfile - --error-logfile -
+exec gunicorn wsgi:app
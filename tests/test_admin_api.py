@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta
+from sqlalchemy import event as sa_event, text
+from app.models import db, Planner, Event, Guest
+
+
+def _seed_events(count):
+    planner = Planner(phone_number='5550000000', name='Pat')
+    planner.save()
+    # Pairs of events share a created_at so the cursor has to break ties on id
+    base = datetime(2026, 1, 1)
+    for i in range(count):
+        db.session.add(Event(planner_id=planner.id, title=f'Event {i}', status='planning',
+                             created_at=base + timedelta(minutes=i // 2)))
+    db.session.commit()
+    return planner
+
+
+def test_cursor_pages_cover_every_row_once(app, client):
+    _seed_events(7)
+
+    titles, cursor = [], None
+    while True:
+        url = '/api/admin/events?limit=3&fields=title'
+        response = client.get(url + (f'&cursor={cursor}' if cursor else ''))
+        assert response.status_code == 200
+        body = response.get_json()
+        assert all(list(item) == ['title'] for item in body['items'])
+        titles += [item['title'] for item in body['items']]
+        cursor = body['next_cursor']
+        if not cursor:
+            break
+
+    assert titles == [f'Event {i}' for i in reversed(range(7))]
+
+
+def test_unchanged_page_returns_304_until_a_row_changes(app, client):
+    _seed_events(2)
+    first = client.get('/api/admin/events')
+    etag = first.headers['ETag']
+    assert first.headers['Last-Modified']
+
+    cached = client.get('/api/admin/events', headers={'If-None-Match': etag})
+    assert cached.status_code == 304
+    assert cached.data == b''
+
+    event = Event.query.first()
+    event.title = 'Renamed'
+    db.session.commit()
+
+    changed = client.get('/api/admin/events', headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+
+
+def test_not_modified_page_skips_the_page_query(app, client):
+    _seed_events(3)
+    etag = client.get('/api/admin/events?fields=title').headers['ETag']
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    sa_event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        cached = client.get('/api/admin/events?fields=title', headers={'If-None-Match': etag})
+    finally:
+        sa_event.remove(db.engine, 'before_cursor_execute', listener)
+
+    assert cached.status_code == 304
+    assert len(statements) == 1
+    assert 'count(' in statements[0] and 'ORDER BY' not in statements[0]
+
+    db.session.delete(Event.query.first())
+    db.session.commit()
+    assert client.get('/api/admin/events?fields=title', headers={'If-None-Match': etag}).status_code == 200
+
+
+def test_filters_and_invalid_parameters(app, client):
+    planner = _seed_events(2)
+    event = Event.query.first()
+    db.session.add(Guest(event_id=event.id, name='Ana', phone_number='5551234567'))
+    db.session.commit()
+
+    guests = client.get(f'/api/admin/guests?event_id={event.id}&fields=name,phone_number').get_json()
+    assert guests['items'] == [{'name': 'Ana', 'phone_number': '5551234567'}]
+    assert client.get(f'/api/admin/events?planner_id={planner.id + 1}').get_json()['items'] == []
+
+    assert client.get('/api/admin/events?fields=nope').status_code == 400
+    assert client.get('/api/admin/events?cursor=garbage').status_code == 400
+    assert client.get('/api/admin/events?planner_id=abc').status_code == 400
+    assert client.get('/api/admin/availability').status_code == 404
+
+
+def test_token_required_when_configured(app, client):
+    app.config['ADMIN_API_TOKEN'] = 'secret'
+
+    assert client.get('/api/admin/planners').status_code == 401
+    assert client.get('/api/admin/planners', headers={'Authorization': 'Bearer secreT'}).status_code == 401
+    assert client.get('/api/admin/planners', headers={'Authorization': 'Bearer secret'}).status_code == 200
+
+
+def test_deep_cursor_page_uses_created_at_index(app):
+    plan = db.session.execute(text(
+        "EXPLAIN QUERY PLAN SELECT id FROM guests WHERE created_at <= :c AND (created_at < :c OR id < :i) "
+        "ORDER BY created_at DESC, id DESC LIMIT 51"
+    ), {'c': datetime(2026, 1, 1), 'i': 10}).fetchall()
+
+    assert any('ix_guests_created_at' in row[-1] for row in plan)
@@ -0,0 +1,87 @@
+from datetime import date, datetime
+import pytest
+from sqlalchemy import event as sa_event, func, text
+from app.models import db, Planner, Event, Guest, GuestState, Contact, Availability, EventDate, ArchivedEvent, JobRun
+from app.services.cascade_delete_service import CascadeDeleteService
+
+MODELS = [Planner, Event, Guest, GuestState, Contact, Availability, EventDate, ArchivedEvent]
+
+
+def _seed_planner(index, event_count):
+    planner = Planner(phone_number=f'555000{index:04d}', name=f'Planner {index}')
+    planner.save()
+    contact = Contact(planner_id=planner.id, name='Ana', phone_number=f'555100{index:04d}')
+    db.session.add(contact)
+    for e in range(event_count):
+        event = Event(planner_id=planner.id, status='planning')
+        db.session.add(event)
+        db.session.flush()
+        guest = Guest(event_id=event.id, contact_id=contact.id, name='Ana',
+                      phone_number=f'556{index:03d}{e:04d}')
+        db.session.add(guest)
+        db.session.add(GuestState(phone_number=guest.phone_number, event_id=event.id,
+                                  current_state='awaiting_availability'))
+        db.session.add(EventDate(event_id=event.id, date=date(2026, 11, 1)))
+        db.session.flush()
+        db.session.add(Availability(event_id=event.id, guest_id=guest.id, date=date(2026, 11, 1)))
+    db.session.add(ArchivedEvent(event_id=10000 + index, planner_id=planner.id, status='completed',
+                                 payload={'guests': [{'name': 'Ana', 'phone_number': f'555100{index:04d}'}]}))
+    db.session.commit()
+    return planner.id
+
+
+def _counts():
+    return {model.__tablename__: db.session.query(func.count(model.id)).scalar() for model in MODELS}
+
+
+def _statements(action):
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    sa_event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        action()
+    finally:
+        sa_event.remove(db.engine, 'before_cursor_execute', listener)
+    return statements
+
+
+@pytest.mark.parametrize('foreign_keys', [False, True])
+def test_delete_planner_removes_whole_subtree(app, foreign_keys):
+    if foreign_keys:
+        db.session.execute(text('PRAGMA foreign_keys=ON'))
+    kept_id = _seed_planner(0, event_count=2)
+    kept_counts = _counts()
+    deleted_id = _seed_planner(1, event_count=3)
+
+    assert CascadeDeleteService().delete_planners([deleted_id]) == 1
+
+    assert _counts() == kept_counts
+    assert db.session.get(Planner, kept_id) is not None
+    if foreign_keys:
+        db.session.execute(text('PRAGMA foreign_keys=OFF'))
+
+
+def test_statement_count_is_fixed(app):
+    small_id = _seed_planner(0, event_count=1)
+    large_id = _seed_planner(1, event_count=10)
+    service = CascadeDeleteService()
+
+    small = _statements(lambda: service.delete_planners([small_id]))
+    large = _statements(lambda: service.delete_planners([large_id]))
+
+    assert len(small) == len(large)
+    assert sum(s.lstrip().upper().startswith('DELETE') for s in large) == 9
+
+
+def test_delete_all_includes_availability(app):
+    _seed_planner(0, event_count=2)
+    db.session.add(JobRun(name='integrity_check', status='success', started_at=datetime(2026, 10, 19),
+                          finished_at=datetime(2026, 10, 19), duration_ms=1.0))
+    db.session.commit()
+
+    counts = CascadeDeleteService().delete_all()
+
+    assert counts['availability'] == 2
+    assert counts['archived_events'] == 1
+    assert counts['job_runs'] == 1
+    assert all(count == 0 for count in _counts().values())
@@ -0,0 +1,108 @@
+"""
+Concurrency stress tests for threaded (gthread) workers.
+
+Many conversations share one router and one set of services, as the
+threads of a single worker process do, while a stub AI call sleeps to
+stand in for OpenAI latency. The conversations must all complete and the
+AI waits must overlap rather than queue.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from app import create_app, db
+from app.config import TestingConfig
+from app.routes import sms
+from app.services.ai_processing_service import AIProcessingService
+from app.services.sms_service import SMSService
+from load_test_conversations import Results, build_conversation, run_conversation
+
+AI_LATENCY = 0.05
+
+
+@pytest.fixture
+def threaded_app(tmp_path, monkeypatch):
+    class ThreadedConfig(TestingConfig):
+        # A file database (WAL profile): shared-cache memory databases fail concurrent writers
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'threads.db'}"
+
+    ai_calls = {'in_flight': 0, 'peak': 0, 'total': 0}
+    ai_calls_lock = threading.Lock()
+
+    def slow_completion(self, prompt, max_tokens=200):
+        with ai_calls_lock:
+            ai_calls['in_flight'] += 1
+            ai_calls['total'] += 1
+            ai_calls['peak'] = max(ai_calls['peak'], ai_calls['in_flight'])
+        time.sleep(AI_LATENCY)
+        with ai_calls_lock:
+            ai_calls['in_flight'] -= 1
+        return None
+
+    monkeypatch.setattr(AIProcessingService, 'make_completion', slow_completion)
+    monkeypatch.setattr(SMSService, 'send_sms', lambda self, to_number, message: True)
+
+    app = create_app(ThreadedConfig)
+    app.ai_calls = ai_calls
+    with app.app_context():
+        db.create_all()
+    yield app
+    with app.app_context():
+        db.drop_all()
+
+
+class SharedRouterTarget:
+    """Each send runs on the calling thread with its own app context, as a gthread request does"""
+
+    def __init__(self, app):
+        self.app = app
+        with app.app_context():
+            self.router = sms.init_router()
+
+    def send(self, phone, message):
+        with self.app.app_context():
+            return self.router.route_message(phone, message)
+
+
+def test_concurrent_conversations_share_one_router(threaded_app):
+    target = SharedRouterTarget(threaded_app)
+    results = Results()
+    conversations = [build_conversation(index, 2) for index in range(8)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        for steps in conversations:
+            pool.submit(run_conversation, target, steps, results)
+
+    assert sum(results.errors.values()) == 0
+    assert results.samples == {}
+    assert results.completed == len(conversations)
+
+    # AI waits from different threads overlapped instead of running one after another
+    assert threaded_app.ai_calls['total'] > 0
+    assert threaded_app.ai_calls['peak'] > 1
+
+
+def test_router_is_built_once_under_concurrent_first_requests(app, monkeypatch):
+    built = []
+    original_init = sms.SMSRouter.__init__
+
+    def slow_init(self):
+        built.append(self)
+        # Widen the window in which a second thread could also start building
+        time.sleep(0.05)
+        original_init(self)
+
+    monkeypatch.setattr(sms, 'router', None)
+    monkeypatch.setattr(sms.SMSRouter, '__init__', slow_init)
+    barrier = threading.Barrier(8)
+
+    def first_request():
+        with app.app_context():
+            barrier.wait()
+            return sms.init_router()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        routers = list(pool.map(lambda _: first_request(), range(8)))
+
+    assert len(built) == 1
+    assert all(router is routers[0] for router in routers)
@@ -0,0 +1,79 @@
+from sqlalchemy import event as sa_event
+from app.models import db, Planner, Contact
+from app.services.contact_menu_service import ContactMenuService
+
+
+def _create_planner(contact_count):
+    planner = Planner(phone_number='5550000000', name='Pat')
+    planner.save()
+    for i in range(contact_count):
+        db.session.add(Contact(planner_id=planner.id, name=f'Friend {i:02d}', phone_number=f'55500010{i:02d}'))
+    db.session.commit()
+    return planner
+
+
+def test_menu_pages_with_stable_numbering(app):
+    planner = _create_planner(12)
+    menu = ContactMenuService(page_size=5)
+
+    first = menu.render_page(planner)
+    second = menu.render_next_page(planner)
+    third = menu.render_next_page(planner)
+
+    assert first.startswith("Contacts:\n1. Friend 00 (5550001000)\n")
+    assert "(Showing 1-5 of 12 - reply 'more' for the next page)" in first
+    assert "6. Friend 05" in second and "1. Friend 00" not in second
+    assert "11. Friend 10" in third and "(Showing 11-12 of 12)" in third
+    assert menu.render_next_page(planner) == first
+
+
+def test_more_continues_from_the_page_another_worker_showed(app):
+    planner = _create_planner(12)
+    ContactMenuService(page_size=5).render_page(planner)
+    db.session.expire_all()
+
+    # A separate cache, as in another gunicorn worker
+    other_worker = ContactMenuService(page_size=5)
+    assert "6. Friend 05" in other_worker.render_next_page(db.session.get(Planner, planner.id))
+
+    Contact(planner_id=planner.id, name='Aaron', phone_number='5550002000').save()
+    assert other_worker.render_next_page(db.session.get(Planner, planner.id)).startswith(
+        "Contacts:\n1. Aaron (5550002000)\n")
+
+
+def test_small_menu_has_no_paging_footer(app):
+    planner = _create_planner(2)
+
+    rendered = ContactMenuService(page_size=5).render_page(planner)
+
+    assert rendered == "Contacts:\n1. Friend 00 (5550001000)\n2. Friend 01 (5550001001)\n"
+
+
+def test_cached_menu_issues_no_query_until_contacts_change(app):
+    planner = _create_planner(3)
+    menu = ContactMenuService(page_size=5)
+    # The first render records the page shown on the planner row
+    menu.render_page(planner)
+    menu.render_page(planner)
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    sa_event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        menu.render_page(planner)
+    finally:
+        sa_event.remove(db.engine, 'before_cursor_execute', listener)
+    assert statements == []
+
+    Contact(planner_id=planner.id, name='Aaron', phone_number='5550002000').save()
+
+    assert menu.render_page(planner).startswith("Contacts:\n1. Aaron (5550002000)\n")
+
+
+def test_selected_numbers_resolve_across_pages(app):
+    planner = _create_planner(12)
+    menu = ContactMenuService(page_size=5)
+
+    contacts = menu.get_selected_contacts(planner, [12, 1, 7])
+
+    assert [contact.name for contact in contacts] == ['Friend 11', 'Friend 00', 'Friend 06']
@@ -0,0 +1,112 @@
+import time
+from app.models import db, Planner, Event, Contact
+from app.handlers.guest_collection_handler import GuestCollectionHandler
+from app.services import EventWorkflowService, GuestManagementService, MessageFormattingService, AIProcessingService
+from app.services.contact_menu_service import ContactMenuEntry, ContactMenuService
+from app.services.contact_search_service import ContactNameIndex, ContactSearchService
+from benchmark_contact_search import build_entries, time_lookups
+
+NAMES = ['Jess Allen', 'Jessica Brown', 'Mike Rogers', 'Mike Smith', 'Tom Hill']
+
+
+def _index(names=NAMES):
+    return ContactNameIndex([ContactMenuEntry(i + 1, name, f'55500010{i:02d}') for i, name in enumerate(names)])
+
+
+def _create_planner(names=NAMES):
+    planner = Planner(phone_number='5550000000', name='Pat')
+    planner.save()
+    for i, name in enumerate(names):
+        db.session.add(Contact(planner_id=planner.id, name=name, phone_number=f'55500010{i:02d}'))
+    db.session.commit()
+    return planner
+
+
+def test_prefix_and_multi_token_queries():
+    index = _index()
+
+    assert index.search('tom') == [4]
+    assert index.search('mike r') == [2]
+    assert index.search('Mike') == [2, 3]
+    assert index.search('jess') == [0, 1]
+    assert index.search('zed') == []
+
+
+def test_typos_fall_back_to_trigram_similarity():
+    index = _index()
+
+    assert index.search('jesica') == [1]
+    assert index.search('jessika') == [1, 0]
+    assert index.search('rodgers') == [2]
+    assert index.search('hello') == []
+
+
+def test_resolve_names_splits_terms_and_reports_ambiguity(app):
+    planner = _create_planner()
+    search = ContactSearchService(menu_service=ContactMenuService())
+
+    resolution = search.resolve_names(planner, 'add tom, mike r and jess and bob')
+
+    assert resolution.numbers == [5, 3]
+    assert resolution.ambiguous == {'jess': [1, 2]}
+    assert resolution.unmatched == ['bob']
+    assert search.resolve_names(planner, 'Tom 5551234567') is None
+
+
+def test_index_rebuilds_when_contacts_change(app):
+    planner = _create_planner()
+    search = ContactSearchService(menu_service=ContactMenuService())
+    index = search.get_index(planner)
+    assert search.get_index(planner) is index
+
+    Contact(planner_id=planner.id, name='Zoe Park', phone_number='5550002000').save()
+
+    assert search.get_index(planner) is not index
+    assert search.resolve_names(planner, 'zoe').numbers == [6]
+
+
+def test_guest_collection_adds_contacts_by_name(app):
+    planner = _create_planner()
+    event = Event(planner_id=planner.id, status='planning', workflow_stage='collecting_guests')
+    event.save()
+    handler = GuestCollectionHandler(EventWorkflowService(), GuestManagementService(),
+                                     MessageFormattingService(), AIProcessingService())
+
+    result = handler.handle_message(event, 'add tom, mike r, jess')
+
+    assert result.success
+    assert result.message.startswith('✅ Added: Mike Rogers, Tom Hill')
+    assert "'jess':\n1. Jess Allen (5550001000)\n2. Jessica Brown (5550001001)" in result.message
+    assert sorted(guest.name for guest in event.guests) == ['Mike Rogers', 'Tom Hill']
+
+
+def test_names_without_add_are_tried_only_after_the_guest_parser(app, monkeypatch):
+    planner = _create_planner()
+    event = Event(planner_id=planner.id, status='planning', workflow_stage='collecting_guests')
+    event.save()
+    handler = GuestCollectionHandler(EventWorkflowService(), GuestManagementService(),
+                                     MessageFormattingService(), AIProcessingService())
+    parsed = []
+
+    def parse_guest_input(text):
+        parsed.append(text)
+        return {'success': False, 'error': 'No guest info found'}
+
+    monkeypatch.setattr(handler, '_parse_guest_input', parse_guest_input)
+
+    # "add" names contacts outright
+    assert handler.handle_message(event, 'add tom').message.startswith('✅ Added: Tom Hill')
+    assert parsed == []
+
+    # Anything else is guest input first, and a contact name only once the parser rejects it
+    assert handler.handle_message(event, 'mike r').message.startswith('✅ Added: Mike Rogers')
+    assert parsed == ['mike r']
+
+
+def test_lookups_stay_under_a_millisecond_for_5000_contacts():
+    index = ContactNameIndex(build_entries(5000))
+    index.search('jess')
+
+    median_ms, _ = time_lookups(index, rounds=20)
+
+    assert median_ms < 1.0
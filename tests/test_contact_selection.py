@@ -0,0 +1,62 @@
+import pytest
+from sqlalchemy import event as sa_event
+from app.models import db, Planner, Event, Guest, Contact
+from app.services.guest_management_service import (
+    GuestManagementService, is_contact_selection, parse_contact_selection
+)
+
+
+@pytest.mark.parametrize('message, expected', [
+    ('2', [2]),
+    ('1,3', [1, 3]),
+    ('3, 1, 3', [1, 3]),
+    ('2-4', [2, 3, 4]),
+    ('1-2, 5', [1, 2, 5]),
+    ('all', [1, 2, 3, 4, 5]),
+    ('ALL', [1, 2, 3, 4, 5]),
+    ('1 - 5', [1, 2, 3, 4, 5]),
+])
+def test_parse_contact_selection(message, expected):
+    assert parse_contact_selection(message, 5) == expected
+
+
+@pytest.mark.parametrize('message', ['555-1234', '4-2', '4-12', '0', '1, 9', '0-3'])
+def test_selections_outside_the_menu_are_rejected(message):
+    assert is_contact_selection(message)
+    with pytest.raises(ValueError):
+        parse_contact_selection(message, 5)
+
+
+@pytest.mark.parametrize('message', ['John 5551234567', '1,', 'all of them', '1--3', ''])
+def test_non_selections_are_rejected(message):
+    assert not is_contact_selection(message)
+    with pytest.raises(ValueError):
+        parse_contact_selection(message, 5)
+
+
+def test_add_contacts_as_guests_batches_queries(app):
+    planner = Planner(phone_number='5550000000', name='Pat')
+    planner.save()
+    event = Event(planner_id=planner.id, status='planning')
+    event.save()
+    contacts = []
+    for i in range(12):
+        contact = Contact(planner_id=planner.id, name=f'Friend {i:02d}', phone_number=f'55500010{i:02d}')
+        db.session.add(contact)
+        contacts.append(contact)
+    db.session.add(Guest(event_id=event.id, name='Friend 03', phone_number='5550001003'))
+    db.session.commit()
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    sa_event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        added = GuestManagementService().add_contacts_as_guests(event, contacts)
+    finally:
+        sa_event.remove(db.engine, 'before_cursor_execute', listener)
+
+    assert len(added) == 11
+    assert 'Friend 03' not in [guest.name for guest in added]
+    assert sum(statement.startswith('INSERT INTO guests') for statement in statements) == 1
+    assert sum(statement.startswith('SELECT guests') for statement in statements) == 2
+    assert event.get_response_counts()['total'] == 12
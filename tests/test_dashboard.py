@@ -0,0 +1,63 @@
+import pytest
+from sqlalchemy import event as sa_event
+from app.models import db, Planner, Event, Guest, Contact
+
+
+def _seed(planner_count, events_per_planner=3, first=0):
+    for p in range(first, first + planner_count):
+        planner = Planner(phone_number=f'555000{p:04d}', name=f'Planner {p}')
+        db.session.add(planner)
+        db.session.flush()
+        contact = Contact(planner_id=planner.id, name=f'Friend {p}', phone_number=f'555100{p:04d}')
+        db.session.add(contact)
+        db.session.flush()
+        for e in range(events_per_planner):
+            stage = 'collecting_guests' if e else 'final_confirmation'
+            event = Event(planner_id=planner.id, workflow_stage=stage, status='planning')
+            db.session.add(event)
+            db.session.flush()
+            db.session.add(Guest(event_id=event.id, contact_id=contact.id, name=contact.name,
+                                 phone_number=contact.phone_number))
+    db.session.commit()
+
+
+def _statement_count(client, url):
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    sa_event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        response = client.get(url)
+    finally:
+        sa_event.remove(db.engine, 'before_cursor_execute', listener)
+    assert response.status_code == 200
+    html = response.get_data(as_text=True)
+    assert 'Error loading' not in html
+    return len(statements), html
+
+
+@pytest.mark.parametrize('url', ['/dashboard/', '/dashboard/events', '/dashboard/planners', '/dashboard/contacts'])
+def test_query_count_does_not_grow_with_rows(app, client, url):
+    _seed(3)
+    small_count, _ = _statement_count(client, url)
+
+    _seed(20, first=3)
+    db.session.expire_all()
+    large_count, _ = _statement_count(client, url)
+
+    assert large_count == small_count
+
+
+def test_pages_show_grouped_counts_and_pagination(app, client):
+    app.config['DASHBOARD_PAGE_SIZE'] = 2
+    _seed(3)
+
+    _, index_html = _statement_count(client, '/dashboard/')
+    _, planners_html = _statement_count(client, '/dashboard/planners?page=2')
+    _, contacts_html = _statement_count(client, '/dashboard/contacts')
+
+    assert 'Collecting Guests (6)' in index_html
+    assert 'Final Confirmation (3)' in index_html
+    assert 'Page 2 of 2 (3 total)' in planners_html
+    assert '<span class="badge bg-primary">3</span>' in planners_html
+    assert '3 events' in contacts_html
+    assert 'Page 1 of 2 (3 total)' in contacts_html
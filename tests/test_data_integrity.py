@@ -0,0 +1,70 @@
+from datetime import date, time, datetime, timedelta
+from app.models import db, Planner, Event, Guest, Availability
+from app.services.data_integrity_service import DataIntegrityService
+
+
+def _create_guest(name='Ana', phone='5550000001'):
+    planner = Planner.query.first()
+    if not planner:
+        planner = Planner(phone_number='5550000000', name='Pat')
+        planner.save()
+    event = Event(planner_id=planner.id, status='planning')
+    event.save()
+    guest = Guest(event_id=event.id, name=name, phone_number=phone, availability_provided=True)
+    guest.save()
+    return event, guest
+
+
+def _add_availability(guest, event_id, end, day=date(2025, 8, 1)):
+    record = Availability(event_id=event_id, guest_id=guest.id, date=day,
+                          start_time=time(14, 0), end_time=end)
+    db.session.add(record)
+    db.session.commit()
+    return record
+
+
+def test_duplicate_availability_keeps_best_record(app):
+    event, guest = _create_guest()
+    _add_availability(guest, event.id, time(23, 59))
+    evening_id = _add_availability(guest, event.id, time(18, 0)).id
+    _add_availability(guest, event.id, time(15, 0))
+    other_day_id = _add_availability(guest, event.id, time(15, 0), day=date(2025, 8, 2)).id
+
+    results = DataIntegrityService(batch_size=1).check_and_fix_all_issues()
+
+    assert results['duplicate_availability'] == 2
+    remaining = {record.id for record in Availability.query.all()}
+    assert remaining == {evening_id, other_day_id}
+
+
+def test_wrong_event_and_orphaned_records_are_fixed(app):
+    event, guest = _create_guest()
+    _, other_guest = _create_guest('Ben', '5550000002')
+    misplaced_id = _add_availability(guest, other_guest.event_id, time(18, 0)).id
+    orphan = Availability(event_id=event.id, guest_id=9999, date=date(2025, 8, 1),
+                          start_time=time(14, 0), end_time=time(18, 0))
+    db.session.add(orphan)
+    db.session.commit()
+
+    results = DataIntegrityService().check_and_fix_all_issues()
+
+    assert results['wrong_event_availability'] == 1
+    assert results['orphaned_availability'] == 1
+    assert db.session.get(Availability, misplaced_id).event_id == event.id
+
+
+def test_incremental_run_skips_rows_older_than_high_water_mark(app):
+    event, guest = _create_guest()
+    service = DataIntegrityService()
+    service.check_and_fix_all_issues()
+
+    # A duplicate pair last touched well before the previous run
+    old = datetime.utcnow() - timedelta(days=1)
+    for end in (time(15, 0), time(18, 0)):
+        _add_availability(guest, event.id, end)
+    Availability.query.update({'updated_at': old}, synchronize_session=False)
+    Guest.query.update({'updated_at': old}, synchronize_session=False)
+    db.session.commit()
+
+    assert service.check_and_fix_all_issues()['duplicate_availability'] == 0
+    assert service.check_and_fix_all_issues(full=True)['duplicate_availability'] == 1
@@ -0,0 +1,73 @@
+from app.models import db, Planner, Event, Guest
+from app.services.data_integrity_service import DataIntegrityService
+
+
+def _create_event():
+    planner = Planner(phone_number='5550000000', name='Pat')
+    planner.save()
+    event = Event(planner_id=planner.id, status='planning')
+    event.save()
+    return event
+
+
+def _add_guest(event, name, phone, **kwargs):
+    guest = Guest(event_id=event.id, name=name, phone_number=phone, **kwargs)
+    guest.save()
+    return guest
+
+
+def test_counters_follow_guest_inserts_and_deletes(app):
+    event = _create_event()
+
+    _add_guest(event, 'Ana', '5550000001')
+    bob = _add_guest(event, 'Bob', '5550000002', availability_provided=True)
+    assert event.get_response_counts() == {'total': 2, 'availability_responded': 1, 'rsvp_responded': 0}
+
+    bob.delete()
+    assert event.guests_total == 1
+    assert event.availability_responded == 0
+
+
+def test_counters_follow_availability_and_rsvp_changes(app):
+    event = _create_event()
+    guest = _add_guest(event, 'Ana', '5550000001')
+
+    guest.availability_provided = True
+    guest.rsvp_status = 'maybe'
+    guest.save()
+    assert (event.availability_responded, event.rsvp_maybe) == (1, 1)
+
+    guest.rsvp_status = 'yes'
+    guest.save()
+    assert (event.rsvp_yes, event.rsvp_no, event.rsvp_maybe) == (1, 0, 0)
+
+    guest.availability_provided = False
+    guest.save()
+    assert event.availability_responded == 0
+
+
+def test_counters_move_with_guest_between_events(app):
+    first = _create_event()
+    second = Event(planner_id=first.planner_id, status='planning')
+    second.save()
+    guest = _add_guest(first, 'Ana', '5550000001', availability_provided=True)
+
+    guest.event_id = second.id
+    guest.save()
+
+    assert (first.guests_total, first.availability_responded) == (0, 0)
+    assert (second.guests_total, second.availability_responded) == (1, 1)
+
+
+def test_reconcile_repairs_counter_drift(app):
+    event = _create_event()
+    _add_guest(event, 'Ana', '5550000001', availability_provided=True, rsvp_status='no')
+    Event.query.filter_by(id=event.id).update({'guests_total': 7, 'rsvp_no': 0})
+    db.session.commit()
+
+    fixed = DataIntegrityService().reconcile_event_counters()
+
+    assert fixed == 1
+    event = db.session.get(Event, event.id)
+    assert (event.guests_total, event.availability_responded, event.rsvp_no) == (1, 1, 1)
+    assert DataIntegrityService().reconcile_event_counters() == 0
@@ -0,0 +1,44 @@
+from datetime import date
+from app.models import db, Planner, Event, EventDate
+from app.services.message_formatting_service import MessageFormattingService
+
+
+def _create_event():
+    planner = Planner(phone_number='5550000000', name='Pat')
+    planner.save()
+    event = Event(planner_id=planner.id, status='planning')
+    event.save()
+    return event
+
+
+def test_set_proposed_dates_stores_sorted_unique_rows(app):
+    event = _create_event()
+
+    event.set_proposed_dates(['2025-08-02', '2025-08-01', 'not a date', '2025-08-02'])
+    event.save()
+
+    assert event.get_proposed_dates() == [date(2025, 8, 1), date(2025, 8, 2)]
+    assert EventDate.query.filter_by(event_id=event.id).count() == 2
+
+
+def test_changing_dates_replaces_rows(app):
+    event = _create_event()
+    event.set_proposed_dates(['2025-08-01', '2025-08-02'])
+    event.save()
+
+    event.set_proposed_dates(['2025-08-02', '2025-08-09'])
+    event.save()
+
+    assert event.get_proposed_dates() == [date(2025, 8, 2), date(2025, 8, 9)]
+    assert EventDate.query.count() == 2
+
+
+def test_confirmation_menu_lists_each_date(app):
+    event = _create_event()
+    event.set_proposed_dates(['2025-08-01', '2025-08-02'])
+    event.notes = "Proposed dates: Friday and Saturday"
+    event.save()
+
+    menu = MessageFormattingService().format_planner_confirmation_menu(event)
+
+    assert "- Friday, August 1\n- Saturday, August 2\n" in menu
@@ -0,0 +1,92 @@
+from datetime import date, datetime, time, timedelta
+import pytest
+from sqlalchemy import func
+from app.models import db, Planner, Event, Guest, GuestState, Availability, EventDate, ArchivedEvent
+from app.services.event_retention_service import EventRetentionService
+
+NOW = datetime(2026, 10, 1, 12, 0)
+
+
+def _create_event(planner, status, age_days, guest_count=2):
+    event = Event(planner_id=planner.id, status=status, title=f'{status} {age_days}d',
+                  selected_start_time=time(19, 30))
+    event.save()
+    for i in range(guest_count):
+        guest = Guest(event_id=event.id, name=f'Guest {i}', phone_number=f'556{event.id:03d}{i:04d}',
+                      availability_provided=True)
+        db.session.add(guest)
+        db.session.flush()
+        db.session.add(Availability(event_id=event.id, guest_id=guest.id, date=date(2026, 9, 5),
+                                    start_time=time(18, 0), end_time=time(22, 0)))
+        db.session.add(GuestState(phone_number=guest.phone_number, event_id=event.id,
+                                  current_state='awaiting_availability', state_data={'step': i}))
+    event.set_proposed_dates(['2026-09-05'])
+    db.session.commit()
+    # Backdate after the writes above have bumped updated_at
+    db.session.query(Event).filter_by(id=event.id).update(
+        {'updated_at': NOW - timedelta(days=age_days)}, synchronize_session=False
+    )
+    db.session.commit()
+    return event.id
+
+
+def _count(model):
+    return db.session.query(func.count(model.id)).scalar()
+
+
+@pytest.fixture
+def planner(app):
+    planner = Planner(phone_number='5550000000', name='Pat')
+    planner.save()
+    return planner
+
+
+def test_archives_expired_events_in_batches(planner):
+    cancelled = _create_event(planner, 'cancelled', age_days=40)
+    finalized = _create_event(planner, 'finalized', age_days=31)
+    idle = _create_event(planner, 'planning', age_days=100)
+    recent_cancelled = _create_event(planner, 'cancelled', age_days=5)
+    active = _create_event(planner, 'planning', age_days=40)
+
+    archived = EventRetentionService(retention_days=30, idle_retention_days=90, batch_size=2)\
+        .archive_expired_events(now=NOW)
+
+    assert archived == 3
+    assert sorted(a.event_id for a in ArchivedEvent.query) == sorted([cancelled, finalized, idle])
+    assert sorted(e.id for e in Event.query) == sorted([recent_cancelled, active])
+    assert _count(Guest) == _count(Availability) == _count(GuestState) == 4
+    assert _count(EventDate) == 2
+
+
+def test_restore_round_trips_event_rows(planner):
+    event_id = _create_event(planner, 'cancelled', age_days=40)
+    before = {model: _count(model) for model in [Guest, Availability, GuestState, EventDate]}
+    service = EventRetentionService(retention_days=30)
+    service.archive_expired_events(now=NOW)
+
+    restored = service.restore_event(event_id)
+
+    assert restored.title == 'cancelled 40d'
+    assert restored.selected_start_time == time(19, 30)
+    assert restored.get_response_counts()['total'] == 2
+    assert restored.get_proposed_dates() == [date(2026, 9, 5)]
+    assert {model: _count(model) for model in before} == before
+    assert GuestState.query.first().state_data in ({'step': 0}, {'step': 1})
+    assert Availability.query.first().start_time == time(18, 0)
+    assert _count(ArchivedEvent) == 0
+
+
+def test_restore_skips_guest_states_taken_by_newer_conversations(planner):
+    newer_event_id = _create_event(planner, 'planning', age_days=0, guest_count=0)
+    event_id = _create_event(planner, 'cancelled', age_days=40, guest_count=1)
+    service = EventRetentionService(retention_days=30)
+    service.archive_expired_events(now=NOW)
+    db.session.add(GuestState(phone_number=f'556{event_id:03d}0000', event_id=newer_event_id,
+                              current_state='awaiting_availability'))
+    db.session.commit()
+
+    service.restore_event(event_id)
+
+    assert GuestState.query.filter_by(event_id=event_id).count() == 0
+    with pytest.raises(ValueError):
+        service.restore_event(event_id)
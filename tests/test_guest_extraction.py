@@ -0,0 +1,99 @@
+import pytest
+from app.handlers.add_guest_handler import AddGuestHandler
+from app.handlers.guest_collection_handler import GuestCollectionHandler
+from app.models import Planner, Event, Guest
+from app.services import EventWorkflowService, GuestManagementService, MessageFormattingService, AIProcessingService
+from app.utils.phone import extract_guests_from_text, format_phone_for_twilio, normalize_phone, to_e164
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('John 5105935336', [('John', '5105935336')]),
+    ('Mary Smith, 111-555-1234', [('Mary Smith', '1115551234')]),
+    ('Aaron(9145606464)', [('Aaron', '9145606464')]),
+    ('Bob Smith(555)1234567', [('Bob Smith', '5551234567')]),
+    ('Mike (555) 123-4567', [('Mike', '5551234567')]),
+    ('Lisa 555.123.4567', [('Lisa', '5551234567')]),
+    ('Tom,5551234567', [('Tom', '5551234567')]),
+    ('Alice:555-123-4567', [('Alice', '5551234567')]),
+    ('Mary 555 123 4567', [('Mary', '5551234567')]),
+    ('John Doe, +1 914 560 6464', [('John Doe', '9145606464')]),
+    ('555-123-4567 John Smith', [('John Smith', '5551234567')]),
+    ('John 555-123-4567 and Mary (555) 987-6543', [('John', '5551234567'), ('Mary', '5559876543')]),
+    ('Ann 1-914-560-6464\nBen 914 560 6465', [('Ann', '9145606464'), ('Ben', '9145606465')]),
+    ('Amy +44 20 7946 0958', [('Amy', '+442079460958')]),
+    ('Hans +49 30 123456', [('Hans', '+4930123456')]),
+    ('1. John 555-123-4567', [('John', '5551234567')]),
+    ('1) Ann 914 560 6464\n2) Ben 914 560 6465', [('Ann', '9145606464'), ('Ben', '9145606465')]),
+])
+def test_extracts_well_formed_guests(text, expected):
+    guests = extract_guests_from_text(text)
+
+    assert [(guest['name'], guest['phone']) for guest in guests] == expected
+
+
+@pytest.mark.parametrize('text', [
+    'Sarah and Mike',
+    'hello',
+    'Jane - 555-1234',
+    '5551234567',
+    'John 5551234567, 5559876543',
+])
+def test_leaves_ambiguous_input_unparsed(text):
+    assert extract_guests_from_text(text) == []
+
+
+@pytest.mark.parametrize('phone, e164', [
+    ('(555) 123-4567', '+15551234567'),
+    ('1 914 560 6464', '+19145606464'),
+    ('+44 20 7946 0958', '+442079460958'),
+    # Digits with their country code, as normalize_phone stores them
+    ('442079460958', '+442079460958'),
+    ('+49 30 123456', '+4930123456'),
+    ('555-12', ''),
+])
+def test_phones_normalize_to_e164_without_guessing_a_us_prefix(phone, e164):
+    assert to_e164(phone) == e164
+    assert format_phone_for_twilio(phone) == e164
+    assert normalize_phone(phone) == (e164[1:] or '55512')
+
+
+def test_short_local_numbers_normalize_to_their_digits():
+    assert normalize_phone('555-1234') == '5551234'
+    assert normalize_phone('5551234') == '5551234'
+
+
+class ExplodingAIService:
+    def make_completion(self, prompt, max_tokens=200):
+        raise AssertionError("AI should not be called for well-formed guest input")
+
+
+def test_guest_collection_skips_ai_for_structured_input():
+    handler = GuestCollectionHandler(None, None, None, ExplodingAIService())
+
+    result = handler._parse_guest_input('John Doe, 555-123-4567 and Mary 5559876543')
+
+    assert result == {'success': True, 'guests': [
+        {'name': 'John Doe', 'phone': '5551234567'},
+        {'name': 'Mary', 'phone': '5559876543'},
+    ]}
+
+
+def test_add_guest_adds_every_guest_in_the_message(app):
+    planner = Planner(phone_number='5550000000', name='Pat')
+    planner.save()
+    event = Event(planner_id=planner.id, status='planning', workflow_stage='adding_guest',
+                  previous_workflow_stage='awaiting_confirmation')
+    event.save()
+    handler = AddGuestHandler(EventWorkflowService(), GuestManagementService(),
+                              MessageFormattingService(), AIProcessingService(), None)
+
+    result = handler.handle_message(event, 'John 555-123-4567 and Amy +44 20 7946 0958')
+
+    assert result.success
+    assert result.message.startswith('✅ Added John, Amy!')
+    assert sorted(guest.phone_number for guest in Guest.query) == ['+15551234567', '+442079460958']
+
+    result = handler.handle_message(event, 'John 555-123-4567 and Mary 555 987 6543')
+
+    assert 'Already on the event: John' in result.message
+    assert Guest.query.count() == 3
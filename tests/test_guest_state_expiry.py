@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta
+from app.models import db, Planner, Event, GuestState
+from app.routes.sms import SMSRouter
+from app.services.data_integrity_service import DataIntegrityService
+
+GUEST = '5551112222'
+
+
+def _create_state(phone_number=GUEST, expired=False):
+    planner = Planner(phone_number='5550000000', name='Pat')
+    planner.save()
+    event = Event(planner_id=planner.id, status='planning', workflow_stage='collecting_availability')
+    event.save()
+    state = GuestState(phone_number=phone_number, event_id=event.id, current_state='awaiting_availability')
+    state.save()
+    if expired:
+        db.session.query(GuestState).filter_by(id=state.id).update(
+            {'expires_at': datetime.utcnow() - timedelta(minutes=1)}, synchronize_session=False
+        )
+        db.session.commit()
+    return state
+
+
+def test_writes_push_expiry_forward(app):
+    app.config['GUEST_STATE_TTL_HOURS'] = 2
+    state = _create_state()
+    first_expiry = state.expires_at
+
+    assert timedelta(hours=1, minutes=59) < first_expiry - datetime.utcnow() <= timedelta(hours=2)
+
+    state.current_state = 'awaiting_rsvp'
+    state.save()
+
+    assert state.expires_at > first_expiry
+    assert GuestState.find_active(GUEST) is not None
+
+
+def test_router_treats_expired_state_as_planner(app):
+    _create_state(expired=True)
+
+    SMSRouter().route_message(GUEST, 'hi')
+
+    assert GuestState.find_active(GUEST) is None
+    assert Planner.query.filter_by(phone_number=GUEST).first() is not None
+
+
+def test_sweeper_deletes_only_expired_states_in_batches(app):
+    state = _create_state(expired=True)
+    event_id = state.event_id
+    for i in range(4):
+        db.session.add(GuestState(phone_number=f'555200000{i}', event_id=event_id,
+                                  current_state='awaiting_availability'))
+    db.session.commit()
+    db.session.query(GuestState).filter(GuestState.phone_number.like('5552%')).filter(
+        GuestState.phone_number != '5552000003'
+    ).update({'expires_at': datetime.utcnow() - timedelta(hours=1)}, synchronize_session=False)
+    db.session.commit()
+
+    assert DataIntegrityService(batch_size=2).sweep_expired_guest_states() == 4
+    assert [s.phone_number for s in GuestState.query] == ['5552000003']
+
+
+def test_expired_states_are_not_integrity_issues(app):
+    _create_state(expired=True)
+
+    results = DataIntegrityService().check_and_fix_all_issues()
+
+    # Routine expiry must not make a healthy database look broken
+    assert sum(results.values()) == 0
+    assert GuestState.query.count() == 1
@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta
+import pytest
+from app.models import db, JobLease, JobRun
+from app.services.job_scheduler_service import CronSchedule, JobScheduler, prune_job_runs
+
+NOW = datetime(2026, 10, 19, 12, 0)
+
+
+def test_cron_schedule_next_times():
+    assert CronSchedule('30 3 * * *').next_after(NOW) == datetime(2026, 10, 20, 3, 30)
+    assert CronSchedule('*/15 * * * *').next_after(datetime(2026, 10, 19, 12, 7, 30)) == datetime(2026, 10, 19, 12, 15)
+    # 2026-10-19 is a Monday; 0 is Sunday
+    assert CronSchedule('0 9 * * 0').next_after(NOW) == datetime(2026, 10, 25, 9, 0)
+    assert CronSchedule('0 0 1 1 *').next_after(NOW) == datetime(2027, 1, 1, 0, 0)
+    with pytest.raises(ValueError):
+        CronSchedule('61 * * * *')
+
+
+def test_exclusive_job_runs_once_across_schedulers(app):
+    calls = []
+    schedulers = [JobScheduler(owner=f'worker-{i}') for i in range(2)]
+    for scheduler in schedulers:
+        scheduler.register('sweep', lambda: calls.append(1) or len(calls), every=timedelta(minutes=5))
+
+    for scheduler in schedulers:
+        scheduler.run_pending(NOW)
+
+    assert len(calls) == 1
+    lease = JobLease.query.filter_by(name='sweep').one()
+    assert lease.owner is None and lease.next_run_at == NOW + timedelta(minutes=5)
+    # The loser adopts the shared next run instead of its own clock
+    assert schedulers[1].jobs['sweep'].next_run_at == lease.next_run_at
+
+    for scheduler in schedulers:
+        scheduler.run_pending(NOW + timedelta(minutes=5))
+    assert len(calls) == 2
+
+
+def test_held_lease_blocks_until_it_lapses(app):
+    db.session.add(JobLease(name='sweep', owner='crashed', locked_until=NOW + timedelta(minutes=1)))
+    db.session.commit()
+    scheduler = JobScheduler(owner='worker')
+    scheduler.register('sweep', lambda: 'ok', every=timedelta(minutes=5), lease_seconds=60)
+
+    assert scheduler.run_job('sweep', NOW) is None
+    assert scheduler.run_job('sweep', NOW + timedelta(minutes=2)).status == 'success'
+
+
+def test_forced_run_ignores_the_schedule_but_not_the_lease(app):
+    db.session.add(JobLease(name='sweep', next_run_at=NOW + timedelta(minutes=5)))
+    db.session.commit()
+    scheduler = JobScheduler(owner='worker')
+    scheduler.register('sweep', lambda: 'ok', every=timedelta(minutes=5), lease_seconds=60)
+
+    assert scheduler.run_job('sweep', NOW) is None
+    assert scheduler.run_job('sweep', NOW, force=True).status == 'success'
+
+    JobLease.query.filter_by(name='sweep').update({'owner': 'other', 'locked_until': NOW + timedelta(minutes=1)})
+    db.session.commit()
+    assert scheduler.run_job('sweep', NOW, force=True) is None
+
+
+def test_runs_are_recorded_with_duration_and_errors(app):
+    scheduler = JobScheduler(owner='worker')
+    scheduler.register('ok', lambda: {'fixed': 2}, every=timedelta(minutes=1))
+
+    @scheduler.register('broken', cron='* * * * *')
+    def broken():
+        raise RuntimeError('boom')
+
+    scheduler.run_job('ok', NOW)
+    scheduler.run_job('broken', NOW)
+
+    runs = {run.name: run for run in JobRun.query}
+    assert runs['ok'].status == 'success' and runs['ok'].result == "{'fixed': 2}"
+    assert runs['ok'].duration_ms >= 0
+    assert runs['broken'].status == 'failed' and runs['broken'].error == 'RuntimeError: boom'
+    # A failed run still releases the lease and schedules the next one
+    assert JobLease.query.filter_by(name='broken').one().next_run_at == datetime(2026, 10, 19, 12, 1)
+
+    assert prune_job_runs(now=NOW + timedelta(days=15), history_days=14) == 2
+
+
+def test_cache_warming_runs_in_web_workers_not_the_maintenance_process():
+    from app.services.job_scheduler_service import get_job_scheduler, register_default_jobs, register_worker_jobs
+
+    maintenance = register_default_jobs(JobScheduler(owner='scheduler'))
+    worker = register_worker_jobs(JobScheduler(owner='web'))
+
+    assert 'contact_menu_warm' not in maintenance.jobs
+    assert all(job.exclusive for job in maintenance.jobs.values())
+    assert list(worker.jobs) == ['contact_menu_warm']
+    assert not worker.jobs['contact_menu_warm'].exclusive
+    assert set(get_job_scheduler().jobs) == set(maintenance.jobs) | set(worker.jobs)
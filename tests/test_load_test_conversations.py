@@ -0,0 +1,30 @@
+from app.routes.sms import SMSRouter
+from app.services.ai_processing_service import AIProcessingService
+from app.services.sms_service import SMSService
+from load_test_conversations import Results, build_conversation, run_conversation, summarize
+
+
+class RouterTarget:
+    def __init__(self):
+        self.router = SMSRouter()
+
+    def send(self, phone, message):
+        return self.router.route_message(phone, message)
+
+
+def test_scripted_conversations_complete(app, monkeypatch):
+    monkeypatch.setattr(AIProcessingService, 'make_completion', lambda self, prompt, max_tokens=200: None)
+    monkeypatch.setattr(SMSService, 'send_sms', lambda self, to_number, message: True)
+    app.config['NOTIFICATION_DIGEST_WINDOW_SECONDS'] = 0
+
+    results = Results()
+    target = RouterTarget()
+    for index in range(2):
+        run_conversation(target, build_conversation(index, 2), results)
+
+    report = summarize(results, 1.0, {'planners': 2})
+    assert report['totals']['errors'] == 0
+    assert report['unexpected_samples'] == {}
+    assert report['totals']['completed_conversations'] == 2
+    assert report['stages']['guest_rsvp']['count'] == 4
+    assert report['stages']['add_guest']['p50_ms'] <= report['stages']['add_guest']['p99_ms']
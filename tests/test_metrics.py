@@ -0,0 +1,77 @@
+import os
+import time
+from app.services.metrics_service import Histogram, MetricsRegistry, MultiprocessStore, span, track_request
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram('demo_seconds', 'Demo', ('phase',), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5):
+        histogram.observe(value, phase='db')
+
+    lines = histogram.render()
+
+    assert 'demo_seconds_bucket{phase="db",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{phase="db",le="1.0"} 2' in lines
+    assert 'demo_seconds_bucket{phase="db",le="+Inf"} 3' in lines
+    assert 'demo_seconds_count{phase="db"} 3' in lines
+
+
+def test_nested_spans_count_only_their_own_time():
+    with track_request() as timings:
+        with span('formatting'):
+            time.sleep(0.02)
+            with span('db'):
+                time.sleep(0.03)
+
+    assert 0.02 <= timings.summary['formatting'] < 0.03
+    assert timings.summary['db'] >= 0.03
+    assert timings.summary['total'] >= timings.summary['formatting'] + timings.summary['db']
+
+
+def test_webhook_feeds_metrics_endpoint(client):
+    client.post('/sms/webhook', data={'From': '+15557770001', 'Body': 'hello'})
+    client.post('/sms/webhook', data={'From': '+15557770001', 'Body': 'Sam'})
+
+    body = client.get('/metrics').get_data(as_text=True)
+
+    assert '# TYPE sms_request_duration_seconds histogram' in body
+    assert 'sms_request_phase_duration_seconds_count{phase="db",workflow_stage="collecting_name",handler="NameCollection"}' in body
+    db_sum = [line for line in body.splitlines()
+              if line.startswith('sms_request_phase_duration_seconds_sum{phase="db",workflow_stage="collecting_name"')]
+    assert float(db_sum[0].split()[-1]) > 0
+
+
+def test_metrics_token_is_required_when_configured(app, client):
+    app.config['METRICS_TOKEN'] = 'secret'
+
+    assert client.get('/metrics').status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer secret'}).status_code == 200
+
+
+def test_workers_share_histograms_through_the_store(tmp_path, monkeypatch):
+    store = MultiprocessStore(str(tmp_path))
+    for pid, values in ((101, [0.05]), (102, [0.5, 5])):
+        registry = MetricsRegistry()
+        histogram = registry.histogram('demo_seconds', 'Demo', ('phase',), buckets=(0.1, 1.0))
+        for value in values:
+            histogram.observe(value, phase='db')
+        monkeypatch.setattr(os, 'getpid', lambda: pid)
+        store.write(registry)
+
+    body = registry.render(store.read())
+
+    assert 'demo_seconds_bucket{phase="db",le="0.1"} 1' in body
+    assert 'demo_seconds_count{phase="db"} 3' in body
+    # An exited worker's counts stay in the totals
+    store.mark_process_dead(101)
+    assert not os.path.exists(tmp_path / 'metrics_101.json')
+    assert registry.render(store.read()) == body
+
+
+def test_webhook_publishes_to_the_shared_store(app, client, tmp_path):
+    app.config['METRICS_MULTIPROC_DIR'] = str(tmp_path)
+
+    client.post('/sms/webhook', data={'From': '+15557770002', 'Body': 'hello'})
+
+    assert (tmp_path / f'metrics_{os.getpid()}.json').exists()
+    assert 'sms_request_duration_seconds_count' in client.get('/metrics').get_data(as_text=True)
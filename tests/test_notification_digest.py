@@ -0,0 +1,117 @@
+from app.models import db, Planner, Event, Guest
+from app.services.notification_digest_service import NotificationDigestService, get_response_counts
+
+
+class RecordingSMSService:
+    """Collects outbound messages instead of sending them"""
+
+    def __init__(self):
+        self.sent = []
+
+    def send_sms(self, to_number, message):
+        self.sent.append((to_number, message))
+        return True
+
+
+def _create_event(guest_count=5, responded=0):
+    planner = Planner(phone_number='5550000000', name='Pat')
+    planner.save()
+    event = Event(planner_id=planner.id, workflow_stage='collecting_availability', status='planning')
+    event.save()
+    for i in range(guest_count):
+        db.session.add(Guest(
+            event_id=event.id,
+            name=f'Guest {i}',
+            phone_number=f'555000{i:04d}',
+            availability_provided=i < responded
+        ))
+    db.session.commit()
+    return event
+
+
+def test_response_counts_read_event_counters(app):
+    event = _create_event(guest_count=4, responded=3)
+
+    counts = get_response_counts(event.id)
+
+    assert counts == {'total': 4, 'availability_responded': 3, 'rsvp_responded': 0}
+
+
+def test_availability_responses_coalesce_into_one_digest(app):
+    event = _create_event(guest_count=5, responded=3)
+    sms = RecordingSMSService()
+    digest = NotificationDigestService(window_seconds=3600, sms_service=sms)
+
+    for name in ['Ana', 'Ben', 'Cy']:
+        digest.add_availability_response(event.id, '5550000000', name)
+
+    assert sms.sent == []
+    assert digest.pending_count() == 1
+
+    assert digest.flush_all() == 1
+    assert len(sms.sent) == 1
+    to_number, message = sms.sent[0]
+    assert to_number == '5550000000'
+    assert 'Ana, Ben and Cy have provided their availability!' in message
+    assert '3/5 guests have responded' in message
+    assert 'Waiting for 2 more guests' in message
+
+
+def test_final_response_flushes_immediately(app):
+    event = _create_event(guest_count=2, responded=2)
+    sms = RecordingSMSService()
+    digest = NotificationDigestService(window_seconds=3600, sms_service=sms)
+
+    digest.add_availability_response(event.id, '5550000000', 'Ana')
+    digest.add_availability_response(event.id, '5550000000', 'Ben',
+                                     counts=get_response_counts(event.id), final=True)
+
+    assert digest.pending_count() == 0
+    assert len(sms.sent) == 1
+    assert 'Ana and Ben have provided their availability!' in sms.sent[0][1]
+    assert 'Everyone has responded!' in sms.sent[0][1]
+
+
+def test_zero_window_sends_single_response_unchanged(app):
+    event = _create_event(guest_count=3, responded=1)
+    sms = RecordingSMSService()
+    digest = NotificationDigestService(window_seconds=0, sms_service=sms)
+
+    digest.add_availability_response(event.id, '5550000000', 'Ana')
+
+    assert len(sms.sent) == 1
+    assert sms.sent[0][1].startswith('✅ Ana has provided their availability!')
+
+
+def test_rsvp_digest_keeps_latest_answer_per_guest(app):
+    event = _create_event(guest_count=3)
+    for guest in Guest.query.filter_by(event_id=event.id):
+        guest.rsvp_status = 'yes'
+    db.session.commit()
+    sms = RecordingSMSService()
+    digest = NotificationDigestService(window_seconds=3600, sms_service=sms)
+
+    digest.add_rsvp_response(event.id, '5550000000', 'Ana', 'maybe')
+    digest.add_rsvp_response(event.id, '5550000000', 'Ben', 'no')
+    digest.add_rsvp_response(event.id, '5550000000', 'Ana', 'yes')
+    digest.flush_all()
+
+    message = sms.sent[0][1]
+    assert '👍 Ana is going!' in message
+    assert '❌ Ben declined!' in message
+    assert 'responded maybe' not in message
+    assert 'Everyone has responded to your event!' in message
+
+
+def test_pending_digests_are_sent_when_the_process_exits(app, monkeypatch):
+    from app.services import notification_digest_service
+
+    event = _create_event(guest_count=3)
+    sms = RecordingSMSService()
+    digest = NotificationDigestService(window_seconds=3600, sms_service=sms)
+    monkeypatch.setattr(notification_digest_service, '_digest_service', digest)
+    digest.add_availability_response(event.id, '5550000000', 'Ana')
+
+    assert notification_digest_service.flush_pending_digests() == 1
+    assert sms.sent[0][1].startswith('✅ Ana has provided their availability!')
+    assert notification_digest_service.flush_pending_digests() == 0
@@ -0,0 +1,68 @@
+import benchmark_overlaps
+from benchmark_overlaps import (
+    ALGORITHMS, build_cases, compare, generate_availability, merge_runs, remeasure_regressions,
+)
+
+
+def _shape(rows):
+    return [(r.guest_id, r.date, r.start_time, r.end_time, r.all_day) for r in rows]
+
+
+def test_generator_is_seeded():
+    first = generate_availability(guests=6, dates=3, windows=2, all_day_share=0.3, seed=4)
+    again = generate_availability(guests=6, dates=3, windows=2, all_day_share=0.3, seed=4)
+    other = generate_availability(guests=6, dates=3, windows=2, all_day_share=0.3, seed=5)
+
+    assert _shape(first) == _shape(again)
+    assert _shape(first) != _shape(other)
+    assert {r.date for r in first} and all(r.start_time < r.end_time for r in first)
+
+
+def test_every_algorithm_runs_on_generated_data():
+    cases = build_cases(generate_availability(guests=5, dates=2, all_day_share=0.2, seed=1))
+
+    assert sorted(cases) == sorted(ALGORITHMS)
+    for run in cases.values():
+        run()
+    assert any(day for day in cases['calculate_time_overlap']())
+
+
+def test_compare_flags_regressions_after_normalizing_for_machine_speed():
+    baseline = {'calibration_us': 1000.0, 'results': {'small/a': 100.0, 'small/b': 100.0}}
+    # Twice as slow a machine: a only tracks the machine, b regressed on top of that
+    current = {'calibration_us': 2000.0, 'results': {'small/a': 210.0, 'small/b': 400.0, 'new/c': 5.0}}
+
+    rows = {case: (ratio, regressed) for case, _, _, ratio, regressed in compare(current, baseline, 1.5)}
+
+    assert set(rows) == {'small/a', 'small/b'}
+    assert rows['small/a'][1] is False
+    assert rows['small/b'] == (2.0, True)
+
+
+def test_merge_runs_keeps_each_cases_fastest_time_at_one_calibration():
+    fast_machine = {'seed': 0, 'calibration_us': 1000.0, 'results': {'small/a': 100.0, 'small/b': 300.0}}
+    slow_machine = {'seed': 0, 'calibration_us': 2000.0, 'results': {'small/a': 180.0, 'small/b': 700.0}}
+
+    merged = merge_runs([slow_machine, fast_machine])
+
+    assert merged['calibration_us'] == 1000.0
+    assert merged['results'] == {'small/a': 90.0, 'small/b': 300.0}
+
+
+def test_only_cases_slow_in_every_process_are_reported(monkeypatch):
+    baseline = {'seed': 0, 'calibration_us': 1000.0, 'results': {'small/a': 100.0, 'small/b': 100.0}}
+    current = {'seed': 0, 'calibration_us': 1000.0, 'results': {'small/a': 200.0, 'small/b': 200.0}}
+    remeasured = []
+
+    def run_in_subprocess(cases, seed=0):
+        remeasured.append(sorted(cases))
+        # a was a noisy process; b really got slower
+        return {'seed': seed, 'calibration_us': 1000.0,
+                'results': {case: 110.0 if case == 'small/a' else 210.0 for case in cases}}
+
+    monkeypatch.setattr(benchmark_overlaps, 'run_in_subprocess', run_in_subprocess)
+    current, rows = remeasure_regressions(current, baseline, threshold=1.5, attempts=2)
+
+    assert {case: regressed for case, _, _, _, regressed in rows} == {'small/a': False, 'small/b': True}
+    assert remeasured == [['small/a', 'small/b'], ['small/b']]
+    assert current['results']['small/a'] == 110.0
@@ -0,0 +1,50 @@
+import json
+from evaluate_parsers import evaluate, load_corpus, needs_ai, summarize
+
+
+def test_regex_tier_handles_every_input_not_marked_as_a_gap():
+    results = evaluate(load_corpus(), tiers=('regex',))
+
+    misses = [(r['kind'], r['input'], r['outcome'], r.get('error') or r['actual']) for r in results
+              if r['outcome'] not in ('correct', 'correct_reject') and not r['known_gap']]
+    assert misses == []
+
+
+def test_recorded_responses_cover_the_regex_gaps_and_score_correctly():
+    corpus = load_corpus()
+    results = evaluate(corpus)
+
+    gaps = [(e['kind'], e['input']) for e in corpus['entries'] if 'regex' in e.get('known_gaps', [])]
+    assert gaps and all(e.get('ai_response') for e in corpus['entries'] if (e['kind'], e['input']) in gaps)
+    misses = [(r['tier'], r['kind'], r['input'], r['outcome']) for r in results
+              if r['tier'] != 'regex' and r['outcome'] not in ('correct', 'correct_reject', 'uncovered')
+              and not r['known_gap']]
+    assert misses == []
+    assert sorted((item['kind'], item['input']) for item in needs_ai(results)) == sorted(gaps)
+
+
+def test_replayed_ai_tier_scores_recorded_responses():
+    corpus = {
+        'now': '2025-08-11T10:00:00',
+        'entries': [
+            {'kind': 'dates', 'input': 'this weekend', 'expected': {'dates': ['2025-08-16', '2025-08-17']},
+             'ai_response': json.dumps({'success': True, 'dates': ['2025-08-16', '2025-08-17']})},
+            {'kind': 'time', 'input': 'half past 6', 'expected': {'start_hour': 18, 'start_minute': 30},
+             'ai_response': json.dumps({'success': True, 'start_hour': 6, 'start_minute': 30})},
+            {'kind': 'guests', 'input': 'hello', 'expected': None},
+        ],
+    }
+
+    results = evaluate(corpus)
+    outcomes = {(r['input'], r['tier']): r['outcome'] for r in results}
+
+    assert outcomes[('this weekend', 'regex')] == 'rejected'
+    assert outcomes[('this weekend', 'replayed_ai')] == 'correct'
+    assert outcomes[('this weekend', 'pipeline')] == 'correct'
+    assert outcomes[('half past 6', 'replayed_ai')] == 'wrong'
+    assert outcomes[('hello', 'replayed_ai')] == 'uncovered'
+    assert [item['input'] for item in needs_ai(results)] == ['this weekend']
+
+    summary = summarize(results)
+    assert summary['dates/replayed_ai']['accuracy'] == 1.0
+    assert summary['guests/regex']['outcomes']['correct_reject'] == 1
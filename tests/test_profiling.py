@@ -0,0 +1,46 @@
+import io
+from app.services.profiling_service import RequestProfiler, find_profiles, parse_profile_name
+from profile_report import print_report
+
+
+def _enable_profiling(app, tmp_path, max_files=500):
+    app.config.update(PROFILING_SAMPLE_RATE=1.0, PROFILING_DIR=str(tmp_path), PROFILING_MAX_FILES=max_files)
+
+
+def test_sampled_webhook_requests_write_tagged_profiles(app, client, tmp_path):
+    _enable_profiling(app, tmp_path)
+
+    client.post('/sms/webhook', data={'From': '+15557770001', 'Body': 'hello'})
+    client.post('/sms/webhook', data={'From': '+15557770001', 'Body': 'Sam'})
+
+    paths = find_profiles(str(tmp_path))
+    assert len(paths) == 2
+    assert parse_profile_name(paths[1])['handler'] == 'NameCollection'
+    assert find_profiles(str(tmp_path), stage='collecting_name', endpoint='webhook') == paths[1:]
+
+    report = io.StringIO()
+    print_report(paths, 'cumulative', 10, stream=report)
+    assert 'route_message' in report.getvalue()
+
+
+def test_profiles_rotate_and_unsampled_requests_are_skipped(app, client, tmp_path):
+    _enable_profiling(app, tmp_path, max_files=2)
+    for body in ['hello', 'Sam', 'reset']:
+        client.post('/sms/webhook', data={'From': '+15557770001', 'Body': body})
+
+    assert len(find_profiles(str(tmp_path))) == 2
+
+    app.config['PROFILING_SAMPLE_RATE'] = 0
+    client.post('/sms/webhook', data={'From': '+15557770001', 'Body': 'hi'})
+    assert len(find_profiles(str(tmp_path))) == 2
+
+
+def test_profiling_failure_does_not_break_the_request(tmp_path):
+    blocker = tmp_path / 'file'
+    blocker.write_text('not a directory')
+    profiler = RequestProfiler(sample_rate=1.0, directory=str(blocker))
+
+    with profiler.profile('test'):
+        total = sum(range(10))
+
+    assert total == 45
@@ -0,0 +1,65 @@
+"""
+Query budgets for each workflow stage.
+
+Drives a planner/guest conversation through SMSRouter and fails when a
+stage runs more statements than its budget, or repeats one statement more
+often than allowed - which is how N+1 lazy loads show up.
+"""
+import logging
+import pytest
+from app.models import db, Planner
+from app.routes.sms import SMSRouter
+from app.services.metrics_service import track_request
+from app.services.query_counter_service import assert_query_budget, count_queries
+
+PLANNER = '5550000000'
+GUESTS = [f'555111220{i}' for i in range(3)]
+
+# (phone, message, max queries, max repeats of one statement)
+CONVERSATION = [
+    (PLANNER, 'hi', 10, 2),
+    (PLANNER, 'Pat', 11, 2),
+    *[(PLANNER, f'Guest {i}, {phone}', 18, 2) for i, phone in enumerate(GUESTS)],
+    (PLANNER, 'done', 5, 1),
+    (PLANNER, 'Saturday', 12, 2),
+    # Sending invitations still commits once per guest, so it costs a few statements per guest
+    (PLANNER, '1', 9 + 4 * len(GUESTS), len(GUESTS)),
+    (GUESTS[0], 'Saturday 2-6pm', 10, 2),
+    (GUESTS[0], '1', 9, 2),
+    (PLANNER, 'status', 5, 1),
+]
+
+
+def test_each_stage_stays_within_its_query_budget(app):
+    router = SMSRouter()
+    for phone_number, message, max_queries, max_repeats in CONVERSATION:
+        with assert_query_budget(max_queries, max_repeats=max_repeats) as counter:
+            router.route_message(phone_number, message)
+        assert counter.count > 0
+
+
+def test_budget_failure_lists_repeated_statements(app):
+    planner = Planner(phone_number=PLANNER, name='Pat')
+    planner.save()
+
+    with pytest.raises(AssertionError, match=r'N\+1'):
+        with assert_query_budget(100, max_repeats=2):
+            for _ in range(3):
+                db.session.expire_all()
+                db.session.get(Planner, planner.id)
+
+
+def test_request_logs_likely_n_plus_one(app, caplog):
+    app.config['N_PLUS_ONE_THRESHOLD'] = 3
+    planner = Planner(phone_number=PLANNER, name='Pat')
+    planner.save()
+
+    with caplog.at_level(logging.WARNING, logger='app.services.metrics_service'):
+        with track_request() as timings:
+            with count_queries() as inner:
+                for _ in range(4):
+                    db.session.expire_all()
+                    db.session.get(Planner, planner.id)
+
+    assert timings.queries.count == inner.count == 4
+    assert 'Possible N+1' in caplog.text and '4x SELECT' in caplog.text
@@ -0,0 +1,68 @@
+"""
+Query-plan regression check for the SMS router hot paths.
+
+Runs a planner/guest conversation through SMSRouter on SQLite, then EXPLAINs
+every SELECT/UPDATE/DELETE it issued and fails if any of them scans a whole
+table instead of searching an index.
+"""
+from sqlalchemy import event as sa_event
+from app.models import db
+from app.routes.sms import SMSRouter
+
+PLANNER = '5550000000'
+GUEST = '5551112222'
+
+CONVERSATION = [
+    (PLANNER, 'hi'),
+    (PLANNER, 'Pat'),
+    (PLANNER, f'John Doe, {GUEST}'),
+    (PLANNER, 'done'),
+    (PLANNER, 'Saturday'),
+    (PLANNER, '1'),
+    (GUEST, 'Saturday 2-6pm'),
+    (GUEST, '1'),
+    (PLANNER, '1'),
+]
+
+
+def _capture_statements(engine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(('SELECT', 'UPDATE', 'DELETE')):
+            statements.append((statement, parameters))
+
+    sa_event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    return statements, lambda: sa_event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def _full_scans(statement, parameters):
+    """Return the plan lines that scan a table rather than search an index"""
+    cursor = db.session.connection().connection.cursor()
+    try:
+        cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        details = [row[-1] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+    return [detail for detail in details if detail.startswith('SCAN ') and 'CONSTANT ROW' not in detail]
+
+
+def test_router_hot_paths_use_indexes(app):
+    router = SMSRouter()
+    statements, stop_capture = _capture_statements(db.engine)
+    try:
+        for phone_number, message in CONVERSATION:
+            router.route_message(phone_number, message)
+    finally:
+        stop_capture()
+
+    assert statements, "conversation issued no queries"
+
+    offenders = {}
+    for statement, parameters in statements:
+        scans = _full_scans(statement, parameters)
+        if scans:
+            offenders[' '.join(statement.split())[:160]] = scans
+    assert not offenders, "Full table scans on router hot path:\n" + "\n".join(
+        f"{plan} <- {sql}" for sql, plan in offenders.items()
+    )
@@ -0,0 +1,81 @@
+import subprocess
+import sys
+from app.startup import warm_up
+
+
+def test_ready_flips_after_warm_up(app, client):
+    response = client.get('/ready')
+    assert response.status_code == 503
+    assert response.get_json() == {'status': 'starting'}
+
+    warm_up(app)
+
+    response = client.get('/ready')
+    assert response.status_code == 200
+    assert response.get_json() == {'status': 'ready'}
+
+
+def test_app_import_defers_heavy_modules():
+    code = ("import sys\n"
+            "from app import create_app\n"
+            "create_app('testing')\n"
+            "print(sorted(m for m in ('openai', 'phonenumbers.geocoder', 'phonenumbers.carrier', 'requests') "
+            "if m in sys.modules))")
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+
+    assert output.strip().splitlines()[-1] == '[]'
+
+
+def test_new_database_is_created_at_the_latest_migration(tmp_path):
+    from sqlalchemy import text
+    from app import create_app, db
+    from app.config import TestingConfig
+    from app.startup import ensure_schema, migrate_schema
+
+    class FileConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'new.db'}"
+
+    app = create_app(FileConfig)
+    ensure_schema(app)
+    with app.app_context():
+        version = db.session.execute(text('SELECT version_num FROM alembic_version')).scalar()
+    heads = subprocess.run([sys.executable, '-m', 'flask', '--app', 'app:create_app', 'db', 'heads'],
+                           capture_output=True, text=True, check=True).stdout
+    assert version in heads
+
+    # Nothing left to apply on the next deploy
+    migrate_schema(app)
+    with app.app_context():
+        assert db.session.execute(text('SELECT version_num FROM alembic_version')).scalar() == version
+
+
+def test_database_built_by_create_all_without_alembic_is_upgraded(tmp_path):
+    from flask_migrate import downgrade, stamp
+    from sqlalchemy import inspect, text
+    from app import create_app, db
+    from app.config import TestingConfig
+    from app.startup import MIGRATIONS_DIRECTORY, PRE_MIGRATIONS_REVISION, migrate_schema
+
+    class FileConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'old.db'}"
+
+    app = create_app(FileConfig)
+    # What start.sh's db.create_all() left behind: the pre-migration schema and no alembic_version
+    with app.app_context():
+        db.create_all()
+        stamp(directory=MIGRATIONS_DIRECTORY)
+        downgrade(directory=MIGRATIONS_DIRECTORY, revision=PRE_MIGRATIONS_REVISION)
+        db.session.execute(text('DROP TABLE alembic_version'))
+        db.session.commit()
+        assert 'expires_at' not in {c['name'] for c in inspect(db.engine).get_columns('guest_states')}
+
+    migrate_schema(app)
+
+    with app.app_context():
+        inspector = inspect(db.engine)
+        assert 'expires_at' in {c['name'] for c in inspector.get_columns('guest_states')}
+        assert inspector.has_table('job_leases')
+        version = db.session.execute(text('SELECT version_num FROM alembic_version')).scalar()
+    heads = subprocess.run([sys.executable, '-m', 'flask', '--app', 'app:create_app', 'db', 'heads'],
+                           capture_output=True, text=True, check=True).stdout
+    assert version in heads
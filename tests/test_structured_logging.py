@@ -0,0 +1,105 @@
+import io
+import json
+import logging
+import queue
+import subprocess
+import sys
+from logging.handlers import QueueListener
+import pytest
+from app.services.metrics_service import tag_request, track_request
+from app.utils.structured_logging import (
+    JsonFormatter, build_queue_handler, log_category, log_context, parse_sample_rates
+)
+
+
+@pytest.fixture
+def capture():
+    """A logger routed through the queue handler to a JSON stream; yields (logger, read_records)"""
+    log_queue = queue.Queue()
+    stream = io.StringIO()
+    target = logging.StreamHandler(stream)
+    target.setFormatter(JsonFormatter())
+    listener = QueueListener(log_queue, target)
+    handler = build_queue_handler(log_queue, sample_rates={'ai_payload': 0.5}, max_message_length=20)
+    logger = logging.getLogger('test.structured')
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    listener.start()
+
+    def read_records():
+        listener.stop()
+        return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+    yield logger, read_records
+    logger.removeHandler(handler)
+
+
+def test_records_carry_request_context_and_truncated_args(capture):
+    logger, read_records = capture
+
+    with log_context('SM123'), track_request():
+        tag_request(workflow_stage='collecting_guests', handler='GuestCollectionHandler')
+        logger.info("Parsed: %s", {'guests': ['Ana'] * 10})
+        logger.info("Body: %s", 'x' * 50)
+
+    records = read_records()
+    assert records[0]['request_id'] == 'SM123'
+    assert records[0]['workflow_stage'] == 'collecting_guests'
+    assert records[1]['message'] == 'Body: ' + 'x' * 20 + '... [30 more chars]'
+
+
+def test_dict_payloads_are_truncated_and_numbers_still_format(capture):
+    logger, read_records = capture
+
+    # A single dict argument becomes record.args itself
+    logger.info("Parsed: %s", {'guests': ['Ana'] * 10}, extra=log_category('parse_result'))
+    logger.info("Guest %(name)s: %(payload)s", {'name': 'Ana', 'payload': 'y' * 50})
+    logger.info("%d guests in %.1fs: %s", 3, 0.25, ['Ana', 'Ben'], extra=log_category('parse_result'))
+
+    records = read_records()
+    assert records[0]['message'] == "Parsed: {'guests': ['Ana', '... [62 more chars]"
+    assert records[1]['message'] == 'Guest Ana: ' + 'y' * 20 + '... [30 more chars]'
+    assert records[2]['message'] == "3 guests in 0.2s: ['Ana', 'Ben']"
+
+
+def test_payload_categories_are_sampled_per_request(capture):
+    logger, read_records = capture
+    kept_requests = set()
+    for i in range(200):
+        with log_context(f'SM{i}'):
+            logger.info("prompt %s", i, extra=log_category('ai_payload'))
+            logger.info("response %s", i, extra=log_category('ai_payload'))
+            logger.info("always %s", i)
+
+    records = read_records()
+    payloads = [r for r in records if r.get('category') == 'ai_payload']
+    for record in payloads:
+        kept_requests.add(record['request_id'])
+    assert 60 < len(kept_requests) < 140
+    # A sampled request keeps both its prompt and its response
+    assert len(payloads) == 2 * len(kept_requests)
+    assert sum(1 for r in records if r['message'].startswith('always')) == 200
+
+
+def test_parse_sample_rates():
+    assert parse_sample_rates('ai_payload=0.05, sms_payload=1') == {'ai_payload': 0.05, 'sms_payload': 1.0}
+    assert parse_sample_rates(None) == {}
+
+
+def test_forked_worker_writes_its_own_records():
+    # As gunicorn does with preload_app: configure in the parent, log from a forked child
+    code = ("import logging, os, types\n"
+            "from app.utils.structured_logging import configure_logging, stop_listener\n"
+            "configure_logging(types.SimpleNamespace(config={'LOG_FORMAT': 'text'}))\n"
+            "pid = os.fork()\n"
+            "if pid == 0:\n"
+            "    logging.getLogger('worker').info('from worker')\n"
+            "    stop_listener()\n"
+            "    os._exit(0)\n"
+            "os.waitpid(pid, 0)\n"
+            "logging.getLogger('master').info('from master')\n")
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+
+    assert 'from worker' in output
+    assert 'from master' in output